@@ -0,0 +1,89 @@
+'''
+file    bench_archive.py
+author  Keith Helsabeck
+
+Benchmark for the mmap archive (src/archive.py). For each size (charges
+across synthetic records of 1-40 charges, see synthetic.py) it writes
+an archive to a temporary file and times: opening it (which should not
+grow with the size), scoring every defendant with columnar.score() on
+a view of it, and scoring the same records from a ColumnarCharges built
+in memory, next to the time and memory that build takes. Then it
+times RecordAnalyzer over every record of the archive, loaded as
+Charge_Collections and as LazyChargeCollections (which make only the
+Charges the analyzer asks for).
+
+Run from the repo root with:
+python -m benchmarks.bench_archive
+python -m benchmarks.bench_archive --sizes 1000 100000
+'''
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_records
+from src.analyzer import RecordAnalyzer
+from src.archive import Archive, write_archive
+from src.columnar import ColumnarCharges, score
+
+def seconds(func: object, repeat: int) -> float:
+    '''Returns the fewest seconds of repeat calls of func().'''
+    best = None
+    for n in range(repeat):
+        start = time.perf_counter()
+        func()
+        took = time.perf_counter() - start
+        best = took if best == None else min(best, took)
+    return best
+
+def open_close(path: str):
+    '''Opens and closes an archive.'''
+    Archive(path).close()
+
+def score_archive(path: str):
+    '''Scores everyone in an archive, columnar.'''
+    with Archive(path) as archive:
+        view = archive.view()
+        score(view)
+        view.release()
+
+def analyze_archive(path: str, lazy: bool):
+    '''Analyzes every record in an archive (with RecordAnalyzer).'''
+    analyzer = RecordAnalyzer()
+    with Archive(path) as archive:
+        for defendant, colx in archive.records(lazy):
+            analyzer.analyze(colx, defendant.birthdate)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", 
+        default=[1000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'charges':>9} {'file MB':>7} {'open ms':>8} {'score s':>8} "
+        f"{'build s':>8} {'build MB':>9} {'mem s':>8} {'fsm s':>8} "
+        f"{'lazy s':>8}")
+    with tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes:
+            records = list(make_records(size))
+            path = os.path.join(folder, f"{size}.ctar")
+            write_archive(path, records)
+            opened = seconds(lambda: open_close(path), args.repeat)
+            scored = seconds(lambda: score_archive(path), args.repeat)
+            tracemalloc.start()
+            start = time.perf_counter()
+            store = ColumnarCharges.from_records(records)
+            built = time.perf_counter() - start
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            in_memory = seconds(lambda: score(store), args.repeat)
+            eager = seconds(lambda: analyze_archive(path, False), args.repeat)
+            lazy = seconds(lambda: analyze_archive(path, True), args.repeat)
+            print(f"{size:>9} {os.path.getsize(path) / 2 ** 20:>7.1f} "
+                f"{opened * 1000:>8.3f} {scored:>8.3f} {built:>8.3f} "
+                f"{memory / 2 ** 20:>9.1f} {in_memory:>8.3f} {eager:>8.3f} "
+                f"{lazy:>8.3f}")
+
+if __name__ == "__main__":
+    main()
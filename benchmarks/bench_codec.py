@@ -0,0 +1,82 @@
+'''
+file    bench_codec.py
+author  Keith Helsabeck
+
+Size and speed benchmark for the binary codec (src/codec.py), next to
+pickle. Each synthetic record (see synthetic.py) is encoded as its
+Defendant and its charges (with their crimes): by the codec, and as one
+pickle of (defendant, charges) at the highest protocol. It prints the
+bytes per charge and the encode/decode time per charge of each (with
+the garbage collector off while timing, as timeit does).
+
+Run from the repo root with:
+python -m benchmarks.bench_codec
+'''
+import argparse
+import gc
+import pickle
+import time
+
+from benchmarks.synthetic import make_records
+from src import codec
+
+def encode_codec(records: list) -> list:
+    '''Returns each record encoded by the codec.'''
+    return [ (codec.encode_defendant(defendant), 
+        codec.encode_collection(colx)) for defendant, colx in records ]
+
+def decode_codec(blobs: list) -> list:
+    '''Returns the records the codec encoded.'''
+    return [ (codec.decode_defendant(defendant), 
+        codec.decode_collection(colx)) for defendant, colx in blobs ]
+
+def encode_pickle(records: list) -> list:
+    '''Returns each record pickled.'''
+    return [ pickle.dumps((defendant, colx.charges), pickle.HIGHEST_PROTOCOL)
+        for defendant, colx in records ]
+
+def decode_pickle(blobs: list) -> list:
+    '''Returns the records unpickled.'''
+    return [ pickle.loads(blob) for blob in blobs ]
+
+def best_of(repeat: int, func: object, arg: object) -> tuple:
+    '''Returns (fewest seconds, result) of repeat calls of func(arg).'''
+    best, result = None, None
+    for n in range(repeat):
+        result = None
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = func(arg)
+            seconds = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = seconds if best == None else min(best, seconds)
+    return best, result
+
+def size(blobs: list) -> int:
+    '''Returns the bytes in the encoded records.'''
+    return sum(len(blob) if type(blob) == bytes else sum(map(len, blob))
+        for blob in blobs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--charges", type=int, default=100000)
+    parser.add_argument("--per-record", type=int, nargs=2, default=(1, 40))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    records = list(make_records(args.charges, 
+        per_record=tuple(args.per_record)))
+    print(f"{len(records)} records, {args.charges} charges")
+    print(f"{'format':>8} {'bytes':>8} {'encode us':>10} {'decode us':>10}")
+    for name, encode, decode in (("codec", encode_codec, decode_codec),
+        ("pickle", encode_pickle, decode_pickle)):
+        encode_s, blobs = best_of(args.repeat, encode, records)
+        decode_s, decoded = best_of(args.repeat, decode, blobs)
+        per = 1e6 / args.charges
+        print(f"{name:>8} {size(blobs) / args.charges:>8.1f} "
+            f"{encode_s * per:>10.2f} {decode_s * per:>10.2f}")
+
+if __name__ == "__main__":
+    main()
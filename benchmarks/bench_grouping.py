@@ -0,0 +1,97 @@
+'''
+file    bench_grouping.py
+author  Keith Helsabeck
+
+Benchmark for Charge_Collection.groupby_convictiondate(). It times the
+grouping of records of growing size and prints the time per charge, 
+which should stay roughly flat if grouping scales linearly.
+
+Run from the repo root with:
+python -m benchmarks.bench_grouping
+python -m benchmarks.bench_grouping --sizes 1000 10000 100000 1000000
+'''
+import argparse
+import gc
+import random
+import time
+from datetime import date, timedelta
+
+from src.charge import Charge
+from src.crime import Crime
+from src.collections import Charge_Collection
+
+def make_collection(size: int, seed: int = 22) -> object:
+    '''
+    Makes a Charge_Collection of size convicted charges spread over 
+    about size/3 conviction dates (in random order). The charges go in
+    with add_charges(), so the collection still has to be grouped.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param size: number of charges
+    :param seed: seed for the random dates and classes
+
+    RETURN:
+    ____________________________________________________________________
+    :return: a Charge_Collection with size charges
+    :rtype: Charge_Collection
+    '''
+    rng = random.Random(seed)
+    crimes = []
+    for crimeclass in Crime.valid_classes:
+        crime = Crime()
+        crime.statute = "§14-72"
+        crime.crimeclass = crimeclass
+        crimes.append(crime)
+    start = date(1950, 1, 1)
+    charges = []
+    for n in range(size):
+        charge = Charge()
+        charge.disposition_date = start + timedelta(
+            days=rng.randrange(max(size // 3, 1)))
+        charge.offense_date = charge.disposition_date - timedelta(days=30)
+        charge.crime = rng.choice(crimes)
+        charge.convicted = True
+        charges.append(charge)
+    colx = Charge_Collection()
+    colx.add_charges(charges)
+    return colx
+
+def time_grouping(size: int, repeat: int = 3) -> float:
+    '''
+    Returns the best time (seconds) of repeat runs of grouping a fresh 
+    collection of size charges. Like timeit, the garbage collector is 
+    off while timing, so its full-heap passes don't blur the scaling.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param size: number of charges
+    :param repeat: number of timed runs
+    '''
+    best = None
+    for run in range(repeat):
+        colx = make_collection(size, seed=run)
+        gc.disable()
+        try:
+            began = time.perf_counter()
+            colx.groupby_convictiondate()
+            elapsed = time.perf_counter() - began
+        finally:
+            gc.enable()
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+        default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(f"{'charges':>10} {'seconds':>10} {'ns/charge':>10}")
+    for size in args.sizes:
+        best = time_grouping(size, args.repeat)
+        print(f"{size:>10} {best:>10.4f} {best / size * 1e9:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+'''
+file    bench_memory.py
+author  Keith Helsabeck
+
+Memory benchmark for the record classes. It measures (with tracemalloc)
+the bytes each Charge, Crime and Defendant costs, next to a plain 
+dict-backed class with the same __init__ (what these classes were 
+before they used __slots__). A Charge is counted with its two dates and
+its UUID, and with a crime shared by all the charges, as in a docket.
+
+Run from the repo root with:
+python -m benchmarks.bench_memory
+'''
+import argparse
+import tracemalloc
+import uuid
+from datetime import date, timedelta
+
+from src.charge import Charge
+from src.crime import Crime
+from src.defendant import Defendant
+
+def dict_backed(cls: type) -> type:
+    '''
+    Returns a plain class (with a __dict__) sharing cls's methods, to 
+    stand in for cls as it was before __slots__.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param cls: Charge, Crime or Defendant
+    '''
+    namespace = { 
+        name: value for name, value in vars(cls).items() 
+        if name not in cls.__slots__ and name != "__slots__"
+    }
+    return type(f"DictBacked{cls.__name__}", (), namespace)
+
+def bytes_per(make: object, count: int) -> float:
+    '''
+    Returns the bytes allocated per object by count calls of make(), 
+    including the slot each takes in the list that holds them.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param make: a function taking an int n and returning an object
+    :param count: number of objects to make
+    '''
+    tracemalloc.start()
+    try:
+        objs = [ make(n) for n in range(count) ]
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del objs
+    return current / count
+
+def charge_maker(charge_class: type, crime: object) -> object:
+    '''Returns a function making filled-in charges of charge_class.'''
+    start = date(2000, 1, 1)
+    def make(n: int) -> object:
+        charge = charge_class()
+        charge.id = n
+        charge.unique_id = uuid.uuid4()
+        charge.offense_date = start + timedelta(days=n % 5000)
+        charge.disposition_date = start + timedelta(days=n % 5000 + 60)
+        charge.crime = crime
+        charge.convicted = True
+        return charge
+    return make
+
+def crime_maker(crime_class: type) -> object:
+    '''Returns a function making filled-in crimes of crime_class.'''
+    def make(n: int) -> object:
+        crime = crime_class()
+        crime.id = n
+        crime.statute = "§14-72"
+        crime.description = "Larceny"
+        crime.crimeclass = "Class H Felony"
+        return crime
+    return make
+
+def defendant_maker(defendant_class: type) -> object:
+    '''Returns a function making filled-in defendants.'''
+    def make(n: int) -> object:
+        defendant = defendant_class()
+        defendant.id = n
+        defendant.unique_id = uuid.uuid4()
+        defendant.firstname = "John"
+        defendant.lastname = "Doe"
+        defendant.birthdate = date(1980, 1, 1)
+        return defendant
+    return make
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+    crime = Crime()
+    crime.crimeclass = "Class H Felony"
+    rows = [
+        ("Charge", charge_maker(dict_backed(Charge), crime), 
+            charge_maker(Charge, crime)),
+        ("Crime", crime_maker(dict_backed(Crime)), crime_maker(Crime)),
+        ("Defendant", defendant_maker(dict_backed(Defendant)), 
+            defendant_maker(Defendant)),
+    ]
+    print(f"{'class':>10} {'before':>10} {'after':>10} {'saved':>8}")
+    for name, before_maker, after_maker in rows:
+        before = bytes_per(before_maker, args.count)
+        after = bytes_per(after_maker, args.count)
+        saved = 1 - after / before
+        print(f"{name:>10} {before:>10.1f} {after:>10.1f} {saved:>8.0%}")
+
+if __name__ == "__main__":
+    main()
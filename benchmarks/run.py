@@ -0,0 +1,260 @@
+'''
+file    run.py
+author  Keith Helsabeck
+
+Benchmark runner. It times grouping, ConvictionDate.highest(), the
+three FSMs, RecordAnalyzer, columnar scoring and batch scoring on
+synthetic records (see synthetic.py) at several sizes, saves the
+timings as JSON, and can compare them with an earlier run's JSON.
+
+For the single-record benchmarks, size is the number of charges in one
+record (how they scale with a long record). For the population
+benchmarks (batch, columnar), size is the number of charges across
+many records of 1-40 charges.
+
+Each benchmark is timed repeat times (with the garbage collector off,
+as timeit does, and each run after an untimed setup), and the best and
+median times are kept. Small sizes are run many times per timing. The
+batch benchmark scores in one process pool per size, started (and 
+warmed up) before timing, so it times the scoring and not thousands of
+pool startups. Building the 1M-charge records takes a while.
+
+Run from the repo root with:
+python -m benchmarks.run
+python -m benchmarks.run --sizes 10 1000 --only grouping felony
+python -m benchmarks.run --output new.json --compare old.json
+'''
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.analyzer import RecordAnalyzer
+from src.batch import score_batch
+from src.catalog import CrimeCatalog
+from src.columnar import ColumnarCharges, score
+from src.FelonyStatemachine import Felony_RecordMachine
+from src.habitualmachine import HabitualMachine
+from src.misdemeanor_machine import MisdemeanorRecordMachine
+
+from .synthetic import make_record, make_records
+
+SIZES = [10, 1000, 100000, 1000000]
+SEED = 22
+WORKERS = None      # batch workers (set from --workers)
+POOL = None         # the batch benchmark's pool for the current size
+RUN_CHARGES = 100000    # small sizes are run this many charges' worth of 
+                        # times per timing, so they time above the noise
+
+# name -> (kind, setup, run): setup(data) makes what run() times from
+# the data for a size ("record" or "records", see build)
+BENCHMARKS = {}
+
+def benchmark(name: str, kind: str, setup: object = None) -> object:
+    '''
+    Decorator registering a benchmark. The decorated function is what is
+    timed; it takes what setup returns (by default, the data itself).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param name: the benchmark's name (in the JSON and --only)
+    :param kind: "record" (one record of size charges) or "records"
+    (size charges across many records)
+    :param setup: untimed function taking the data, run before each
+    timing
+    '''
+    def register(run: object) -> object:
+        BENCHMARKS[name] = (kind, setup or (lambda data: data), run)
+        return run
+    return register
+
+def regroup(record: tuple) -> tuple:
+    '''Setup: marks the record's grouping for a full rebuild.'''
+    record[1].mark_changed()
+    return record
+
+def grouped(record: tuple) -> tuple:
+    '''Setup: makes sure the record is grouped.'''
+    record[1].groupby_convictiondate()
+    return record
+
+@benchmark("grouping", "record", regroup)
+def bench_grouping(record: tuple):
+    record[1].groupby_convictiondate()
+
+@benchmark("highest", "record", grouped)
+def bench_highest(record: tuple):
+    for condate in record[1].cons_bydate:
+        condate.highest()
+
+@benchmark("felony", "record", grouped)
+def bench_felony(record: tuple):
+    Felony_RecordMachine().on_event(record[1])
+
+@benchmark("misdemeanor", "record", grouped)
+def bench_misdemeanor(record: tuple):
+    MisdemeanorRecordMachine(record[1])
+
+@benchmark("habitual", "record", grouped)
+def bench_habitual(record: tuple):
+    HabitualMachine(record[1], record[0].birthdate)
+
+@benchmark("analyzer", "record", grouped)
+def bench_analyzer(record: tuple):
+    RecordAnalyzer().analyze(record[1], record[0].birthdate)
+
+@benchmark("batch", "records")
+def bench_batch(records: list):
+    for result in score_batch(records, workers=WORKERS, pool=POOL):
+        pass
+
+@benchmark("columnar", "records", ColumnarCharges.from_records)
+def bench_columnar(store: object):
+    score(store)
+
+def build(kind: str, size: int, seed: int = SEED) -> object:
+    '''Returns the data for a benchmark kind and size.'''
+    if kind == "record":
+        return make_record(random.Random(seed), size, CrimeCatalog())
+    return list(make_records(size, seed))
+
+def time_one(setup: object, run: object, data: object, repeat: int,
+    number: int = 1) -> list:
+    '''
+    Returns repeat times (seconds per run), each the mean of number
+    runs, with a fresh (untimed) setup before every run and the garbage
+    collector off while timing.
+    '''
+    times = []
+    for n in range(repeat):
+        total = 0.0
+        for m in range(number):
+            state = setup(data)
+            gc.disable()
+            try:
+                began = time.perf_counter()
+                run(state)
+                total += time.perf_counter() - began
+            finally:
+                gc.enable()
+        times.append(total / number)
+    return times
+
+def start_pool(records: list) -> object:
+    '''Returns a batch pool of WORKERS processes (None for 1), with 
+    its processes started by one untimed run over the records.'''
+    global POOL
+    if WORKERS == 1:
+        return None
+    POOL = ProcessPoolExecutor(max_workers=WORKERS)
+    bench_batch(records)
+    return POOL
+
+def run_all(sizes: list, names: list, repeat: int, seed: int = SEED) -> dict:
+    '''
+    Runs the benchmarks and returns the results (as saved in the JSON):
+    {"meta": {...}, "results": {name: {size: {best, median, ns_per_charge
+    }}}}. Progress goes to stderr.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param sizes: charge counts to run at
+    :param names: the benchmarks to run
+    :param repeat: timed runs of each
+    :param seed: the synthetic data's seed
+    '''
+    global POOL
+    results = { name: {} for name in names }
+    for size in sizes:
+        for kind in ("record", "records"):
+            todo = [ name for name in names if BENCHMARKS[name][0] == kind ]
+            if todo == []:
+                continue
+            data = build(kind, size, seed)
+            if "batch" in todo:
+                start_pool(data)
+            for name in todo:
+                kind, setup, run = BENCHMARKS[name]
+                times = time_one(setup, run, data, repeat, 
+                    max(1, RUN_CHARGES // size))
+                best = min(times)
+                results[name][str(size)] = {
+                    "best": best, "median": statistics.median(times),
+                    "ns_per_charge": best / size * 1e9,
+                }
+                print(f"{name:>12} {size:>8} {best:>10.4f}s "
+                    f"{best / size * 1e9:>8.0f} ns/charge", file=sys.stderr)
+            if POOL != None:
+                POOL.shutdown()
+                POOL = None
+            del data
+    meta = {
+        "when": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(), "seed": seed, "repeat": repeat,
+    }
+    return { "meta": meta, "results": results }
+
+def compare(old: dict, new: dict, threshold: float) -> list:
+    '''
+    Returns (name, size, old best, new best, ratio) for every benchmark
+    and size in both runs, and prints them, marking as a REGRESSION any
+    that got slower by more than threshold (0.1 = 10%).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param old: an earlier run's results
+    :param new: this run's results
+    :param threshold: the slowdown allowed before it counts
+    '''
+    rows = []
+    print(f"{'benchmark':>12} {'size':>8} {'old':>10} {'new':>10} {'ratio':>6}")
+    for name, sizes in new["results"].items():
+        for size, timing in sizes.items():
+            before = old["results"].get(name, {}).get(size)
+            if before == None:
+                continue
+            ratio = timing["best"] / before["best"]
+            flag = "  REGRESSION" if ratio > 1 + threshold else ""
+            print(f"{name:>12} {size:>8} {before['best']:>10.4f} "
+                f"{timing['best']:>10.4f} {ratio:>6.2f}{flag}")
+            rows.append((name, size, before["best"], timing["best"], ratio))
+    return rows
+
+def main() -> int:
+    global WORKERS
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS),
+        default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--workers", type=int, default=None,
+        help="batch workers (default: one per CPU)")
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument("--compare", metavar="OLD_JSON",
+        help="compare with an earlier run's JSON")
+    parser.add_argument("--threshold", type=float, default=0.1,
+        help="slowdown counted as a regression (default 0.1 = 10%%)")
+    args = parser.parse_args()
+    WORKERS = args.workers or os.cpu_count() or 1
+    results = run_all(args.sizes, args.only, args.repeat, args.seed)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        rows = compare(old, results, args.threshold)
+        if any(row[4] > 1 + args.threshold for row in rows):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+'''
+file    synthetic.py
+author  Keith Helsabeck
+
+Seeded generator of synthetic NC criminal records for the benchmarks.
+The same seed always gives the same records.
+
+A record looks roughly like a real docket: most convictions are
+misdemeanors (felonies get rarer the higher the class); charges come in
+incidents of one to a few counts that share an offense and disposition
+date; dispositions come 0-400 days after the offense; the first offense
+is after D turns 16; and some felonies are under the statutes that
+don't count toward habitual felon status (§14-7.28, §14-7.36,
+§14-33.2). Some charges are dismissed (disposed, but not convicted);
+grouping leaves these out of the conviction dates, but they are still
+in the collection, and so still encoded, archived and sorted.
+
+USE:
+________________________________________________________________________
+rng = random.Random(22)
+defendant, colx = make_record(rng, charges=500, catalog=CrimeCatalog())
+for defendant, colx in make_records(total=100000, seed=22): ...
+'''
+import random
+import typing
+import uuid
+from datetime import date, timedelta
+
+from src.catalog import CrimeCatalog
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.defendant import Defendant
+
+# relative frequency of each class among charges
+CLASS_WEIGHTS = {
+    "Infraction": 8, "Class 3 Misdemeanor": 14, "Class 2 Misdemeanor": 16,
+    "Class 1 Misdemeanor": 24, "Class A1 Misdemeanor": 6,
+    "Class I Felony": 9, "Class H Felony": 10, "Class G Felony": 4,
+    "Class F Felony": 3, "Class E Felony": 2, "Class D Felony": 1.5,
+    "Class C Felony": 1, "Class B1 Felony": 0.3, "Class B2 Felony": 0.3,
+    "Class A Felony": 0.1,
+}
+
+# (statute, description) choices by kind of class
+MISDEMEANOR_STATUTES = [
+    ("§14-72(a)", "Misdemeanor Larceny"), ("§14-33(a)", "Simple Assault"),
+    ("§20-138.1", "DWI"), ("§20-28(a)", "DWLR"),
+    ("§20-28(a1)", "DWLR Impaired Revocation"),
+    ("§20-141.4(a2)", "Misdemeanor Death by Vehicle"),
+    ("§90-95(a)(3)", "Possession of Marijuana"), ("§20-141(j1)", "Speeding"),
+]
+FELONY_STATUTES = [
+    ("§14-72(b)", "Felony Larceny"), ("§14-87", "Robbery w DW"),
+    ("§14-54(a)", "B&E"), ("§90-95(h)", "Trafficking"),
+    ("§14-32(b)", "AWDWISI"), ("§14-17", "Murder"),
+]
+# felonies that don't count toward habitual felon status
+DISQUALIFIED_STATUTES = [
+    ("§14-7.28", "Habitual B&E Status"), ("§14-7.36", "Armed Habitual Felon"),
+    ("§14-33.2", "Habitual Misdemeanor Assault"),
+]
+DISQUALIFIED_SHARE = 0.05
+DISMISSED_SHARE = 0.1                   # charges disposed, not convicted
+COUNTS = [1, 1, 1, 1, 1, 2, 2, 3, 4]    # counts per incident
+CAREER_DAYS = 40 * 365                  # offenses fall in 40 years from 16
+
+def make_crime(rng: random.Random, catalog: object) -> object:
+    '''Returns a random (interned) Crime, with the class mix above.'''
+    classes = list(CLASS_WEIGHTS)
+    crimeclass = rng.choices(classes, weights=list(CLASS_WEIGHTS.values()))[0]
+    if "Felony" in crimeclass:
+        if rng.random() < DISQUALIFIED_SHARE:
+            statute, description = rng.choice(DISQUALIFIED_STATUTES)
+        else:
+            statute, description = rng.choice(FELONY_STATUTES)
+    else:
+        statute, description = rng.choice(MISDEMEANOR_STATUTES)
+    return catalog.intern(statute, crimeclass, description)
+
+def make_uid(rng: random.Random) -> object:
+    '''Returns a random (but seeded) version 4 UUID.'''
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+def make_record(rng: random.Random, charges: int, catalog: object,
+    defendant_id: int = 1) -> tuple:
+    '''
+    Returns one synthetic record: a Defendant and a Charge_Collection of
+    the given number of charges (added in random order with
+    add_charges(), so the collection still has to be grouped).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param rng: the random.Random to draw from
+    :param charges: number of charges
+    :param catalog: CrimeCatalog to intern the crimes in
+    :param defendant_id: the Defendant's id
+
+    RETURN:
+    ____________________________________________________________________
+    :return: a (Defendant, Charge_Collection) pair
+    :rtype: tuple
+    '''
+    defendant = Defendant()
+    defendant.id = defendant_id
+    defendant.unique_id = make_uid(rng)
+    defendant.firstname = "John"
+    defendant.lastname = f"Doe{defendant_id}"
+    defendant.birthdate = date(1950, 1, 1) + \
+        timedelta(days=rng.randrange(55 * 365))
+    if (defendant.birthdate.month, defendant.birthdate.day) == (2, 29):
+        # Dumbwaiter.eighteenth_birthdate can't make an 18th birthday 
+        # for a leap day birthdate
+        defendant.birthdate += timedelta(days=1)
+    start = defendant.birthdate + timedelta(days=16 * 365 + 4)
+    made = []
+    while len(made) < charges:
+        offense = start + timedelta(days=rng.randrange(CAREER_DAYS))
+        disposition = offense + timedelta(days=rng.randrange(401))
+        for count in range(min(rng.choice(COUNTS), charges - len(made))):
+            charge = Charge()
+            charge.id = len(made)
+            charge.unique_id = make_uid(rng)
+            charge.crime = make_crime(rng, catalog)
+            charge.offense_date = offense
+            charge.disposition_date = disposition
+            charge.convicted = rng.random() >= DISMISSED_SHARE
+            made.append(charge)
+    rng.shuffle(made)
+    colx = Charge_Collection()
+    colx.add_charges(made)
+    return defendant, colx
+
+def make_records(total: int, seed: int = 22,
+    per_record: tuple = (1, 40)) -> typing.Iterator:
+    '''
+    Yields synthetic records (see make_record) until there are total
+    charges in all, each with a random number of charges in per_record
+    (inclusive).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param total: number of charges in all the records
+    :param seed: the seed
+    :param per_record: (fewest, most) charges per record
+    '''
+    rng = random.Random(seed)
+    catalog = CrimeCatalog()
+    made, defendant_id = 0, 0
+    while made < total:
+        size = min(rng.randint(*per_record), total - made)
+        defendant_id += 1
+        yield make_record(rng, size, catalog, defendant_id)
+        made += size
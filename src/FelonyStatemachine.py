@@ -34,9 +34,10 @@ Points:         Level:
 '''
 
 import typing
+from . import instrument
 from .collections import Charge_Collection
 from .charge import Charge
-from .crime import Crime
+from .crime import Crime, CrimeClass
 
 class FelonyPointChart:
     '''Has a dict of crimes that qualify for felony record points.
@@ -46,33 +47,9 @@ class FelonyPointChart:
     :class_attr crimes: list of crime classes eligible for F pts
     :class_attr pointvals: dict of eligible classes & F point values
     '''
-    crimes = [  
-                "Class 1 Misdemeanor", 
-                "Class A1 Misdemeanor", 
-                "Class I Felony", 
-                "Class H Felony", 
-                "Class G Felony", 
-                "Class F Felony", 
-                "Class E Felony", 
-                "Class D Felony", 
-                "Class C Felony", 
-                "Class B1 Felony", 
-                "Class B2 Felony", 
-                "Class A Felony" 
-    ]
-    pointvals = {
-        "Class 1 Misdemeanor": 1,
-        "Class A1 Misdemeanor": 1,
-        "Class I Felony": 2,
-        "Class H Felony": 2,
-        "Class G Felony": 4,
-        "Class F Felony": 4,
-        "Class E Felony": 4,
-        "Class D Felony": 6,
-        "Class C Felony": 6,
-        "Class B2 Felony": 6,
-        "Class B1 Felony": 9,
-        "Class A Felony": 10,
+    crimes = [ c.label for c in CrimeClass if c.felony_points > 0 ]
+    pointvals = { 
+        c.label: c.felony_points for c in CrimeClass if c.felony_points > 0 
     }
 
 #states: 
@@ -92,6 +69,7 @@ class State:
     METHODS:
     ____________________________________________________________________
     :method on_event: takes colx and pts --> State.on_event()
+    :method transition: takes colx, pts, index -> (next state, pts, idx)
     :method repr: returns representation of this state's class name
     :method str: returns representation of this state's class name
     '''
@@ -117,6 +95,24 @@ class State:
         '''
         return 0 
 
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
+        '''
+        Takes one step of the FSM without recursing into the next state.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: the Charge_Collection Instance
+        :param pts: num of felony pts
+        :param index: index of convictiondate in colx.cons_bydate
+
+        RETURN:
+        ________________________________________________________________
+        :return: the next state, the new pts, and the new index (the
+        base State goes straight to a FinishedState)
+        :rtype: tuple
+        '''
+        return FinishedState(), pts, index
+
     def __repr__(self):
         return self.__str__()
 
@@ -155,14 +151,13 @@ class StartState(State):
         :param pts: num of felony points
         :param index: index of convictiondate in colx.cons_bydate
         '''
-        colx.groupby_convictiondate()
-        if type(colx.cons_bydate) == list \
-            and len(colx.cons_bydate) == 0:
-            return FinishedState().on_event(colx, pts, index)
+        return run(self, colx, pts, index)
 
-        elif type(colx.cons_bydate) == list \
-            and len(colx.cons_bydate) >= 1: 
-            return HubState().on_event(colx, pts, index)
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
+        colx.groupby_convictiondate()
+        if len(colx.cons_bydate) == 0:
+            return FinishedState(), pts, index
+        return HUB_STATE, pts, index
 
 class HubState(State):
     '''
@@ -196,13 +191,16 @@ class HubState(State):
         :param pts: num of felony points
         :param index: index of convictiondate in colx.cons_bydate
         '''
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
         if len(colx.cons_bydate) == index: #last conviction hit
-            return FinishedState().on_event(colx, pts, index)
+            return FinishedState(), pts, index
 
         con_date = colx.cons_bydate[index]
-        if "Felony" in con_date.highest()[0].crime.crimeclass:
-            return F_State().on_event(colx, pts, index)
-        return M_State().on_event(colx, pts, index) # no felonies
+        if con_date.highest()[0].crime.classrank.is_felony:
+            return F_STATE, pts, index
+        return M_STATE, pts, index # no felonies
 
 class M_State(State):
     '''
@@ -226,10 +224,13 @@ class M_State(State):
     :method str: returns representation of this state's class name
     '''
     def on_event(self, colx:object, pts:int, index: int):
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
         condate = colx.cons_bydate[index]
         if self.is_eligible(condate.highest()[0]):
-            return HubState().on_event(colx, pts + 1, index + 1)
-        return HubState().on_event(colx, pts, index + 1)
+            return HUB_STATE, pts + 1, index + 1
+        return HUB_STATE, pts, index + 1
     
     def is_eligible(self, charge: object) -> bool:
         '''
@@ -245,16 +246,9 @@ class M_State(State):
         :returns: True for eligible, else False
         :rtype: bool
         '''
-        crimeclass = charge.crime.crimeclass
-        statlow = charge.crime.statute.lower()
-        if "1" in crimeclass: # A1 and 1 misdemeanors
-            if "14" in statlow: # general criminal §s
-                return True
-            elif "20-141.4(a2)" in statlow \
-                or "20-138" in statlow\
-                or "20-28(a1)" in statlow:
-                return True
-        return False
+        # A1 and 1 misdemeanors under Ch 14, or the Ch 20 edge cases
+        # (worked out once when the crime's class/statute were set)
+        return charge.crime.felpoint_eligible
 
 class F_State(State):
     '''
@@ -278,9 +272,12 @@ class F_State(State):
     :method str: returns representation of this state's class name
     '''
     def on_event(self, colx: object, pts: int, index: int):
-        high_class = colx.cons_bydate[index].highest()[0].crime.crimeclass
-        pts += FelonyPointChart.pointvals[high_class]
-        return HubState().on_event(colx, pts, index + 1)
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
+        high_class = colx.cons_bydate[index].highest()[0].crime.classrank
+        pts += high_class.felony_points
+        return HUB_STATE, pts, index + 1
 
 class FinishedState(State):
     '''
@@ -307,18 +304,62 @@ class FinishedState(State):
         return self
 
     def leveler(selt, pts: int):
-        if pts < 2:
-            return 1
-        elif pts < 6:
-            return 2
-        elif pts < 10:
-            return 3
-        elif pts < 14:
-            return 4
-        elif pts < 18:
-            return 5
-        elif pts >= 18:
-            return 6
+        return felony_level(pts)
+
+def felony_level(pts: int) -> int:
+    '''
+    Returns the felony record level for a number of points (see the 
+    chart at the top of this file).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param pts: num of felony points
+    '''
+    if pts < 2:
+        return 1
+    elif pts < 6:
+        return 2
+    elif pts < 10:
+        return 3
+    elif pts < 14:
+        return 4
+    elif pts < 18:
+        return 5
+    elif pts >= 18:
+        return 6
+
+# The transitional states keep no per-run data, so one shared instance
+# of each is reused for every step of every run. FinishedState holds the
+# results and is made fresh for each run.
+HUB_STATE = HubState()
+M_STATE = M_State()
+F_STATE = F_State()
+
+def run(state: object, colx: object, pts: int, index: int) -> object:
+    '''
+    Drives the FSM from state to FinishedState in a loop (trampoline).
+
+    Each state's transition() returns the next state instead of calling
+    its on_event(), so a record of any length runs in constant stack 
+    depth.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param state: the State to start from
+    :param colx: the Charge_Collection Instance
+    :param pts: num of felony points
+    :param index: index of convictiondate in colx.cons_bydate
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the FinishedState holding pts and level
+    :rtype: FinishedState
+    '''
+    if instrument.ACTIVE != None:   # see instrument.py
+        return instrument.ACTIVE.run(state, colx, pts, index, FinishedState)
+    while type(state) != FinishedState:
+        state, pts, index = state.transition(colx, pts, index)
+    return state.on_event(colx, pts, index)
 
 #--------- The State Machine:-----------------
 class Felony_RecordMachine:
@@ -0,0 +1,235 @@
+'''
+file    analyzer.py
+author  Keith Helsabeck
+
+This is the file analyzer.py, for RecordAnalyzer. RecordAnalyzer works
+out a defendant's felony record (points/level), misdemeanor record 
+(points/level) and habitual felon status together, grouping the record
+once and walking its conviction dates once. This is the fast path for 
+scoring; it gives the same results as running Felony_RecordMachine, 
+MisdemeanorRecordMachine and HabitualMachine one after the other, which
+stay available (and document the rules, see also the UML in docs).
+'''
+import typing
+from itertools import chain
+
+from .dumbwaiter import Dumbwaiter
+from .FelonyStatemachine import felony_level
+from .misdemeanor_machine import misdemeanor_level
+from .habitualmachine import FELONIES
+
+# misdemeanor record stages (the MisdemeanorRecordMachine states)
+LEVEL_ONE = 1     # no qualified conviction yet
+LEVEL_TWO = 2     # counting qualified convictions
+
+class RecordAnalysis:
+    '''
+    RecordAnalysis is the combined result of a RecordAnalyzer run. It 
+    also holds where each rule set is up to, so RecordAnalyzer.feed() 
+    can carry on from it one conviction date at a time.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr felony_points: number of felony record points
+    :attr misdemeanor_points: number of misdemeanor record points
+    :attr misdemeanor_stage: LEVEL_ONE or LEVEL_TWO (see above)
+    :attr dumbwaiter: Dumbwaiter with the habitual results (None if no
+    birthdate was given, since habitual analysis needs one)
+    :attr dates: number of conviction dates fed in so far
+    :attr last_date: the latest conviction date fed in (or None)
+    :attr felony_level: (property) felony record level (1-6)
+    :attr misdemeanor_level: (property) misdemeanor record level (1-3)
+    :attr habeligible: (property) T if habitual eligible (None if no bd)
+    :attr date_eligible: (property) date D became habitual eligible
+    :attr habcons: (property) the strikes (Charges) found so far
+
+    METHODS:
+    ____________________________________________________________________
+    :method date_iseligible: takes offense date and ret T if eligible
+    :method copy: ret a copy that can be fed on without changing this
+    '''
+    def __init__(self, birthdate: object = None):
+        self.felony_points = 0
+        self.misdemeanor_points = 0
+        self.misdemeanor_stage = LEVEL_ONE
+        self.dumbwaiter = None
+        if birthdate != None:
+            self.dumbwaiter = Dumbwaiter(birthdate)
+        self.dates = 0
+        self.last_date = None
+
+    @property
+    def felony_level(self) -> int:
+        return felony_level(self.felony_points)
+
+    @property
+    def misdemeanor_level(self) -> int:
+        return misdemeanor_level(self.misdemeanor_points)
+
+    @property
+    def habeligible(self) -> bool:
+        if self.dumbwaiter == None:
+            return None
+        return self.dumbwaiter.habeligible
+
+    @property
+    def date_eligible(self) -> object:
+        if self.dumbwaiter == None:
+            return None
+        return self.dumbwaiter.date_eligible
+
+    @property
+    def habcons(self) -> list:
+        if self.dumbwaiter == None:
+            return []
+        return self.dumbwaiter.habcons
+
+    def date_iseligible(self, offense_date: object) -> bool:
+        '''
+        Takes a later offense date and returns whether it is eligible 
+        for habitual status (see HabitualMachine.date_iseligible).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param offense_date: date of offense to test
+        '''
+        if self.dumbwaiter == None:
+            return False
+        return self.dumbwaiter.offensedate_iseligible(offense_date)
+
+    def copy(self) -> object:
+        '''
+        Returns a copy of this analysis (with its own Dumbwaiter and 
+        strike list), so the copy can be fed more dates while this one
+        stays as it is.
+
+        RETURN:
+        ________________________________________________________________
+        :return: the copy
+        :rtype: RecordAnalysis
+        '''
+        copy = RecordAnalysis()
+        copy.felony_points = self.felony_points
+        copy.misdemeanor_points = self.misdemeanor_points
+        copy.misdemeanor_stage = self.misdemeanor_stage
+        copy.dates = self.dates
+        copy.last_date = self.last_date
+        if self.dumbwaiter != None:
+            copy.dumbwaiter = Dumbwaiter(self.dumbwaiter.birthdate)
+            copy.dumbwaiter.habcons = list(self.dumbwaiter.habcons)
+            copy.dumbwaiter.habeligible = self.dumbwaiter.habeligible
+            copy.dumbwaiter.date_eligible = self.dumbwaiter.date_eligible
+            copy.dumbwaiter.has_run = self.dumbwaiter.has_run
+        return copy
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(felony {self.felony_points} " \
+            f"pts/level {self.felony_level}, misdemeanor " \
+            f"{self.misdemeanor_points} pts/level " \
+            f"{self.misdemeanor_level}, habitual {self.habeligible})"
+
+class RecordAnalyzer:
+    '''
+    RecordAnalyzer runs the felony, misdemeanor and habitual rules over
+    a record in a single walk of its conviction dates.
+
+    METHODS:
+    ____________________________________________________________________
+    :method analyze: takes colx (and bd) -> RecordAnalysis
+    :method feed: takes a RecordAnalysis and the next ConvictionDate
+    :method is_qualified: T if a charge counts toward habitual status
+
+    USE:
+    ____________________________________________________________________
+    analysis = RecordAnalyzer().analyze(crim_record, birthdate)
+    analysis.felony_level       # same as Felony_RecordMachine().level
+    analysis.misdemeanor_level  # same as MisdemeanorRecordMachine.level
+    analysis.habeligible        # same as HabitualMachine.habeligible
+    '''
+    def analyze(self, colx: object, birthdate: object = None) -> object:
+        '''
+        Groups colx (if it has changed) and feeds each of its 
+        conviction dates, in order, into a new RecordAnalysis.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: a Charge_Collection--Charges for D
+        :param birthdate: D's birthdate (datetime.date) for habitual 
+        analysis; without it, habitual status is not analyzed
+
+        RETURN:
+        ________________________________________________________________
+        :return: the results for all three records
+        :rtype: RecordAnalysis
+        '''
+        colx.groupby_convictiondate()
+        analysis = RecordAnalysis(birthdate)
+        for condate in colx.cons_bydate:
+            self.feed(analysis, condate)
+        if analysis.dumbwaiter != None:
+            analysis.dumbwaiter.has_run = True
+        return analysis
+
+    def feed(self, analysis: object, condate: object):
+        '''
+        Applies one conviction date (the next in date order) to all 
+        three rule sets.
+
+        Felony: the top charge of the date earns its felony_points (its
+        chart value if a felony, 1 for an eligible 1/A1 misdemeanor).
+        Misdemeanor: at LEVEL_ONE, a qualified top charge earns the 
+        first point and moves to LEVEL_TWO; at LEVEL_TWO, below 5 pts, 
+        a qualified top charge adds a point and any other sets the 
+        points back to 0 (as LevelTwo does).
+        Habitual: the first qualified felony of the date is the next 
+        strike (strikes after the first need D to be 18 on the offense 
+        date); the third strike's date is when D became eligible.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param analysis: the RecordAnalysis to update
+        :param condate: the ConvictionDate to apply
+        '''
+        highest = condate.highest()
+        analysis.dates += 1
+        analysis.last_date = condate.disposition_date
+        if highest == None:
+            return
+        top = highest[0]
+        analysis.felony_points += top.crime.felony_points
+
+        qualified = top.convicted == True and top.crime.misd_qualified
+        if analysis.misdemeanor_stage == LEVEL_ONE:
+            if qualified:
+                analysis.misdemeanor_points += 1
+                analysis.misdemeanor_stage = LEVEL_TWO
+        elif analysis.misdemeanor_points < 5:
+            if qualified:
+                analysis.misdemeanor_points += 1
+            else:
+                analysis.misdemeanor_points = 0
+
+        dumbwaiter = analysis.dumbwaiter
+        if dumbwaiter == None or dumbwaiter.habeligible \
+            or condate.top < FELONIES:
+            return
+        firststrike = dumbwaiter.habcons == []
+        for f in chain.from_iterable(condate.convictions[FELONIES:]):
+            if self.is_qualified(f) and \
+                (firststrike or dumbwaiter.over18_on_date(f.offense_date)):
+                dumbwaiter.habcons.append(f)
+                if len(dumbwaiter.habcons) == 3:
+                    dumbwaiter.set_habeligible(True)
+                    dumbwaiter.set_date_eligible(condate.disposition_date)
+                break
+
+    def is_qualified(self, c: object) -> bool:
+        '''
+        returns True if a conviction counts toward habitual status (see
+        habitualmachine's State.is_qualified).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param c: a Charge object to test
+        '''
+        return bool(c.convicted) and c.crime.hab_qualified
@@ -0,0 +1,396 @@
+'''
+file    archive.py
+author  Keith Helsabeck
+
+This is the file archive.py, for an on-disk archive of many records
+(for backfills too big to load at once), read through mmap without
+copying.
+
+The archive holds the ColumnarCharges columns (one fixed-width array
+per field, one entry per charge, with the same typecodes) in defendant
+order, the columns needed to make the Charges again (the crime's index,
+the charge's id and UUID), an offset index of where each defendant's
+charges start, and the Defendants and Crimes as codec encodings (see
+codec.py), with offset indexes of their own.
+
+Opening an archive reads its header and maps the file. Each column is
+a memoryview, cast to its typecode, over the mapped bytes, so nothing
+is read or copied until it is used, and opening takes the same time
+for any size of archive. A view (of one defendant or a range of them)
+slices the columns, again without copying, and can be scored by
+columnar.score() as it is. load_collection() makes a defendant's
+Charges for the FSMs, or (lazy=True) a LazyChargeCollection that only
+makes the Charges the FSMs ask for.
+
+The columns are in this machine's byte order (the header says which,
+and an archive in the other order won't open). close() fails (with
+BufferError) while slices of the columns are still held.
+
+FILE:
+________________________________________________________________________
+header: magic b"CTAR", version (u8), byte order (u8: 0 little, 1 big),
+2 pad bytes, then for each of SECTIONS its offset in bytes and its
+length in items (little-endian i64s). Each section starts on an 8-byte
+boundary.
+
+USE:
+________________________________________________________________________
+write_archive("docket.ctar", load_csv("export.csv"))
+with Archive("docket.ctar") as archive:
+    scores = score(archive.view())              # everyone, columnar
+    defendant, colx = archive.load_record(archive.find(1234))
+'''
+import mmap
+import struct
+import sys
+import typing
+import uuid
+from array import array
+from datetime import date
+
+from . import codec
+from .charge import Charge
+from .collections import Charge_Collection
+from .columnar import ColumnarCharges, CONVICTED
+from .lazy import LazyChargeCollection
+
+MAGIC = b"CTAR"
+VERSION = 1
+BYTEORDER = 0 if sys.byteorder == "little" else 1
+ALIGN = 8
+
+# (name, typecode) of each section, in file order
+SECTIONS = (
+    # per charge (the ColumnarCharges columns first)
+    ("defendant", "i"), ("offense", "i"), ("disposition", "i"),
+    ("rank", "b"), ("points", "b"), ("flags", "B"),
+    ("charge_crime", "i"), ("charge_id", "q"), ("charge_present", "B"),
+    ("charge_uid", "B"),                                # 16 per charge
+    # per defendant (start and defendant_at have one more, for the end)
+    ("start", "q"), ("defendant_ids", "q"), ("birth18", "i"),
+    ("defendant_at", "q"), ("defendant_data", "B"),
+    # per crime (crime_at has one more)
+    ("crime_at", "q"), ("crime_data", "B"),
+)
+CHARGE_COLUMNS = ("defendant", "offense", "disposition", "rank", "points",
+    "flags")
+
+HEADER = struct.Struct("<4sBB2x")
+SECTION = struct.Struct("<qq")
+
+def aligned(offset: int) -> int:
+    '''Returns offset moved up to the next ALIGN boundary.'''
+    return -(-offset // ALIGN) * ALIGN
+
+def write_archive(path: str, records: typing.Iterable) -> int:
+    '''
+    Writes records to an archive file (replacing any file at path).
+    Every charge needs a crime (as in ColumnarCharges), and every
+    defendant an int id; crimes shared by charges are written once.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param path: the file to write
+    :param records: an iterable of (Defendant, charges) pairs, charges
+    a Charge_Collection or an iterable of Charges (as the loader yields)
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the number of defendants written
+    :rtype: int
+    '''
+    store = ColumnarCharges()
+    columns = { name: array(code) for name, code in SECTIONS }
+    columns["start"].append(0)
+    columns["defendant_at"].append(0)
+    columns["crime_at"].append(0)
+    uids, defendants, crimes = bytearray(), bytearray(), bytearray()
+    index = {}          # id(crime) -> (its index, the crime: kept alive)
+    for defendant, charges in records:
+        if type(defendant.id) != int:
+            raise ValueError("An archived defendant needs an int id.")
+        charges = list(getattr(charges, "charges", charges))
+        store.add_record(defendant, charges)
+        for charge in charges:
+            found = index.get(id(charge.crime))
+            if found == None:
+                found = index[id(charge.crime)] = (len(index), charge.crime)
+                crimes += codec.pack_crime(charge.crime)
+                columns["crime_at"].append(len(crimes))
+            present, number, uid = codec.identity(charge)
+            columns["charge_crime"].append(found[0])
+            columns["charge_id"].append(number)
+            columns["charge_present"].append(present)
+            uids += uid
+        columns["start"].append(len(store))
+        defendants += codec.encode_defendant(defendant)
+        columns["defendant_at"].append(len(defendants))
+    for name in CHARGE_COLUMNS + ("birth18",):
+        columns[name] = getattr(store, name)
+    columns["defendant_ids"] = array("q", store.defendant_ids)
+    columns["charge_uid"] = uids
+    columns["defendant_data"] = defendants
+    columns["crime_data"] = crimes
+    offset = aligned(HEADER.size + SECTION.size * len(SECTIONS))
+    table = []
+    for name, code in SECTIONS:
+        table.append((offset, len(columns[name])))
+        offset = aligned(offset + len(columns[name]) * array(code).itemsize)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, BYTEORDER))
+        for entry in table:
+            file.write(SECTION.pack(*entry))
+        for (name, code), (offset, count) in zip(SECTIONS, table):
+            file.write(bytes(offset - file.tell()))
+            file.write(columns[name])
+    return store.defendants
+
+def to_date(ordinal: int) -> object:
+    '''Returns the date for a day ordinal (None for 0).'''
+    return date.fromordinal(ordinal) if ordinal else None
+
+class ArchiveView:
+    '''
+    ArchiveView holds the columns of a range of an archive's defendants
+    (slices of the mapped columns: nothing is copied), in the form
+    columnar.score() takes. Entry i of the per-defendant columns is the
+    archive's defendant first + i.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr defendant...flags: the charges' columns (see ColumnarCharges)
+    :attr defendant_ids: the defendants' ids (a list)
+    :attr birth18: per defendant, the 18th birthday ordinal (0 for none)
+    :attr first: the archive index of the first defendant
+    :attr rows: the archive rows of the charges (a range)
+    '''
+    def __init__(self, archive: object, first: int, last: int):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param archive: an open Archive
+        :param first: the first defendant's index
+        :param last: the index after the last defendant's
+        '''
+        start, end = archive.start[first], archive.start[last]
+        for name in CHARGE_COLUMNS:
+            setattr(self, name, getattr(archive, name)[start:end])
+        self.defendant_ids = archive.defendant_ids[first:last].tolist()
+        self.birth18 = archive.birth18[first:last]
+        self.first = first
+        self.rows = range(start, end)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def defendants(self) -> int:
+        '''The number of defendants in the view.'''
+        return len(self.defendant_ids)
+
+    def release(self):
+        '''Releases the slices (so the archive can be closed).'''
+        for name in CHARGE_COLUMNS + ("birth18",):
+            getattr(self, name).release()
+
+class Archive:
+    '''
+    Archive opens an archive file (see write_archive) with mmap.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr path: the file
+    :attr defendant...crime_data: the sections (memoryviews, see
+    SECTIONS)
+    :attr crimes: the Crimes made so far, by index (charges made from
+    the archive share them)
+
+    METHODS:
+    ____________________________________________________________________
+    :method view: ret an ArchiveView of a range of defendants
+    :method find: ret the index of the defendant with an id
+    :method load_defendant: ret a defendant's Defendant
+    :method load_crime: ret a Crime by its index
+    :method load_charge: ret the Charge in a row
+    :method load_charges: ret a defendant's Charges
+    :method load_collection: ret a defendant's (lazy) Charge_Collection
+    :method load_record: ret a defendant's (Defendant, Charge_Collection)
+    :method records: yields every (Defendant, Charge_Collection)
+    :method close: unmaps the file
+    '''
+    def __init__(self, path: str):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param path: the archive file
+        '''
+        self.path = path
+        with open(path, "rb") as file:
+            try:
+                self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError("This is not an archive (it is empty).")
+        self.buffer = memoryview(self.mm)
+        self.views = []
+        self.crimes = {}
+        self.index = None
+        try:
+            self.open_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def open_sections(self):
+        '''Helper: checks the header and casts each section's view.'''
+        size = HEADER.size + SECTION.size * len(SECTIONS)
+        if len(self.mm) < size:
+            raise ValueError("This is not an archive.")
+        magic, version, order = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("This is not an archive (or not version 1).")
+        if order != BYTEORDER:
+            raise ValueError("This archive is in the other byte order.")
+        for n, (name, code) in enumerate(SECTIONS):
+            offset, count = SECTION.unpack_from(self.mm,
+                HEADER.size + SECTION.size * n)
+            end = offset + count * array(code).itemsize
+            if offset < size or end > len(self.mm):
+                raise ValueError("The archive is cut short.")
+            view = self.buffer[offset:end].cast(code)
+            self.views.append(view)
+            setattr(self, name, view)
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.defendant_ids)
+
+    def close(self):
+        '''Releases the sections and unmaps the file.'''
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.buffer.release()
+        self.mm.close()
+
+    def view(self, first: int = 0, last: int = None) -> object:
+        '''
+        Returns an ArchiveView of defendants first to last (all of them
+        by default), for columnar.score().
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param first: the first defendant's index
+        :param last: the index after the last defendant's
+        '''
+        last = len(self) if last == None else last
+        if not 0 <= first <= last <= len(self):
+            raise ValueError("The view is out of the archive's range.")
+        return ArchiveView(self, first, last)
+
+    def find(self, defendant_id: int) -> int:
+        '''
+        Returns the index of the defendant with an id (the first time,
+        this reads all the ids into a dict).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the Defendant's id
+        '''
+        if self.index == None:
+            self.index = {}
+            for n, number in enumerate(self.defendant_ids):
+                self.index.setdefault(number, n)
+        if defendant_id not in self.index:
+            raise ValueError("No defendant in the archive has that id.")
+        return self.index[defendant_id]
+
+    def load_defendant(self, index: int) -> object:
+        '''Returns the Defendant with an index.'''
+        at, end = self.defendant_at[index], self.defendant_at[index + 1]
+        return codec.decode_defendant(self.defendant_data[at:end])
+
+    def load_crime(self, index: int) -> object:
+        '''Returns the Crime with an index (made once, then shared).'''
+        crime = self.crimes.get(index)
+        if crime == None:
+            crime = self.crimes[index] = codec.unpack_crime(
+                self.crime_data, self.crime_at[index])[0]
+        return crime
+
+    def load_charge(self, row: int, dates: dict = None) -> object:
+        '''
+        Returns the Charge in a row (made from the columns).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param row: the charge's row
+        :param dates: optional, dates made already (by ordinal, with 0 
+        for None), to share
+        '''
+        present = self.charge_present[row]
+        offense, disposition = self.offense[row], self.disposition[row]
+        if dates == None:
+            offense, disposition = to_date(offense), to_date(disposition)
+        else:
+            offense, disposition = dates[offense], dates[disposition]
+        return Charge.from_fields(
+            self.charge_id[row] if present & codec.HAS_ID else None,
+            uuid.UUID(bytes=bytes(self.charge_uid[16 * row:16 * row + 16]))
+                if present & codec.HAS_UID else None,
+            offense, self.load_crime(self.charge_crime[row]), disposition,
+            self.flags[row] & CONVICTED == CONVICTED, trusted=True)
+
+    def load_charges(self, index: int) -> list:
+        '''Returns the Charges of the defendant with an index.'''
+        return [ self.load_charge(row)
+            for row in range(self.start[index], self.start[index + 1]) ]
+
+    def load_collection(self, index: int, lazy: bool = False) -> object:
+        '''
+        Returns the charges of the defendant with an index.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param index: the defendant's index
+        :param lazy: True for a LazyChargeCollection over the archive's
+        rows (its Charges are made only as they are asked for)
+
+        RETURN:
+        ________________________________________________________________
+        :return: the defendant's charges
+        :rtype: Charge_Collection (or LazyChargeCollection)
+        '''
+        if not lazy:
+            colx = Charge_Collection()
+            colx.add_charges(self.load_charges(index))
+            return colx
+        start, end = self.start[index], self.start[index + 1]
+        offenses = self.offense[start:end].tolist()
+        dispositions = self.disposition[start:end].tolist()
+        dates = { 0: None }                 # ordinal: date, shared
+        for ordinal in set(offenses).union(dispositions):
+            if ordinal:
+                dates[ordinal] = date.fromordinal(ordinal)
+        colx = LazyChargeCollection(
+            make=lambda row: self.load_charge(row, dates))
+        colx.add_sources(range(start, end), map(dates.get, offenses),
+            map(self.load_crime, self.charge_crime[start:end].tolist()),
+            map(dates.get, dispositions), [ flags & CONVICTED == CONVICTED
+            for flags in self.flags[start:end].tolist() ])
+        return colx
+
+    def load_record(self, index: int, lazy: bool = False) -> tuple:
+        '''Returns (Defendant, charges) for an index (see 
+        load_collection).'''
+        return self.load_defendant(index), self.load_collection(index, lazy)
+
+    def records(self, lazy: bool = False) -> typing.Iterator:
+        '''Yields every (Defendant, charges), in order (see 
+        load_collection).'''
+        for index in range(len(self)):
+            yield self.load_record(index, lazy)
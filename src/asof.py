@@ -0,0 +1,139 @@
+'''
+file    asof.py
+author  Keith Helsabeck
+
+This is the file asof.py, for a defendant's records as they stood on a
+past date (ie: the prior record level on the offense date of a new
+charge, rather than today's).
+
+AsOfIndex walks the record's conviction dates once (with RecordAnalyzer)
+and keeps the running totals after each date: felony points,
+misdemeanor points and habitual strikes. Every total only depends on the
+dates up to it, so the record as of any date D is the totals after the
+last conviction date on or before D, found with a bisect in O(log n).
+That gives the same answers as rerunning the FSMs over only the
+convictions up to D.
+
+USE:
+________________________________________________________________________
+index = AsOfIndex(colx, defendant.birthdate)
+index.as_of(new_charge.offense_date).felony_level
+'''
+import typing
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from .analyzer import RecordAnalyzer, RecordAnalysis
+from .FelonyStatemachine import felony_level
+from .misdemeanor_machine import misdemeanor_level
+
+# D's records as of a date (habeligible and date_eligible are None if no
+# birthdate was given, and strikes is then 0).
+AsOf = namedtuple("AsOf", [
+    "felony_points", "felony_level", "misdemeanor_points",
+    "misdemeanor_level", "strikes", "habeligible", "date_eligible",
+])
+
+class AsOfIndex:
+    '''
+    AsOfIndex answers "what were D's records as of date D" queries.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr dates: the conviction dates, in order
+    :attr felony_points: felony points after each date
+    :attr misdemeanor_points: misdemeanor points after each date
+    :attr strikes: habitual strikes found after each date
+    :attr habcons: all the strikes (Charges), in order
+    :attr analysis: the RecordAnalysis of the whole record
+
+    METHODS:
+    ____________________________________________________________________
+    :method as_of: takes a date -> AsOf (dates on or before it count)
+    :method before: takes a date -> AsOf (dates before it count)
+    '''
+    def __init__(self, colx: object, birthdate: object = None,
+        analyzer: object = None):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: a Charge_Collection--Charges for D
+        :param birthdate: D's birthdate (for habitual status)
+        :param analyzer: the RecordAnalyzer to use (default: new)
+        '''
+        analyzer = analyzer or RecordAnalyzer()
+        colx.groupby_convictiondate()
+        analysis = RecordAnalysis(birthdate)
+        self.dates = []
+        self.felony_points = array("i")
+        self.misdemeanor_points = array("i")
+        self.strikes = array("b")
+        for condate in colx.cons_bydate:
+            analyzer.feed(analysis, condate)
+            self.dates.append(condate.disposition_date)
+            self.felony_points.append(analysis.felony_points)
+            self.misdemeanor_points.append(analysis.misdemeanor_points)
+            self.strikes.append(len(analysis.habcons))
+        if analysis.dumbwaiter != None:
+            analysis.dumbwaiter.has_run = True
+        self.analysis = analysis
+        self.habcons = list(analysis.habcons)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def snapshot(self, count: int) -> object:
+        '''
+        Helper: D's records after the first count conviction dates.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param count: how many of the dates count (0 for none)
+        '''
+        if count == 0:
+            felony, misdemeanor, strikes = 0, 0, 0
+        else:
+            felony = self.felony_points[count - 1]
+            misdemeanor = self.misdemeanor_points[count - 1]
+            strikes = self.strikes[count - 1]
+        habeligible, date_eligible = None, None
+        if self.analysis.dumbwaiter != None:
+            habeligible = strikes == 3
+            if habeligible:
+                date_eligible = self.analysis.date_eligible
+        return AsOf(felony, felony_level(felony), misdemeanor,
+            misdemeanor_level(misdemeanor), strikes, habeligible,
+            date_eligible)
+
+    def as_of(self, dt: object) -> object:
+        '''
+        Returns D's records as they stood at the end of a date (counting
+        convictions on that date).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param dt: a datetime.date
+
+        RETURN:
+        ________________________________________________________________
+        :return: the records as of dt
+        :rtype: AsOf
+        '''
+        return self.snapshot(bisect_right(self.dates, dt))
+
+    def before(self, dt: object) -> object:
+        '''
+        Returns D's records as they stood at the start of a date (not
+        counting convictions on that date).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param dt: a datetime.date
+
+        RETURN:
+        ________________________________________________________________
+        :return: the records before dt
+        :rtype: AsOf
+        '''
+        return self.snapshot(bisect_left(self.dates, dt))
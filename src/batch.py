@@ -0,0 +1,138 @@
+'''
+file    batch.py
+author  Keith Helsabeck
+
+This is the file batch.py, for scoring many defendants' records in one 
+call. Each input is a (defendant, charges) pair. The records are sent
+in chunks to a pool of worker processes, which score the felony, 
+misdemeanor and habitual records (in one pass, with RecordAnalyzer), and
+the results stream back (in input order) as BatchResults.
+
+USE:
+________________________________________________________________________
+for result in score_batch(records, workers=8, chunksize=256):
+    print(result.defendant_id, result.felony_level, result.habeligible)
+'''
+import os
+import typing
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .collections import Charge_Collection
+from .analyzer import RecordAnalyzer
+
+ANALYZER = RecordAnalyzer()
+
+# The scores for one defendant (habeligible and date_eligible are None 
+# if the defendant has no birthdate, which habitual analysis needs).
+BatchResult = namedtuple("BatchResult", [
+    "defendant_id", "felony_points", "felony_level", 
+    "misdemeanor_points", "misdemeanor_level", 
+    "habeligible", "date_eligible",
+])
+
+def as_collection(charges: object) -> object:
+    '''
+    Returns charges as a Charge_Collection (charges may already be one,
+    or be any iterable of Charges; a LazyChargeCollection is kept as it
+    is).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param charges: a Charge_Collection or an iterable of Charges
+    '''
+    if isinstance(charges, Charge_Collection):
+        return charges
+    colx = Charge_Collection()
+    colx.add_charges(charges)
+    return colx
+
+def score_record(record: tuple) -> object:
+    '''
+    Scores one defendant's record (felony, misdemeanor and habitual).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param record: a (Defendant, charges) pair (see as_collection)
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the defendant's scores
+    :rtype: BatchResult
+    '''
+    defendant, charges = record
+    analysis = ANALYZER.analyze(as_collection(charges), 
+        defendant.birthdate)
+    return BatchResult(
+        defendant.id, analysis.felony_points, analysis.felony_level, 
+        analysis.misdemeanor_points, analysis.misdemeanor_level, 
+        analysis.habeligible, analysis.date_eligible,
+    )
+
+def score_chunk(chunk: list) -> list:
+    '''Worker task: scores a list of records (see score_record).'''
+    return [ score_record(record) for record in chunk ]
+
+def chunked(records: typing.Iterable, chunksize: int) -> typing.Iterator:
+    '''Yields lists of up to chunksize records from records.'''
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunksize))
+        if chunk == []:
+            return
+        yield chunk
+
+def score_batch(records: typing.Iterable, workers: int = None, 
+    chunksize: int = 128, inflight: int = None, 
+    pool: object = None) -> typing.Iterator:
+    '''
+    Scores many records across a pool of worker processes and yields 
+    a BatchResult for each, in the order the records came in.
+
+    records is read lazily, and at most inflight chunks are out at the 
+    workers at once, so memory stays bounded however many records there
+    are. Larger chunks cut the cost of sending work to the processes; 
+    smaller ones spread it more evenly. Starting a pool costs far more 
+    than scoring a small batch, so a caller scoring many small batches 
+    can pass in one pool to use for all of them.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param records: an iterable of (Defendant, charges) pairs
+    :param workers: number of processes (default os.cpu_count()); with 
+    1, the records are scored in this process with no pool at all
+    :param chunksize: number of records sent to a worker at once
+    :param inflight: chunks out at once (default 2 per worker)
+    :param pool: a ProcessPoolExecutor to score in (it is left running,
+    and workers should be its size); by default one is started for 
+    this call
+
+    RETURN:
+    ____________________________________________________________________
+    :return: an iterator of BatchResults
+    :rtype: iterator
+    '''
+    if workers == None:
+        workers = os.cpu_count() or 1
+    if type(workers) != int or workers < 1 \
+        or type(chunksize) != int or chunksize < 1:
+        raise ValueError("workers and chunksize must be ints of 1 or more.")
+    if workers == 1 and pool == None:
+        for record in records:
+            yield score_record(record)
+        return
+    if inflight == None:
+        inflight = 2 * workers
+    if pool == None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from score_batch(records, workers, chunksize, inflight, 
+                pool)
+        return
+    pending = deque()
+    for chunk in chunked(records, chunksize):
+        pending.append(pool.submit(score_chunk, chunk))
+        if len(pending) >= inflight:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
@@ -0,0 +1,246 @@
+'''
+file    catalog.py
+author  Keith Helsabeck
+
+This is the file catalog.py, for holding the class CrimeCatalog.
+CrimeCatalog is a registry of Crimes, so that every charge of the same 
+crime can share one Crime instance instead of each holding its own. It
+indexes its crimes by statute (chapter, section, or subsection) and by 
+class, and it keeps each crime's FSM flags as a CrimeFlags tuple.
+'''
+import typing
+import uuid
+from collections import namedtuple
+
+from .crime import Crime, CLASS_BY_LABEL
+
+# The per-crime results of the FSMs' tests on a conviction's crime:
+# habitual: counts as a prior felony for habitual status
+# felony_points: felony record points if it is the top charge of a date
+# misdemeanor_point: counts as a prior for the misdemeanor record
+CrimeFlags = namedtuple(
+    "CrimeFlags", ["habitual", "felony_points", "misdemeanor_point"]
+)
+
+def statute_key(statute: str) -> str:
+    '''
+    Normalizes a statute for lookups: drops a leading "§", "NCGS" or 
+    "G.S.", spaces, and case (eg: "§ 14-72(a)" -> "14-72(a)").
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param statute: a statute string (eg: "§14-72")
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the normalized statute
+    :rtype: str
+    '''
+    key = statute.lower().replace(" ", "")
+    for prefix in ("§", "ncgs", "n.c.g.s.", "g.s."):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    return key.lstrip("§")
+
+def statute_prefixes(statute: str) -> list:
+    '''
+    Returns the keys a statute is indexed under: its chapter, section,
+    and each level of subsection (eg: "§14-33(c)(2)" -> ["14", "14-33",
+    "14-33(c)", "14-33(c)(2)"]). A dotted section is also indexed under
+    the section it follows (eg: "§20-138.1" under "20-138"), the way the
+    FSMs' statute tests match it.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param statute: a statute string (eg: "§14-72")
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the prefixes (shortest first), none repeated
+    :rtype: list
+    '''
+    key = statute_key(statute)
+    if key == "":
+        return []
+    prefixes = [ key.split("-")[0] ]
+    for count, char in enumerate(key):
+        if char in "(.":
+            prefixes.append(key[:count])
+    prefixes.append(key)
+    return list(dict.fromkeys(p for p in prefixes if p != ""))
+
+class CrimeCatalog:
+    '''
+    CrimeCatalog interns Crimes by (statute, crimeclass, description), 
+    so there is one Crime instance per distinct crime. Crimes in the
+    catalog are shared, and should not be changed once interned.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr crimes: list of the interned crimes (in the order added)
+    :attr bykey: dict of (statute, crimeclass, description) -> Crime
+    :attr bystatute: dict of statute prefix -> list of Crimes
+    :attr byclass: dict of CrimeClass -> list of Crimes
+    :attr flagsbykey: dict of (statute, crimeclass, description) -> 
+    CrimeFlags
+
+    METHODS:
+    ____________________________________________________________________
+    :method intern: takes statute, class, description -> shared Crime
+    :method add: takes a Crime -> the shared Crime with the same data
+    :method by_statute: takes a statute prefix -> list of Crimes
+    :method by_class: takes a class (str or CrimeClass) -> list of Crimes
+    :method flags: takes a Crime -> its CrimeFlags
+    '''
+    def __init__(self):
+        self.crimes = []
+        self.bykey = {}
+        self.bystatute = {}
+        self.byclass = {}
+        self.flagsbykey = {}
+
+    def __len__(self) -> int:
+        return len(self.crimes)
+
+    def __iter__(self):
+        return iter(self.crimes)
+
+    def __contains__(self, crime: object) -> bool:
+        return type(crime) == Crime and \
+            self.bykey.get(self.key(crime)) is crime
+
+    def key(self, crime: object) -> tuple:
+        '''Returns the tuple a crime is interned under.'''
+        return (crime.statute, crime.crimeclass, crime.description)
+
+    def intern(self, statute: str, crimeclass: str, 
+        description: str = "") -> object:
+        '''
+        Returns the catalog's Crime for this data, making it (through
+        the Crime setters, so bad data raises ValueError) if it is new.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param statute: the statute (eg: "§14-72")
+        :param crimeclass: the class (eg: "Class H Felony" or CrimeClass)
+        :param description: the crime's name (eg: "Felony Larceny")
+
+        RETURN:
+        ________________________________________________________________
+        :return: the shared Crime
+        :rtype: Crime
+        '''
+        label = getattr(crimeclass, "label", crimeclass)
+        crime = self.bykey.get((statute, label, description))
+        if crime != None:
+            return crime
+        crime = Crime()
+        crime.set_statute(statute)
+        crime.set_crimeclass(crimeclass)
+        crime.set_description(description)
+        crime.set_id(len(self.crimes) + 1)
+        crime.set_uid(uuid.uuid4())
+        return self.register(crime)
+
+    def add(self, crime: object) -> object:
+        '''
+        Interns an existing Crime. If the catalog already has a crime 
+        with the same data, that one is returned; else crime itself is 
+        added and returned.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crime: a Crime (with a valid class)
+
+        RETURN:
+        ________________________________________________________________
+        :return: the shared Crime
+        :rtype: Crime
+        '''
+        if type(crime) != Crime or crime.classrank == None:
+            raise ValueError("Only Crimes with a valid class may be added.")
+        found = self.bykey.get(self.key(crime))
+        if found != None:
+            return found
+        return self.register(crime)
+
+    def register(self, crime: object) -> object:
+        '''Helper for intern() and add(): indexes a new crime.'''
+        key = self.key(crime)
+        self.bykey[key] = crime
+        self.crimes.append(crime)
+        for prefix in statute_prefixes(crime.statute):
+            self.bystatute.setdefault(prefix, []).append(crime)
+        self.byclass.setdefault(crime.classrank, []).append(crime)
+        self.flagsbykey[key] = self.make_flags(crime)
+        return crime
+
+    def make_flags(self, crime: object) -> object:
+        '''
+        Returns a crime's CrimeFlags (from the flags the Crime works out
+        when its class and statute are set).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crime: a Crime (with a valid class)
+
+        RETURN:
+        ________________________________________________________________
+        :return: the crime's flags
+        :rtype: CrimeFlags
+        '''
+        return CrimeFlags(
+            crime.hab_qualified, crime.felony_points, crime.misd_qualified
+        )
+
+    def by_statute(self, statute: str) -> list:
+        '''
+        Returns the crimes under a statute prefix: a chapter ("14"), a 
+        section ("§14-72", "20-138") or a subsection ("14-72(a)"). 
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param statute: the statute prefix to look up
+
+        RETURN:
+        ________________________________________________________________
+        :return: the matching crimes (empty if none)
+        :rtype: list
+        '''
+        return list(self.bystatute.get(statute_key(statute), []))
+
+    def by_class(self, crimeclass: object) -> list:
+        '''
+        Returns the crimes of a class.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crimeclass: a class string or CrimeClass
+
+        RETURN:
+        ________________________________________________________________
+        :return: the matching crimes (empty if none)
+        :rtype: list
+        '''
+        if type(crimeclass) == str:
+            crimeclass = CLASS_BY_LABEL.get(crimeclass)
+        return list(self.byclass.get(crimeclass, []))
+
+    def flags(self, crime: object) -> object:
+        '''
+        Returns the CrimeFlags for a crime in the catalog (or for a 
+        crime with the same data as one in the catalog).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crime: a Crime
+
+        RETURN:
+        ________________________________________________________________
+        :return: the crime's flags
+        :rtype: CrimeFlags
+        '''
+        try:
+            return self.flagsbykey[self.key(crime)]
+        except KeyError:
+            raise ValueError("This crime is not in the catalog.")
@@ -11,6 +11,8 @@ import typing
 import uuid
 from .defendant import Defendant
 from .crime import Crime
+from .fields import NONE, columns, check_types
+from .ids import uuid_isvalid
 import datetime
 
 class Charge:
@@ -28,7 +30,20 @@ class Charge:
 
     METHODS
     :method date_isvalid: ret T if date valid, else F
+    :method from_fields: (classmethod) makes a Charge from its fields
+    :method from_rows: (classmethod) makes Charges from rows of fields
+
+    Charge uses __slots__ (no per-instance __dict__), since a county's 
+    docket can hold millions of these.
     '''
+    __slots__ = (
+        "id", "unique_id", "offense_date", "crime", "disposition_date", 
+        "convicted",
+    )
+
+    # the fields of a row for from_rows (from_fields' parameters)
+    FIELDS = __slots__
+
     def __init__(self):
         self.id = None
         self.unique_id = None
@@ -37,6 +52,92 @@ class Charge:
         self.disposition_date = None
         self.convicted = False
 
+    @classmethod
+    def from_fields(cls, id: int = None, unique_id: object = None, 
+        offense_date: object = None, crime: object = None, 
+        disposition_date: object = None, convicted: bool = False, 
+        trusted: bool = False) -> object:
+        '''
+        Makes a Charge from its fields. By default each field given 
+        (not None) is checked by its set_* method, as if set one by 
+        one. With trusted=True (for data that was checked already, eg:
+        from our own database), the fields are set with no checks.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param id...convicted: the Charge's fields
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Charge
+        :rtype: Charge
+        '''
+        if trusted:
+            charge = cls.__new__(cls)
+            charge.id = id
+            charge.unique_id = unique_id
+            charge.offense_date = offense_date
+            charge.crime = crime
+            charge.disposition_date = disposition_date
+            charge.convicted = convicted
+            return charge
+        charge = cls()
+        if id != None:
+            charge.set_id(id)
+        if unique_id != None:
+            charge.set_uid(unique_id)
+        if offense_date != None:
+            charge.set_offensedate(offense_date)
+        if crime != None:
+            charge.set_crime(crime)
+        if disposition_date != None:
+            charge.set_dispositiondate(disposition_date)
+        if type(convicted) != bool:
+            raise ValueError("convicted must be a bool.")
+        charge.convicted = convicted
+        return charge
+
+    @classmethod
+    def from_rows(cls, rows: typing.Iterable, trusted: bool = False) -> list:
+        '''
+        Makes Charges from rows of fields (in the order of FIELDS). By 
+        default the whole batch is checked first, a column at a time 
+        (see fields.py), with the same rules as from_fields; a bad 
+        value raises ValueError naming its row. With trusted=True, 
+        nothing is checked.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param rows: an iterable of tuples (see FIELDS)
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Charges, in row order
+        :rtype: list
+        '''
+        ids, uids, offenses, crimes, dispositions, convicted = \
+            columns(rows, len(cls.FIELDS))
+        if not trusted:
+            dates = { datetime.date, NONE }
+            check_types(ids, { int, NONE }, "An id must be a valid int.")
+            check_types(uids, { uuid.UUID, NONE }, 
+                "A unique_id must be a valid uuid4.")
+            check_types(offenses, dates, "A date must be a datetime.date.")
+            check_types(crimes, { Crime, NONE }, 
+                "A crime must be a valid Crime instance.")
+            check_types(dispositions, dates, 
+                "A date must be a datetime.date.")
+            check_types(convicted, { bool }, "convicted must be a bool.")
+        new, made = cls.__new__, []
+        for row in zip(ids, uids, offenses, crimes, dispositions, convicted):
+            charge = new(cls)
+            charge.id, charge.unique_id, charge.offense_date, charge.crime, \
+                charge.disposition_date, charge.convicted = row
+            made.append(charge)
+        return made
+
     def date_isvalid(self, dt: object) -> bool:
         '''
         validates the potential date as a valid datetime
@@ -93,9 +194,7 @@ class Charge:
         :returns: True for valid, else False
         :rtype: bool
         '''
-        if type(uid) == type(uuid.uuid4()):
-            return True
-        return False
+        return uuid_isvalid(uid)
 
     def set_uid(self, uid: object):
         '''
@@ -1,5 +1,5 @@
 '''
-file    convictiondate.py
+file    collections.py
 author  Keith Helsabeck
 
 These are the collections (for a D's pending charges and crim record). 
@@ -11,22 +11,66 @@ resisting two officers out of the same incident, and with assaulting
 a third.
 '''
 import typing
+from bisect import bisect_left
+from operator import attrgetter
 
 from .charge import Charge
 from .convictiondate import ConvictionDate
 
+# the fields of a charge that the grouping and the FSMs read (its crime
+# by identity: Crimes are shared by many records, so their fields are 
+# filed once per crime, see crime_fields)
+charge_fields = attrgetter("crime", "offense_date", "disposition_date", 
+    "convicted")
+
+def crime_fields(crime: object) -> tuple:
+    '''Returns the fields of a crime that the grouping and the FSMs 
+    read: its class and statute (its classrank and flags are worked out 
+    from these two, see Crime.setflags).'''
+    return (crime.crimeclass, crime.statute)
+
+def file_crimes(charges: typing.Iterable) -> dict:
+    '''Returns id(crime) -> (crime, crime_fields(crime)) for the crimes
+    of the charges.'''
+    return { id(charge.crime): (charge.crime, crime_fields(charge.crime))
+        for charge in charges if charge.crime != None }
+
 class Charge_Collection:
     '''Custom collection for making and storing charges. 
     
+    Only convictions are grouped: a charge disposed without one (eg: 
+    dismissed, convicted False) is kept in charges but left out of the 
+    conviction dates. The grouping by conviction date (unique_dates, 
+    cons_bydate) is kept up to date as charges are added and removed, so regrouping an 
+    unchanged collection costs no sort. The collection also keeps the 
+    fields of each charge as they were when it was filed (see 
+    charge_fields), and check_charges() compares them with the charges:
+    a charge edited in place (eg: a pending charge since disposed) marks
+    the collection changed, and the next grouping starts over. The 
+    class and statute of each crime are filed too (once per crime: 
+    Crimes are shared, eg: by a CrimeCatalog), so a Crime edited in 
+    place is found the same way.
+
     ATTRIBUTES:
     ____________________________________________________________________
     :attr charges: a list of charges
+    :attr unique_dates: sorted list of the unique conviction dates
+    :attr cons_bydate: list of ConvictionDates (same order as dates)
+    :attr version: int, goes up every time the collection changes
+    :attr dirty: True if the grouping must be rebuilt from scratch
+    :attr filed: each charge's charge_fields() when it was filed (in
+    the order of charges; only kept up to date while not dirty)
+    :attr filed_crimes: id(crime) -> (crime, its crime_fields() when 
+    filed), for the crimes of the charges (see file_crimes)
 
     METHODS:
     ____________________________________________________________________
     :method add_charge: adds a charge to the list
+    :method add_charges: adds many charges (regroups once, later)
     :method remove_charge: removes a charge from list by index
     :method reset_charges: resets charges as blank list
+    :method mark_changed: flags the grouping for a full rebuild
+    :method check_charges: marks changed if a charge has been edited
     :method is_in: takes charge, returns T if charge in charges else F
     :method sort_byoffensedate: sorts self.charges by date offense
     :method sortby_conviction: sorts self.charges by conviction date
@@ -35,19 +79,135 @@ class Charge_Collection:
     '''
 
     def __init__(self):
+        self.version = 0
         self.reset_charges()    #new empty list (self.charges)
 
     def reset_charges(self):
         '''This sets charges as an empty list.'''
         self.charges = []
+        self.unique_dates = []
+        self.cons_bydate = []
+        self.bydate = {}    # disposition_date -> ConvictionDate
+        self.filed = []
+        self.filed_crimes = {}
+        self.dirty = False
+        self.version += 1
     
     def add_charge(self, charge: object):
         '''This adds a pending charge after validation.'''
         if Charge == type(charge):
             self.charges.append(charge)
+            self.filed.append(charge_fields(charge))
+            if charge.crime != None and not self.dirty:
+                self.filed_crimes.setdefault(id(charge.crime), 
+                    (charge.crime, crime_fields(charge.crime)))
+            self.version += 1
+            self.index_charge(charge)
         else:
             raise ValueError("Only valid Charge objects may be added.")
 
+    def add_charges(self, charges: typing.Iterable):
+        '''This adds many charges after validation. 
+
+        For a bulk load, one full regroup is cheaper than filing every
+        charge as it comes (a new date in the middle of a long record 
+        has to be inserted into the middle of the date lists), so this
+        just marks the grouping for a rebuild.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param charges: an iterable of Charges
+        '''
+        charges = list(charges)
+        for charge in charges:
+            if Charge != type(charge):
+                raise ValueError("Only valid Charge objects may be added.")
+        self.charges.extend(charges)
+        self.mark_changed()
+
+    def mark_changed(self):
+        '''This flags the grouping to be rebuilt from scratch the next 
+        time groupby_convictiondate() is called (check_charges() calls
+        this when a charge already in the collection has been edited).'''
+        self.dirty = True
+        self.version += 1
+
+    def check_charges(self) -> bool:
+        '''This compares each charge (and each crime) with its fields as
+        filed, and marks the collection changed if any differ (or if 
+        self.charges was changed directly). It is one pass over the 
+        charges and one over their crimes, with no sort, and 
+        groupby_convictiondate() calls it every time.
+
+        RETURNS
+        ________________________________________________________________
+        :returns: True if the grouping must be rebuilt, else False
+        :rtype: bool
+        '''
+        if not self.dirty and (
+            list(map(charge_fields, self.charges)) != self.filed
+            or any(crime_fields(crime) != fields 
+                for crime, fields in self.filed_crimes.values())):
+            self.mark_changed()
+        return self.dirty
+
+    def index_charge(self, charge: object):
+        '''Helper for add_charge(). 
+
+        This files a conviction (a charge with a disposition date, not
+        convicted False) into the convictiondate for that date, making 
+        it (and inserting it in date order with bisect) if it is a new
+        date. A charge that the
+        convictiondate won't take marks the grouping dirty, so that 
+        groupby_convictiondate() raises about it just as a full 
+        regroup would.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param charge: the charge just added to self.charges
+        '''
+        dt = charge.disposition_date
+        if dt == None or charge.convicted == False or self.dirty:
+            return
+        condate = self.bydate.get(dt)
+        isnew = condate == None
+        if isnew:
+            condate = ConvictionDate(dt)
+        try:
+            condate.add(charge)
+        except ValueError:
+            self.dirty = True
+            return
+        if isnew:
+            pos = bisect_left(self.unique_dates, dt)
+            self.unique_dates.insert(pos, dt)
+            self.cons_bydate.insert(pos, condate)
+            self.bydate[dt] = condate
+
+    def unindex_charge(self, charge: object):
+        '''Helper for remove_charge(). 
+
+        This takes a charge out of its convictiondate, and drops the
+        convictiondate (and its date) if that leaves it empty.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param charge: the charge just removed from self.charges
+        '''
+        condate = self.bydate.get(charge.disposition_date)
+        if condate == None or charge.convicted == False or self.dirty:
+            return
+        try:
+            condate.remove(charge)
+        except ValueError:
+            self.dirty = True
+            return
+        if condate.top < 0:
+            pos = bisect_left(self.unique_dates, condate.disposition_date)
+            del self.unique_dates[pos]
+            del self.cons_bydate[pos]
+            del self.bydate[condate.disposition_date]
+
     def remove_charge(self, index: int):
         '''This deletes a charge from the charges by index. 
 
@@ -61,9 +221,15 @@ class Charge_Collection:
         :param index: the index/position in self.charges
         '''
         try:
+            charge = self.charges[index]
             del self.charges[index]
         except:
             raise ValueError("This charge is not in charges.")
+        self.version += 1
+        if not self.dirty and (len(self.filed) != len(self.charges) + 1
+            or self.filed.pop(index) != charge_fields(charge)):
+            self.mark_changed()     # (edited since filed: may be misfiled)
+        self.unindex_charge(charge)
 
     def is_in( self, charge: object ) -> bool:
         '''This returns True if the charge is present else False.
@@ -84,35 +250,61 @@ class Charge_Collection:
 
     def sortby_offensedate(self):
         '''This sorts the collection by the dates of offense of the 
-        charges from earliest to latest and returns a copy.'''
+        charges from earliest to latest. 
+
+        This changes the order of charges within a conviction date, so 
+        the grouping is rebuilt the next time it is asked for.'''
         self.charges.sort(key=lambda x: x.offense_date)
+        self.mark_changed()
 
     def sortby_conviction(self):
         '''This sorts the collection by the conviction dates of the 
-        charges from earliest to latest.'''
+        charges from earliest to latest (the grouping doesn't change, 
+        but charges edited before the sort are found first).'''
+        self.check_charges()
         self.charges.sort( key=lambda x: x.disposition_date )
+        if not self.dirty:
+            self.filed = list(map(charge_fields, self.charges))
 
     def datemaker(self):
         '''Helper for groupby_convictiondate().
         
-        This creates a list of all the unique conviction dates.'''
+        This creates a list of all the unique conviction dates (of the
+        charges not convicted False). The charges are sorted first, so 
+        equal dates sit next to each other and each date only has to be
+        compared with the last one kept.'''
         self.sortby_conviction()    # sorted in order
         self.unique_dates = []
+        last = None
         for charge in self.charges:
             if charge.disposition_date != None \
-                and charge.disposition_date not in self.unique_dates:
-                self.unique_dates.append(charge.disposition_date)
+                and charge.convicted != False \
+                and charge.disposition_date != last:
+                last = charge.disposition_date
+                self.unique_dates.append(last)
 
     def groupby_convictiondate(self):
         '''This groups the convicted charges in the collection by 
         the conviction dates and makes a list of convictiondate objects,
         one for each unique date. It populates these with the matching 
-        convictions.'''
+        convictions.
+
+        add_charge() and remove_charge() keep the grouping current, so
+        this only checks the charges for edits (one pass, see 
+        check_charges) unless the grouping is dirty. Rebuilding is one 
+        sort (O(n log n)) and one pass over the charges. Each charge 
+        finds its convictiondate with a dict lookup on its date, and 
+        cons_bydate comes out in date order.'''
+        if not self.check_charges():
+            return
         self.datemaker()    # now self.unique_dates has uniques
-        self.cons_bydate = [ 
-            ConvictionDate(date) for date in self.unique_dates 
-        ]
+        bydate = { date: ConvictionDate(date) for date in self.unique_dates }
         for charge in self.charges:
-            for dt in self.cons_bydate:
-                if charge.disposition_date == dt.disposition_date:
-                    dt.add(charge)
\ No newline at end of file
+            if charge.disposition_date in bydate \
+                and charge.convicted != False:
+                bydate[charge.disposition_date].add(charge)
+        self.bydate = bydate
+        self.cons_bydate = list(bydate.values())
+        self.filed = list(map(charge_fields, self.charges))
+        self.filed_crimes = file_crimes(self.charges)
+        self.dirty = False
\ No newline at end of file
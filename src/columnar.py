@@ -0,0 +1,362 @@
+'''
+file    columnar.py
+author  Keith Helsabeck
+
+This is the file columnar.py, for scoring whole populations of records
+at once. ColumnarCharges holds charges as columns (one compact typed 
+array per field, one entry per charge) instead of as objects, and the
+score functions run the felony and misdemeanor rules over all the 
+defendants in the columns together.
+
+The columns are stdlib array.arrays (the library has no dependencies),
+so scoring is not vectorized: it is plain Python loops over the columns
+(one sort, then a few passes), and the gain is in skipping the Charge,
+Crime and FSM state objects, not in SIMD. On 5000 random records (about
+75,000 charges) it took about 1.4 us a charge, against about 1.6 for
+RecordAnalyzer and 3.2 for the three FSMs, so expect about 2x the FSMs
+and not much more than the analyzer. The steps are:
+(1) date_groups: one group per (defendant, conviction date), with the 
+top charge of each (what ConvictionDate.highest()[0] returns);
+(2) felony: a per-defendant sum of the top charges' felony points, then
+the level from a lookup table (FinishedState.leveler);
+(3) misdemeanor: a per-defendant scan of the groups (the points can 
+reset, see LevelTwo, so this can't be a plain sum), then a lookup;
+(4) habitual: a per-defendant scan of the groups for the first three 
+dates with a strike (see habitual_scores).
+
+The results match the FSMs for any record the FSMs can run. Charges the
+FSMs won't group (not convicted, no conviction date, or a bad class) 
+are left out of the groups rather than raising, and so is a strike with
+no offense date (the Dumbwaiter can't test D's age on it).
+'''
+import typing
+from array import array
+
+from .dumbwaiter import Dumbwaiter
+from .FelonyStatemachine import felony_level
+from .habitualmachine import FELONIES
+from .misdemeanor_machine import misdemeanor_level
+
+# bits in the flags column
+CONVICTED = 1
+HAB_QUALIFIED = 2
+MISD_QUALIFIED = 4
+
+# level by points (points past the end of a table get its last level)
+FELONY_LEVELS = [ felony_level(pts) for pts in range(19) ]
+MISDEMEANOR_LEVELS = [ misdemeanor_level(pts) for pts in range(6) ]
+
+def date_ordinal(dt: object) -> int:
+    '''Returns a date's proleptic ordinal (0 for None).'''
+    return 0 if dt == None else dt.toordinal()
+
+def eighteenth_ordinal(birthdate: object) -> int:
+    '''Returns the ordinal of D's 18th birthday, worked out just as 
+    Dumbwaiter.eighteenth_birthdate does (0 for no birthdate).'''
+    if birthdate == None:
+        return 0
+    return Dumbwaiter(birthdate).eighteenth_birthdate.toordinal()
+
+class ColumnarCharges:
+    '''
+    ColumnarCharges holds many defendants' charges as columns. Row i of
+    every column is one charge. Dates are stored as ordinals (0 for no 
+    date), and each crime's class and FSM flags are stored with the 
+    charge, so scoring never touches a Crime.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr defendant: per row, the defendant's index (0, 1, 2, ...)
+    :attr offense: per row, the offense date ordinal
+    :attr disposition: per row, the disposition date ordinal
+    :attr rank: per row, the CrimeClass (-1 for a bad class)
+    :attr points: per row, the crime's felony_points
+    :attr flags: per row, CONVICTED | HAB_QUALIFIED | MISD_QUALIFIED
+    :attr defendant_ids: per defendant, the Defendant's id
+    :attr birth18: per defendant, the 18th birthday ordinal (0 for none)
+    :attr first: what the defendant column counts from (0 here; a slice
+    of a bigger set, such as an archive's view, starts further on)
+
+    METHODS:
+    ____________________________________________________________________
+    :method add_record: takes a defendant and charges -> defendant index
+    :method from_records: (classmethod) takes (D, charges) pairs
+    '''
+    def __init__(self):
+        self.defendant = array("i")
+        self.offense = array("i")
+        self.disposition = array("i")
+        self.rank = array("b")
+        self.points = array("b")
+        self.flags = array("B")
+        self.defendant_ids = []
+        self.birth18 = array("i")
+        self.first = 0
+
+    def __len__(self) -> int:
+        return len(self.defendant)
+
+    @property
+    def defendants(self) -> int:
+        '''The number of defendants in the columns.'''
+        return len(self.defendant_ids)
+
+    def add_record(self, defendant: object, charges: object) -> int:
+        '''
+        Appends a defendant and their charges (in the collection's 
+        order, which is the order the FSMs see them in).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant: a Defendant
+        :param charges: a Charge_Collection or an iterable of Charges
+
+        RETURN:
+        ________________________________________________________________
+        :return: the defendant's index
+        :rtype: int
+        '''
+        index = len(self.defendant_ids)
+        self.defendant_ids.append(defendant.id)
+        self.birth18.append(eighteenth_ordinal(defendant.birthdate))
+        for charge in getattr(charges, "charges", charges):
+            crime = charge.crime
+            rank = crime.classrank
+            flags = CONVICTED if charge.convicted == True else 0
+            if crime.hab_qualified:
+                flags |= HAB_QUALIFIED
+            if crime.misd_qualified:
+                flags |= MISD_QUALIFIED
+            self.defendant.append(index)
+            self.offense.append(date_ordinal(charge.offense_date))
+            self.disposition.append(date_ordinal(charge.disposition_date))
+            self.rank.append(-1 if rank == None else rank)
+            self.points.append(crime.felony_points)
+            self.flags.append(flags)
+        return index
+
+    @classmethod
+    def from_records(cls, records: typing.Iterable) -> object:
+        '''
+        Builds the columns from (Defendant, charges) pairs (such as the
+        loader yields).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param records: an iterable of (Defendant, charges) pairs
+        '''
+        store = cls()
+        for defendant, charges in records:
+            store.add_record(defendant, charges)
+        return store
+
+class DateGroups:
+    '''
+    One entry per (defendant, conviction date), in defendant then date
+    order (the columnar form of every record's cons_bydate).
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr defendant: per group, the defendant's index
+    :attr disposition: per group, the conviction date ordinal
+    :attr top: per group, the row of the top charge
+    :attr start: per group, where its rows begin in order
+    :attr order: the groupable rows, sorted by defendant then date
+    '''
+    def __init__(self):
+        self.defendant = array("i")
+        self.disposition = array("i")
+        self.top = array("i")
+        self.start = array("i")
+        self.order = array("i")
+
+    def __len__(self) -> int:
+        return len(self.top)
+
+def date_groups(store: object) -> object:
+    '''
+    Groups the convicted charges by defendant and conviction date.
+
+    The rows are sorted by (defendant, disposition) with a stable sort,
+    so within a date they stay in the order they were added. The top 
+    charge of a group is then its first row of the highest rank, just 
+    like ConvictionDate.highest()[0]. The groups' defendant indexes 
+    count from the store's first defendant (as the per-defendant 
+    columns do).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param store: a ColumnarCharges (or anything with its columns)
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the groups
+    :rtype: DateGroups
+    '''
+    defendant, disposition = store.defendant, store.disposition
+    rank, flags = store.rank, store.flags
+    first = getattr(store, "first", 0)
+    # one int key per row: defendant in the high bits, date ordinal 
+    # (always < 2 ** 22) in the low bits
+    keys = [ (d << 22) | dt for d, dt in zip(defendant, disposition) ]
+    rows = [ row for row, flag, dt, r in 
+        zip(range(len(keys)), flags, disposition, rank)
+        if flag & CONVICTED and dt > 0 and r >= 0 ]
+    rows.sort(key=keys.__getitem__)
+    groups = DateGroups()
+    groups.order = array("i", rows)
+    tops, starts, lastkey = groups.top, groups.start, -1
+    for count, row in enumerate(rows):
+        key = keys[row]
+        if key != lastkey:
+            lastkey = key
+            groups.defendant.append((key >> 22) - first)
+            groups.disposition.append(key & 0x3FFFFF)
+            tops.append(row)
+            starts.append(count)
+        elif rank[row] > rank[tops[-1]]:
+            tops[-1] = row
+    return groups
+
+class ColumnarScores:
+    '''
+    Per-defendant results of scoring a ColumnarCharges (entry i is the
+    defendant with index i).
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr defendant_ids: the defendants' ids
+    :attr felony_points: felony record points
+    :attr felony_level: felony record level (1-6)
+    :attr misdemeanor_points: misdemeanor record points
+    :attr misdemeanor_level: misdemeanor record level (1-3)
+    :attr strikes: habitual strikes found (0-3)
+    :attr habeligible: 1 if habitual eligible, else 0 (0 for no bd too)
+    :attr date_eligible: ordinal of the date D became habitual eligible
+    (0 if not eligible)
+    '''
+    def __init__(self, defendant_ids: list):
+        count = len(defendant_ids)
+        self.defendant_ids = defendant_ids
+        self.felony_points = array("i", bytes(4 * count))
+        self.felony_level = array("b", bytes(count))
+        self.misdemeanor_points = array("i", bytes(4 * count))
+        self.misdemeanor_level = array("b", bytes(count))
+        self.strikes = array("b", bytes(count))
+        self.habeligible = array("b", bytes(count))
+        self.date_eligible = array("i", bytes(4 * count))
+
+    def __len__(self) -> int:
+        return len(self.defendant_ids)
+
+def felony_scores(store: object, groups: object, scores: object):
+    '''
+    Fills in felony points and levels: a segmented sum over the groups
+    of their top charges' points, then a table lookup for the level.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param store: a ColumnarCharges
+    :param groups: its DateGroups
+    :param scores: the ColumnarScores to fill in
+    '''
+    points = store.points
+    totals = scores.felony_points
+    for defendant, top in zip(groups.defendant, groups.top):
+        totals[defendant] += points[top]
+    last = len(FELONY_LEVELS) - 1
+    scores.felony_level = array("b", 
+        [ FELONY_LEVELS[min(pts, last)] for pts in totals ])
+
+def misdemeanor_scores(store: object, groups: object, scores: object):
+    '''
+    Fills in misdemeanor points and levels with a scan of each 
+    defendant's groups (the MisdemeanorRecordMachine rules: the first
+    qualified date gives 1 pt, then below 5 pts each date adds 1 if 
+    qualified and otherwise sets the points back to 0), then a table 
+    lookup for the level.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param store: a ColumnarCharges
+    :param groups: its DateGroups
+    :param scores: the ColumnarScores to fill in
+    '''
+    flags = store.flags
+    totals = scores.misdemeanor_points
+    current, pts = -1, 0
+    for defendant, top in zip(groups.defendant, groups.top):
+        if defendant != current:
+            if current >= 0:
+                totals[current] = pts
+            current, pts = defendant, 0
+            started = False
+        qualified = flags[top] & MISD_QUALIFIED
+        if not started:
+            if qualified:
+                pts, started = 1, True
+        elif pts < 5:
+            pts = pts + 1 if qualified else 0
+    if current >= 0:
+        totals[current] = pts
+    last = len(MISDEMEANOR_LEVELS) - 1
+    scores.misdemeanor_level = array("b", 
+        [ MISDEMEANOR_LEVELS[min(pts, last)] for pts in totals ])
+
+def habitual_scores(store: object, groups: object, scores: object):
+    '''
+    Fills in habitual strikes, eligibility and date_eligible with a scan
+    of each defendant's groups, under the HabitualMachine rules: a date
+    gives at most one strike, its first qualified felony (lowest felony
+    class first, then the order added); strikes after the first need D 
+    to be 18 on the offense date; the third strike's conviction date is
+    date_eligible. Defendants with no birthdate are skipped, and a 
+    defendant's later groups are skipped once they have 3 strikes.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param store: a ColumnarCharges
+    :param groups: its DateGroups
+    :param scores: the ColumnarScores to fill in
+    '''
+    rank, flags, offense = store.rank, store.flags, store.offense
+    birth18, strikes = store.birth18, scores.strikes
+    order, starts = groups.order, groups.start
+    ends = starts[1:] + array("i", [len(order)])
+    for group, defendant in enumerate(groups.defendant):
+        count = strikes[defendant]
+        if count == 3 or birth18[defendant] == 0 \
+            or rank[groups.top[group]] < FELONIES:
+            continue
+        adult = 0 if count == 0 else birth18[defendant]  # offense on/after
+        strike, low = -1, 15
+        for row in order[starts[group]:ends[group]]:
+            if FELONIES <= rank[row] < low and flags[row] & HAB_QUALIFIED \
+                and offense[row] >= adult:
+                strike, low = row, rank[row]
+        if strike < 0:
+            continue
+        strikes[defendant] = count + 1
+        if count == 2:
+            scores.habeligible[defendant] = 1
+            scores.date_eligible[defendant] = groups.disposition[group]
+
+def score(store: object) -> object:
+    '''
+    Scores every defendant in a ColumnarCharges.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param store: a ColumnarCharges
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the per-defendant results
+    :rtype: ColumnarScores
+    '''
+    groups = date_groups(store)
+    scores = ColumnarScores(store.defendant_ids)
+    felony_scores(store, groups, scores)
+    misdemeanor_scores(store, groups, scores)
+    habitual_scores(store, groups, scores)
+    return scores
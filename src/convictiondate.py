@@ -8,7 +8,6 @@ inner lists holding crimes of the same class in order.
 '''
 import typing
 import uuid
-import copy
 
 from .charge import Charge
 from .crime import Crime
@@ -23,11 +22,14 @@ class ConvictionDate:
     ____________________________________________________________________
     :attr disposition_date: (datetime.date)--date for all these charges
     :attr convictions: a 2-d list of convictions (grouped by level)
+    :attr top: index of the highest non-empty list in convictions (or -1)
+    :attr high: highest()'s tuple, once made (None after a change)
 
     METHODS:
     ____________________________________________________________________
     :method add: adds a charge in sorted order
-    :method highest: returns the highest-level (list of) charges
+    :method remove: removes a charge (by identity)
+    :method highest: returns the highest-level charges (a tuple)
     '''
 
     def __init__(self, date: object):
@@ -37,10 +39,12 @@ class ConvictionDate:
         purpose of this is not use/reuse as a general-purpose data
         storage object for charges. The only reason for convictiondate
         data objects is in analysis of a person's criminal record. 
-        Every time a record is analyzed, a new set of objects should be
-        created for the FSM to analyze the record from a clean slate.
+        Charge_Collection keeps these up to date as charges are added
+        and removed, so the FSMs can rerun a record without regrouping.
         '''
         self.convictions = [ [] for x in Crime.valid_classes ]
+        self.top = -1
+        self.high = None
         self.set_date( date )
         
     def set_date(self, date: object):
@@ -70,33 +74,55 @@ class ConvictionDate:
             or type(charge.disposition_date) != datetime.date\
             or charge.convicted == False\
             or type(charge.crime) != Crime\
-            or charge.crime.crimeclass not in Crime.valid_classes\
+            or charge.crime.classrank == None\
             or charge.disposition_date != self.disposition_date:
             raise ValueError("add() needs Charge with right date.")
-        count = 0
-        for crimeclass in Crime.valid_classes:
-            if crimeclass == charge.crime.crimeclass:
-                self.convictions[count].append(charge)
+        count = charge.crime.classrank
+        self.convictions[count].append(charge)
+        if count >= self.top:
+            self.top = count
+            self.high = None
+
+    def remove(self, charge: object):
+        '''This removes a charge (the very object, not an equal one) 
+        from its inner list and moves self.top down if that list was 
+        the highest and is now empty.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param charge: a charge to remove from self.convictions
+        '''
+        try:
+            conlist = self.convictions[charge.crime.classrank]
+        except (AttributeError, TypeError):
+            raise ValueError("remove() needs a Charge in this date.")
+        for count, c in enumerate(conlist):
+            if c is charge:
+                del conlist[count]
                 break
-            else:
-                count += 1
+        else:
+            raise ValueError("remove() needs a Charge in this date.")
+        self.high = None
+        while self.top >= 0 and self.convictions[self.top] == []:
+            self.top -= 1
 
-    def highest(self) -> list:
-        '''returns a list of the highest-level charges.
+    def highest(self) -> tuple:
+        '''returns a tuple of the highest-level charges (or None if there
+        are none).
 
-        This validates the input's type, and that it has a conviction 
-        date & adds the charge to the appropriate inner list (the one 
-        corresponding to the crime's class).
+        add() keeps self.top pointed at the highest non-empty inner 
+        list, so this needs no search. The tuple is made once and kept 
+        until add() or remove() changes this date, so the FSMs can read 
+        it on every rerun without a copy, and can't change the grouping 
+        through it.
 
         RETURNS:
         ________________________________________________________________
-        :returns: Highest charge in this data structure
-        :rtype: list (of Charges)
+        :returns: Highest charges in this data structure
+        :rtype: tuple (of Charges)
         '''
-        myconvictions = copy.deepcopy(self.convictions)
-        myconvictions.reverse()
-        for conlist in myconvictions:
-            if conlist != []:
-                return conlist 
-
-
+        if self.top < 0:
+            return None
+        if self.high == None:
+            self.high = tuple(self.convictions[self.top])
+        return self.high
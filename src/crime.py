@@ -6,10 +6,72 @@ This is the file crime.py, for holding the class Crime.
 Crime represents a particular criminal statute/law that the State can 
 charge a Defendant with committing. A crime should have a simple 
 sequential id, a UID,a statute, a description, and its class.
+
+CrimeClass ranks the valid classes from Infraction (0) to Class A Felony
+(14), in the same order as Crime.valid_classes.
 '''
+import enum
 import typing
 import uuid
 
+from .fields import NONE, columns, check_lengths, check_types, check_values
+from .ids import uuid_isvalid
+
+class CrimeClass(enum.IntEnum):
+    '''
+    CrimeClass is an NC crime class as an int ranked by severity (its 
+    position in Crime.valid_classes, which is also the ConvictionDate 
+    bucket it goes in). Each member carries precomputed values, so no 
+    string tests are needed to use it.
+
+    MEMBER ATTRIBUTES:
+    ____________________________________________________________________
+    :attr label: the class as a string (eg: "Class F Felony")
+    :attr is_felony: True for Class I Felony and up, else False
+    :attr is_misdemeanor: True for the misdemeanor classes, else False
+    :attr felony_points: felony record points for a prior (see 
+    FelonyPointChart; 1 and A1 misdemeanors only count under some §s)
+    '''
+    def __new__(cls, rank: int, label: str, felony_points: int):
+        member = int.__new__(cls, rank)
+        member._value_ = rank
+        member.label = label
+        member.is_felony = "Felony" in label
+        member.is_misdemeanor = "Misdemeanor" in label
+        member.felony_points = felony_points
+        return member
+
+    INFRACTION = 0, "Infraction", 0
+    CLASS_3_MISDEMEANOR = 1, "Class 3 Misdemeanor", 0
+    CLASS_2_MISDEMEANOR = 2, "Class 2 Misdemeanor", 0
+    CLASS_1_MISDEMEANOR = 3, "Class 1 Misdemeanor", 1
+    CLASS_A1_MISDEMEANOR = 4, "Class A1 Misdemeanor", 1
+    CLASS_I_FELONY = 5, "Class I Felony", 2
+    CLASS_H_FELONY = 6, "Class H Felony", 2
+    CLASS_G_FELONY = 7, "Class G Felony", 4
+    CLASS_F_FELONY = 8, "Class F Felony", 4
+    CLASS_E_FELONY = 9, "Class E Felony", 4
+    CLASS_D_FELONY = 10, "Class D Felony", 6
+    CLASS_C_FELONY = 11, "Class C Felony", 6
+    CLASS_B1_FELONY = 12, "Class B1 Felony", 9
+    CLASS_B2_FELONY = 13, "Class B2 Felony", 6
+    CLASS_A_FELONY = 14, "Class A Felony", 10
+
+# label -> CrimeClass, for O(1) lookups of the class strings
+CLASS_BY_LABEL = { crimeclass.label: crimeclass for crimeclass in CrimeClass }
+
+# what a crimeclass may be set to (after a type check, so the ints the 
+# CrimeClass members hash as can't sneak in)
+VALID_CLASSES = { None, *CLASS_BY_LABEL, *CrimeClass }
+
+# Felonies under these statutes don't count toward habitual felon status
+# (their own statutes say so; see habitualmachine).
+HABITUAL_EXCLUDED = ("14-7.28", "14-7.36", "14-33.2")
+
+# Non-Chapter 14 1 and A1 misdemeanors that still earn a felony record 
+# point (see FelonyStatemachine).
+FELPOINT_STATUTES = ("20-141.4(a2)", "20-138", "20-28(a1)")
+
 class Crime:
     '''
     Crime represents a statutory/common law crime that the State can 
@@ -26,8 +88,16 @@ class Crime:
     :attr statute: str up to 50 chars (eg: "§14-72")
     :attr description: a string up to 50 chars for the crime's name  
     :attr crimeclass: str lte 50 chars (eg: "Class F Felony")
+    :attr classrank: (property) CrimeClass of crimeclass (None if bad)
     :attr valid_classes: strs representing all valid crime classes
 
+    These are worked out whenever crimeclass or statute is set, so the 
+    FSMs just read them:
+    :attr hab_qualified: T if a conviction counts toward habitual status
+    :attr felpoint_eligible: T if a 1/A1 misdemeanor earns a felony pt
+    :attr felony_points: felony record pts if top charge on its date
+    :attr misd_qualified: T if a conviction counts for misdemeanor record
+
     METHODS: 
     ____________________________________________________________________
     :crimeclass_isvalid: ret True if input is a valid class, else False
@@ -37,24 +107,174 @@ class Crime:
     :set_statute: sets statute and ret T if set, else F
     :set_description: sets description and ret T if set, else F
     :set_id: sets id and ret T if set, else F
+
+    :from_row: (classmethod) makes a Crime from a row of its fields
+    :from_rows: (classmethod) makes Crimes from rows of fields
+
+    Crime uses __slots__ (no per-instance __dict__) to keep instances 
+    small, like Charge and Defendant.
     '''
+    __slots__ = (
+        "id", "unique_id", "_statute", "description", 
+        "_crimeclass", "_classrank", "hab_qualified", "felpoint_eligible",
+        "felony_points", "misd_qualified",
+    )
+
+    valid_classes = [ crimeclass.label for crimeclass in CrimeClass ]
 
-    valid_classes = [
-        "Infraction", "Class 3 Misdemeanor", "Class 2 Misdemeanor", 
-        "Class 1 Misdemeanor", "Class A1 Misdemeanor",
-        "Class I Felony", "Class H Felony", "Class G Felony", 
-        "Class F Felony", "Class E Felony", "Class D Felony",
-        "Class C Felony", "Class B1 Felony", "Class B2 Felony", 
-        "Class A Felony"
-    ]
+    # the fields of a row for from_row/from_rows
+    FIELDS = ("id", "unique_id", "statute", "description", "crimeclass")
 
     def __init__(self):
         self.id = None
         self.unique_id = None
-        self.statute = ""
+        self._statute = ""
         self.description = ""
         self.crimeclass = ""
 
+    @classmethod
+    def from_row(cls, row: tuple, trusted: bool = False) -> object:
+        '''
+        Makes a Crime from a row of its fields (in the order of FIELDS).
+        By default each field given (not None) is checked by its set_* 
+        method; with trusted=True the fields are set with no checks 
+        (the flags are still worked out, once).
+
+        PARAMETERS
+        ________________________________________________________________
+        :param row: (id, unique_id, statute, description, crimeclass)
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Crime
+        :rtype: Crime
+        '''
+        id, unique_id, statute, description, crimeclass = row
+        if trusted:
+            crime = cls.__new__(cls)
+            crime.id = id
+            crime.unique_id = unique_id
+            crime.description = "" if description == None else description
+            crime._statute = "" if statute == None else statute
+            crime.crimeclass = "" if crimeclass == None else crimeclass
+            return crime
+        crime = cls()
+        if id != None:
+            crime.set_id(id)
+        if unique_id != None:
+            crime.set_uid(unique_id)
+        if statute != None:
+            crime.set_statute(statute)
+        if description != None:
+            crime.set_description(description)
+        if crimeclass != None:
+            crime.set_crimeclass(crimeclass)
+        return crime
+
+    @classmethod
+    def from_rows(cls, rows: typing.Iterable, trusted: bool = False) -> list:
+        '''
+        Makes Crimes from rows of fields (in the order of FIELDS), 
+        checking the whole batch a column at a time unless trusted (see
+        Charge.from_rows).
+
+        PARAMETERS
+        ________________________________________________________________
+        :param rows: an iterable of tuples (see FIELDS)
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Crimes, in row order
+        :rtype: list
+        '''
+        cols = columns(rows, len(cls.FIELDS))
+        if not trusted:
+            ids, uids, statutes, descriptions, classes = cols
+            check_types(ids, { int, NONE }, "An id must be a valid int.")
+            check_types(uids, { uuid.UUID, NONE }, 
+                "A unique_id must be a valid uuid4.")
+            for column, message in ((statutes, 
+                "A statute must be str lte 50 chars."), (descriptions, 
+                "A description must be str lte 50 chars.")):
+                check_types(column, { str, NONE }, message)
+                check_lengths(column, 50, message)
+            check_types(classes, { str, CrimeClass, NONE }, 
+                "crimeclass invalid.")
+            check_values(classes, VALID_CLASSES, "crimeclass invalid.")
+        make = cls.from_row
+        return [ make(row, trusted=True) for row in zip(*cols) ]
+
+    @property
+    def statute(self) -> str:
+        return self._statute
+
+    @statute.setter
+    def statute(self, s: str):
+        '''
+        Sets the statute and reworks the flags that depend on it. Like 
+        plain assignment always has, this does not validate; use 
+        set_statute() for that.
+        '''
+        self._statute = s
+        self.setflags()
+
+    @property
+    def crimeclass(self) -> str:
+        return self._crimeclass
+
+    @crimeclass.setter
+    def crimeclass(self, s: str):
+        '''
+        Sets the class string and its CrimeClass rank together (a 
+        CrimeClass may be given in place of the string). Like plain 
+        assignment always has, this does not validate; use 
+        set_crimeclass() for that.
+        '''
+        if type(s) == CrimeClass:
+            s = s.label
+        self._crimeclass = s
+        self._classrank = CLASS_BY_LABEL.get(s) if type(s) == str else None
+        self.setflags()
+
+    def setflags(self):
+        '''
+        Works out the flags the FSMs test on a conviction's crime, from
+        the crimeclass and statute strings (the same substring tests the
+        FSMs used to run on every charge they looked at).
+        '''
+        crimeclass = self._crimeclass if type(self._crimeclass) == str \
+            else ""
+        statute = self._statute if type(self._statute) == str else ""
+        statlow = statute.lower()
+        self.hab_qualified = not (
+            "Infraction" in crimeclass or "Misdemeanor" in crimeclass or
+            any(excluded in statute for excluded in HABITUAL_EXCLUDED)
+        )
+        self.felpoint_eligible = "1" in crimeclass and (
+            "14" in statlow or   # general criminal §s
+            any(edge in statlow for edge in FELPOINT_STATUTES)
+        )
+        rank = self._classrank
+        if rank != None and rank.is_felony:
+            self.felony_points = rank.felony_points
+        else:
+            self.felony_points = 1 if self.felpoint_eligible else 0
+        self.misd_qualified = crimeclass != "Infraction"
+
+    @property
+    def classrank(self) -> object:
+        '''
+        The CrimeClass for crimeclass, or None if crimeclass is invalid.
+
+        RETURN:
+        ______________________________________________________________
+        :returns: the rank of this crime's class
+        :rtype: CrimeClass (or None)
+        '''
+        return self._classrank
+
     def crimeclass_isvalid(self, s:str) -> bool:
         '''
         validates input s as a crime class. 
@@ -68,7 +288,8 @@ class Crime:
         :returns: True for valid, else False
         :rtype: bool
         '''
-        if s in Crime.valid_classes:
+        if type(s) == CrimeClass or \
+            (type(s) == str and s in CLASS_BY_LABEL):
             return True
         return False
 
@@ -78,7 +299,7 @@ class Crime:
 
         PARAMETERS: 
         ______________________________________________________________
-        :param s: a string to set as the crimeclass
+        :param s: a string (or CrimeClass) to set as the crimeclass
 
         :returns: True if set, else False
         :rtype: bool
@@ -172,9 +393,7 @@ class Crime:
         :returns: True for valid, else False
         :rtype: bool
         '''
-        if type(uid) == type(uuid.uuid4()):
-            return True
-        return False
+        return uuid_isvalid(uid)
 
     def set_uid( self, uid: object ):
         '''
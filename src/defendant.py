@@ -10,6 +10,9 @@ import typing
 import uuid
 import datetime
 
+from .fields import NONE, columns, check_lengths, check_types
+from .ids import uuid_isvalid
+
 class Defendant:
     '''
     Defendant represents a person charged with (a) crime(s).
@@ -26,8 +29,17 @@ class Defendant:
     ____________________________________________________________________
     :birthdate_isvalid: True if a birthdate valid, else False
     :name_isvalid: True if name valid, else False
+    :from_fields: (classmethod) makes a Defendant from its fields
+    :from_rows: (classmethod) makes Defendants from rows of fields
 
+    Defendant uses __slots__ (no per-instance __dict__) to keep bulk 
+    loads of defendants small.
     '''
+    __slots__ = ("id", "unique_id", "firstname", "lastname", "birthdate")
+
+    # the fields of a row for from_rows (from_fields' parameters)
+    FIELDS = __slots__
+
     def __init__(self):
         self.id = None
         self.unique_id = None
@@ -35,6 +47,87 @@ class Defendant:
         self.lastname = ""
         self.birthdate = None
 
+    @classmethod
+    def from_fields(cls, id: int = None, unique_id: object = None, 
+        firstname: str = None, lastname: str = None, 
+        birthdate: object = None, trusted: bool = False) -> object:
+        '''
+        Makes a Defendant from its fields. By default each field given 
+        (not None) is checked by its set_* method; with trusted=True 
+        the fields are set with no checks (see Charge.from_fields).
+
+        PARAMETERS
+        ________________________________________________________________
+        :param id...birthdate: the Defendant's fields
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Defendant
+        :rtype: Defendant
+        '''
+        if trusted:
+            defendant = cls.__new__(cls)
+            defendant.id = id
+            defendant.unique_id = unique_id
+            defendant.firstname = "" if firstname == None else firstname
+            defendant.lastname = "" if lastname == None else lastname
+            defendant.birthdate = birthdate
+            return defendant
+        defendant = cls()
+        if id != None:
+            defendant.set_id(id)
+        if unique_id != None:
+            defendant.set_uid(unique_id)
+        if firstname != None:
+            defendant.set_firstname(firstname)
+        if lastname != None:
+            defendant.set_lastname(lastname)
+        if birthdate != None:
+            defendant.set_birthdate(birthdate)
+        return defendant
+
+    @classmethod
+    def from_rows(cls, rows: typing.Iterable, trusted: bool = False) -> list:
+        '''
+        Makes Defendants from rows of fields (in the order of FIELDS), 
+        checking the whole batch a column at a time unless trusted (see
+        Charge.from_rows).
+
+        PARAMETERS
+        ________________________________________________________________
+        :param rows: an iterable of tuples (see FIELDS)
+        :param trusted: True to skip the checks
+
+        RETURNS
+        ________________________________________________________________
+        :returns: the new Defendants, in row order
+        :rtype: list
+        '''
+        ids, uids, firstnames, lastnames, birthdates = \
+            columns(rows, len(cls.FIELDS))
+        if not trusted:
+            names = "A name must be a string, lte 50 char."
+            check_types(ids, { int, NONE }, "An id must be a valid int.")
+            check_types(uids, { uuid.UUID, NONE }, 
+                "A unique_id must be a valid uuid4.")
+            for column in (firstnames, lastnames):
+                check_types(column, { str, NONE }, names)
+                check_lengths(column, 50, names)
+            check_types(birthdates, { datetime.date, NONE }, 
+                "A birthdate must be a datetime.date.")
+        new, made = cls.__new__, []
+        for row in zip(ids, uids, firstnames, lastnames, birthdates):
+            defendant = new(cls)
+            defendant.id, defendant.unique_id, defendant.firstname, \
+                defendant.lastname, defendant.birthdate = row
+            if defendant.firstname == None:
+                defendant.firstname = ""
+            if defendant.lastname == None:
+                defendant.lastname = ""
+            made.append(defendant)
+        return made
+
     def name_isvalid(self, s:str) -> bool:
         '''This confirms that a name is a valid string of valid length
 
@@ -155,9 +248,7 @@ class Defendant:
         :returns: True for valid, else False
         :rtype: bool
         '''
-        if type(uid) == type(uuid.uuid4()):
-            return True
-        return False
+        return uuid_isvalid(uid)
 
     def set_uid( self, uid : object ):
         '''
@@ -88,17 +88,22 @@ requires a datetime date as a parameter.")
     def eighteenth_birthdate(self) -> object:
         '''
         This uses the birthdate attr and returns the 18th birthdate.
+        A D born on Feb 29 turns 18 on Mar 1 (18 years on there is no 
+        Feb 29, and Mar 1 is the first day D has lived a full 18 years).
         
         RETURN:
         ______________________________________________________________
         :returns: 18th birthdate (of defendant)
         :rtype: datetime.date
         '''
-        eighteenth = date(
-            self.birthdate.year + 18, 
-            self.birthdate.month, 
-            self.birthdate.day
-        )
+        try:
+            eighteenth = date(
+                self.birthdate.year + 18, 
+                self.birthdate.month, 
+                self.birthdate.day
+            )
+        except ValueError:  # born Feb 29
+            eighteenth = date(self.birthdate.year + 18, 3, 1)
         return eighteenth
 
     def set_date_eligible(self, dt: object):
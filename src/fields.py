@@ -0,0 +1,85 @@
+'''
+file    fields.py
+author  Keith Helsabeck
+
+This is the file fields.py, for the column checks behind the from_rows
+constructors (Charge.from_rows, Crime.from_rows, Defendant.from_rows).
+
+The set_* methods check one value per call. These check a whole column
+of a batch at once: the set of types in it (or its values, or its
+longest str) is worked out with builtins in one pass, and only if that
+fails is the column walked again to find the first bad row for the
+error. The errors are ValueErrors with the set_* message, naming the
+row (counting from 1).
+'''
+import typing
+
+NONE = type(None)
+
+def columns(rows: typing.Iterable, width: int) -> list:
+    '''
+    Returns rows (tuples of width fields) as width columns.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param rows: an iterable of tuples
+    :param width: the number of fields in a row
+    '''
+    rows = list(rows)
+    for n, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(f"row {n + 1}: a row must have {width} fields.")
+    if rows == []:
+        return [ () for n in range(width) ]
+    return list(zip(*rows))
+
+def first_bad(column: tuple, isvalid: object, message: str):
+    '''Helper: raises ValueError for the first value failing isvalid.'''
+    for n, value in enumerate(column):
+        if not isvalid(value):
+            raise ValueError(f"row {n + 1}: {message}")
+
+def check_types(column: tuple, allowed: set, message: str):
+    '''
+    Raises ValueError (with message) unless every value in column is of
+    one of the allowed types (exactly, as the set_* methods check).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param column: the column's values
+    :param allowed: a set of types
+    :param message: the set_* method's error message
+    '''
+    if not set(map(type, column)) <= allowed:
+        first_bad(column, lambda value: type(value) in allowed, message)
+
+def check_values(column: tuple, allowed: object, message: str):
+    '''
+    Raises ValueError (with message) unless every value in column is in
+    allowed (a set of the valid values, or a dict keyed by them). Run
+    check_types first (the values must be hashable).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param column: the column's values
+    :param allowed: the valid values
+    :param message: the set_* method's error message
+    '''
+    if not set(column).issubset(allowed):
+        first_bad(column, lambda value: value in allowed, message)
+
+def check_lengths(column: tuple, most: int, message: str):
+    '''
+    Raises ValueError (with message) if any str in column is longer
+    than most (run check_types first; None values are skipped).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param column: the column's values
+    :param most: the longest a str may be
+    :param message: the set_* method's error message
+    '''
+    strs = [ value for value in column if value != None ]
+    if strs != [] and max(map(len, strs)) > most:
+        first_bad(column,
+            lambda value: value == None or len(value) <= most, message)
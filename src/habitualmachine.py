@@ -20,8 +20,13 @@ for crime n+1 must occur after the conviction date of crime n.
 '''
 from itertools import chain
 
+from . import instrument
 from .collections import Charge_Collection
 from .dumbwaiter import Dumbwaiter
+from .crime import CrimeClass
+
+# ConvictionDate buckets from here up hold felonies
+FELONIES = CrimeClass.CLASS_I_FELONY
 
 # #------- Base State:------------------
 class State:
@@ -47,6 +52,26 @@ class State:
         '''
         return 0
 
+    def transition(self, colx: object, dumbwaiter: object, 
+        index: int) -> tuple:
+        '''
+        Takes one step of the FSM without recursing into the next state.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: the Charge_Collection Instance
+        :param dumwaiter: a Dumbwaiter instance (context for hab felons)
+        :param index: index of convictiondate in colx.cons_bydate
+
+        RETURN:
+        ________________________________________________________________
+        :return: the next state, the dumbwaiter, and the new index (the
+        same shape as the other FSMs' transitions; the base State goes
+        straight to a FinishedState)
+        :rtype: tuple
+        '''
+        return FinishedState(), dumbwaiter, index
+
     def __repr__(self):
         return self.__str__()
 
@@ -71,12 +96,8 @@ class State:
         :return: True if the c is qualified for hab felony
         :rtype: bool
         '''
-        if not c.convicted or \
-            "Infraction" in c.crime.crimeclass or \
-            "Misdemeanor" in c.crime.crimeclass or \
-            "14-7.28" in c.crime.statute or \
-            "14-7.36" in c.crime.statute or \
-            "14-33.2" in c.crime.statute:
+        # the class and statute tests are worked out once, on the crime
+        if not c.convicted or not c.crime.hab_qualified:
             return False
         return True
 
@@ -100,19 +121,25 @@ class StartState(State):
 
         RETURN:
         ________________________________________________________________
-        :return: the next state's on_event() method (State object)
+        :return: the FinishedState (State object)
         :rtype: State
         '''
+        return run(self, colx, dumbwaiter, index)
+
+    def transition(self, colx: object, dumbwaiter: object, 
+        index: int) -> tuple:
+        colx.groupby_convictiondate()   # no-op unless colx has changed
         for condate in colx.cons_bydate:
             # get list of felonies from a given date:
-            felonylist = list(chain.from_iterable(condate.convictions[5:]))
+            conlists = condate.convictions[FELONIES:]
+            felonylist = list(chain.from_iterable(conlists))
             for f in felonylist:
                 if self.is_qualified(f):
                     dumbwaiter.habcons.append(f)
-                    return StrikeOne().on_event(colx, dumbwaiter, index + 1)
+                    return StrikeOne(), dumbwaiter, index + 1
             else: # no qualified felony found for THIS date
                 index += 1
-        return FinishedState().on_event(colx, dumbwaiter, index)
+        return FinishedState(), dumbwaiter, index
 
 class StrikeOne(State):
     '''
@@ -143,21 +170,25 @@ class StrikeOne(State):
 
         RETURN:
         ________________________________________________________________
-        :return: the next state's on_event() method (State object)
+        :return: the FinishedState (State object)
         :rtype: State
         '''
+        return run(self, colx, dumbwaiter, index)
+
+    def transition(self, colx: object, dumbwaiter: object, 
+        index: int) -> tuple:
         for condate in colx.cons_bydate[index:]:
             # get list of felonies from a given date:
-            conlists = condate.convictions[5:]
+            conlists = condate.convictions[FELONIES:]
             felonylist = list(chain.from_iterable(conlists))
             for f in felonylist:
                 if self.is_qualified(f)\
                     and dumbwaiter.over18_on_date(f.offense_date):
                     dumbwaiter.habcons.append(f)
-                    return StrikeTwo().on_event(colx, dumbwaiter, index + 1)
+                    return StrikeTwo(), dumbwaiter, index + 1
             else: # no qualified felony found for THIS date
                 index += 1
-        return FinishedState().on_event(colx, dumbwaiter, index)
+        return FinishedState(), dumbwaiter, index
 
 class StrikeTwo(State): 
     '''
@@ -188,21 +219,25 @@ class StrikeTwo(State):
 
         RETURN:
         ________________________________________________________________
-        :return: the next state's on_event() method (State object)
+        :return: the FinishedState (State object)
         :rtype: State
         '''
+        return run(self, colx, dumbwaiter, index)
+
+    def transition(self, colx: object, dumbwaiter: object, 
+        index: int) -> tuple:
         for condate in colx.cons_bydate[index:]:
             # get list of felonies from a given date:
-            conlists = condate.convictions[5:]
+            conlists = condate.convictions[FELONIES:]
             felonylist = list(chain.from_iterable(conlists))
             for f in felonylist:
                 if self.is_qualified(f) and \
                     dumbwaiter.over18_on_date(f.offense_date):
                     dumbwaiter.habcons.append(f)
-                    return StrikeThree().on_event(colx, dumbwaiter, index)
+                    return StrikeThree(), dumbwaiter, index
             else: # no qualified felony found for THIS date
                 index += 1
-        return FinishedState().on_event(colx, dumbwaiter, index)
+        return FinishedState(), dumbwaiter, index
 
 class StrikeThree(State):
     '''
@@ -226,14 +261,18 @@ class StrikeThree(State):
 
         RETURN:
         ________________________________________________________________
-        :return: the next state's on_event() method (State object)
+        :return: the FinishedState (State object)
         :rtype: State
         '''
+        return run(self, colx, dumbwaiter, index)
+
+    def transition(self, colx: object, dumbwaiter: object, 
+        index: int) -> tuple:
         dumbwaiter.set_habeligible(True)
         dispo = colx.cons_bydate[index].disposition_date
         dumbwaiter.set_date_eligible(dispo)
 
-        return FinishedState().on_event(colx, dumbwaiter, index)
+        return FinishedState(), dumbwaiter, index
 
 class FinishedState(State):
     '''
@@ -262,6 +301,31 @@ class FinishedState(State):
         self.dumbwaiter.has_run = True
         return self
 
+def run(state: object, colx: object, dumbwaiter: object, 
+    index: int) -> object:
+    '''
+    Drives the FSM from state to FinishedState in a loop (trampoline),
+    like the felony and misdemeanor FSMs' run().
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param state: the State to start from
+    :param colx: the Charge_Collection Instance
+    :param dumwaiter: a Dumbwaiter instance (context for hab felons)
+    :param index: index of convictiondate in colx.cons_bydate
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the FinishedState holding the dumbwaiter
+    :rtype: FinishedState
+    '''
+    if instrument.ACTIVE != None:   # see instrument.py
+        return instrument.ACTIVE.run(state, colx, dumbwaiter, index, 
+            FinishedState)
+    while type(state) != FinishedState:
+        state, dumbwaiter, index = state.transition(colx, dumbwaiter, index)
+    return state.on_event(colx, dumbwaiter, index)
+
 #--------- The actual state machine itself:-----------------
 class HabitualMachine:
     '''
@@ -0,0 +1,180 @@
+'''
+file    ids.py
+author  Keith Helsabeck
+
+This is the file ids.py, for handing out ids and UUIDs to large batches
+of new Charges, Crimes and Defendants at once.
+
+IdAllocator gives sequential int ids and UUIDs. The UUIDs are made in
+batches from one os.urandom() read per batch (not one per UUID, as
+uuid.uuid4() does). They can be random (version 4), or time-ordered
+(version 7: a millisecond timestamp first, so ids made later sort
+later, which keeps database index inserts near the end of the index).
+
+uuid.UUID can't make a version 7 UUID itself (its version argument only
+takes 1-5 in this Python), so those are built bit by bit here, as RFC
+9562 lays them out.
+
+USE:
+________________________________________________________________________
+ids = IdAllocator(start=1001, version=7)
+ids.assign(charges)         # sets id and unique_id on each
+uid = ids.uuid()
+'''
+import os
+import time
+import typing
+import uuid
+
+# bits of a UUID's 128-bit int (RFC 9562)
+VERSION_SHIFT = 76
+VARIANT = 0b10 << 62                    # the RFC variant, in place
+VERSION_4 = 4 << VERSION_SHIFT
+VERSION_7 = 7 << VERSION_SHIFT
+V4_MASK = ~((0xF << VERSION_SHIFT) | (0b11 << 62)) & ((1 << 128) - 1)
+RAND_B = (1 << 62) - 1                  # low 62 bits (v7 rand_b)
+SEQ_BITS = 74                           # v7 rand_a (12) + rand_b (62)
+
+def uuid_isvalid(uid: object) -> bool:
+    '''Returns True if uid is a UUID. Charge, Crime and Defendant 
+    validate their unique_ids with this (a type check: no uuid4() is
+    made just to compare against).'''
+    return type(uid) == uuid.UUID
+
+def uuid4s(count: int) -> list:
+    '''
+    Returns count random (version 4) UUIDs, from one urandom read.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param count: how many UUIDs
+    '''
+    raw = os.urandom(16 * count)
+    return [
+        uuid.UUID(int=(int.from_bytes(raw[n:n + 16], "big") & V4_MASK)
+            | VERSION_4 | VARIANT)
+        for n in range(0, 16 * count, 16)
+    ]
+
+class IdAllocator:
+    '''
+    IdAllocator hands out sequential int ids and (batches of) UUIDs.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr next: the next int id to hand out
+    :attr version: 4 (random UUIDs) or 7 (time-ordered UUIDs)
+    :attr batch: how many UUIDs to make at a time
+
+    METHODS:
+    ____________________________________________________________________
+    :method next_id: ret the next int id
+    :method ids: ret a range of the next count int ids
+    :method uuid: ret the next UUID
+    :method uuids: ret a list of the next count UUIDs
+    :method assign: sets id and unique_id on many objects
+    '''
+    def __init__(self, start: int = 1, version: int = 4,
+        batch: int = 1024, clock: object = time.time_ns):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param start: the first int id
+        :param version: 4 or 7 (see above)
+        :param batch: UUIDs made per urandom read
+        :param clock: for version 7, ret the time in ns (for testing)
+        '''
+        if type(start) != int or type(batch) != int or batch < 1:
+            raise ValueError("start and batch must be ints (batch 1+).")
+        if version not in (4, 7):
+            raise ValueError("version must be 4 or 7.")
+        self.next = start
+        self.version = version
+        self.batch = batch
+        self.clock = clock
+        self.pool = []
+        self.last_ms = -1
+        self.seq = 0
+
+    def next_id(self) -> int:
+        '''Returns the next int id.'''
+        self.next += 1
+        return self.next - 1
+
+    def ids(self, count: int) -> range:
+        '''Returns the next count int ids (as a range).'''
+        first = self.next
+        self.next += count
+        return range(first, self.next)
+
+    def uuid(self) -> object:
+        '''Returns the next UUID.'''
+        if self.pool == []:
+            self.pool = self.uuids(self.batch)
+            self.pool.reverse()
+        return self.pool.pop()
+
+    def uuids(self, count: int) -> list:
+        '''
+        Returns count new UUIDs (version 4 or 7, see above).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param count: how many UUIDs
+        '''
+        if self.version == 4:
+            return uuid4s(count)
+        return self.uuid7s(count)
+
+    def uuid7s(self, count: int) -> list:
+        '''
+        Returns count time-ordered (version 7) UUIDs. Within a
+        millisecond (and across batches) they keep increasing: the 74
+        bits after the timestamp start at a random value each new
+        millisecond (with the top bit clear, for room to count up) and
+        go up by one for each UUID; if they would overflow, the
+        timestamp is moved on a millisecond.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param count: how many UUIDs
+        '''
+        ms = self.clock() // 1000000
+        if ms > self.last_ms:
+            self.last_ms = ms
+            self.seq = int.from_bytes(os.urandom(10), "big") \
+                >> (80 - SEQ_BITS + 1)
+        made = []
+        for n in range(count):
+            self.seq += 1
+            if self.seq >> SEQ_BITS:
+                self.last_ms += 1
+                self.seq = 0
+            made.append(uuid.UUID(int=(self.last_ms << 80) | VERSION_7
+                | ((self.seq >> 62) << 64) | VARIANT | (self.seq & RAND_B)))
+        return made
+
+    def assign(self, objects: typing.Iterable, overwrite: bool = False):
+        '''
+        Gives each object (Charges, Crimes or Defendants) the next int
+        id and a new UUID. The values are of the right types, so they
+        are set directly rather than through set_id/set_uid.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param objects: an iterable of objects with id and unique_id
+        :param overwrite: if False, objects that already have an id and
+        unique_id are left alone (and one that has just one gets the
+        other)
+        '''
+        objects = list(objects)
+        if not overwrite:
+            objects = [ obj for obj in objects
+                if obj.id == None or obj.unique_id == None ]
+        uids = iter(self.uuids(len(objects)))
+        for obj in objects:
+            if overwrite or obj.id == None:
+                obj.id = self.next_id()
+            uid = next(uids)
+            if overwrite or obj.unique_id == None:
+                obj.unique_id = uid
@@ -0,0 +1,132 @@
+'''
+file    incremental.py
+author  Keith Helsabeck
+
+This is the file incremental.py, for keeping a defendant's scores
+current as new dispositions come in, without rerunning the whole
+record each time.
+
+IncrementalRecord keeps the RecordAnalysis of its collection, and a copy
+of it from before the last conviction date. The rules only ever look at
+one date at a time, in date order, so a charge added (other than one
+still pending or not convicted, which only the version notes):
+(1) on a date after the last one is just fed in (O(1));
+(2) on the last date is fed again from the copy (only that date is
+redone);
+(3) anywhere else changes what came after it, so the record is rerun
+in full (as it also is after a removal, or if the collection was
+changed some other way, including a charge edited in place: see
+Charge_Collection.check_charges).
+
+USE:
+________________________________________________________________________
+record = IncrementalRecord(colx, defendant.birthdate)
+record.add_charge(new_charge)
+record.analysis.felony_level
+'''
+import typing
+
+from .analyzer import RecordAnalyzer, RecordAnalysis
+
+class IncrementalRecord:
+    '''
+    IncrementalRecord wraps a Charge_Collection and keeps its scores
+    (a RecordAnalysis) up to date as charges are added.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr colx: the Charge_Collection
+    :attr birthdate: D's birthdate (for habitual status, may be None)
+    :attr analysis: (property) the current RecordAnalysis
+    :attr reruns: how many times the record was rerun in full
+
+    METHODS:
+    ____________________________________________________________________
+    :method add_charge: adds a charge and updates the scores
+    :method remove_charge: removes a charge by index and rescores
+    :method rerun: rescores the whole record
+    '''
+    def __init__(self, colx: object, birthdate: object = None,
+        analyzer: object = None):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: a Charge_Collection--Charges for D
+        :param birthdate: D's birthdate (datetime.date) or None
+        :param analyzer: the RecordAnalyzer to use (default: new)
+        '''
+        self.colx = colx
+        self.birthdate = birthdate
+        self.analyzer = analyzer or RecordAnalyzer()
+        self.reruns = 0
+        self.rerun()
+
+    @property
+    def analysis(self) -> object:
+        '''The RecordAnalysis of the collection as it is now.'''
+        self.colx.check_charges()
+        if self.colx.version != self.version:
+            self.rerun()
+        return self._analysis
+
+    def rerun(self):
+        '''Rescores the whole record (and takes a new copy from before
+        its last date).'''
+        colx = self.colx
+        colx.groupby_convictiondate()
+        analysis = RecordAnalysis(self.birthdate)
+        self.before_last = analysis
+        for condate in colx.cons_bydate:
+            if condate is colx.cons_bydate[-1]:
+                self.before_last = analysis.copy()
+            self.analyzer.feed(analysis, condate)
+        self.finish(analysis)
+        self.reruns += 1
+
+    def finish(self, analysis: object):
+        '''Helper: keeps analysis as the current one.'''
+        if analysis.dumbwaiter != None:
+            analysis.dumbwaiter.has_run = True
+        self._analysis = analysis
+        self.version = self.colx.version
+
+    def add_charge(self, charge: object):
+        '''
+        Adds a charge to the collection and brings the scores up to
+        date (see the top of this file for what that costs).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param charge: a Charge
+        '''
+        self.colx.check_charges()
+        uptodate = self.colx.version == self.version
+        self.colx.add_charge(charge)
+        dt = charge.disposition_date
+        last = self._analysis.last_date
+        if not uptodate or self.colx.dirty:
+            self.rerun()
+        elif dt == None or charge.convicted == False:
+            self.version = self.colx.version    # (not a conviction)
+        elif last == None or dt > last:
+            self.before_last = self._analysis.copy()
+            analysis = self._analysis
+            self.analyzer.feed(analysis, self.colx.bydate[dt])
+            self.finish(analysis)
+        elif dt == last:
+            analysis = self.before_last.copy()
+            self.analyzer.feed(analysis, self.colx.bydate[dt])
+            self.finish(analysis)
+        else:
+            self.rerun()
+
+    def remove_charge(self, index: int):
+        '''
+        Removes a charge from the collection by index and rescores.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param index: the index/position in colx.charges
+        '''
+        self.colx.remove_charge(index)
+        self.rerun()
@@ -0,0 +1,178 @@
+'''
+file    instrument.py
+author  Keith Helsabeck
+
+This is the file instrument.py, for seeing where the time goes in the
+FSMs. Inside an instrument() block, every FSM run (felony, misdemeanor
+and habitual) counts the transitions out of each state and the time
+spent in each, and ConvictionDate.highest() calls and
+Charge_Collection.groupby_convictiondate() calls (and their time) are
+counted too, as are the lazy collections' own versions of the two (see
+lazy.py).
+
+Instrumentation is off unless a block is open. Then each FSM's run()
+loop only checks ACTIVE once per run, and highest() and
+groupby_convictiondate() are the plain methods (they are only wrapped
+while a block is open), so it costs next to nothing. It is process-wide
+(not per-thread), and blocks don't nest.
+
+USE:
+________________________________________________________________________
+with instrument() as stats:
+    Felony_RecordMachine().on_event(colx)
+stats.transitions["FelonyStatemachine.HubState"]
+or with a callback, called with the stats when the block ends:
+with instrument(callback=report): ...
+'''
+import contextlib
+import time
+import typing
+from collections import Counter, defaultdict
+
+from .collections import Charge_Collection
+from .convictiondate import ConvictionDate
+from .lazy import LazyChargeCollection, LazyConvictionDate
+
+# the classes whose highest() and groupby_convictiondate() are wrapped
+# in a block (each defines its own)
+HIGHEST_CLASSES = (ConvictionDate, LazyConvictionDate)
+GROUPBY_CLASSES = (Charge_Collection, LazyChargeCollection)
+
+# the MachineStats being filled in (None when instrumentation is off)
+ACTIVE = None
+
+class MachineStats:
+    '''
+    MachineStats holds what was counted in an instrument() block. States
+    are named "module.State" (eg: "FelonyStatemachine.HubState").
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr runs: Counter, FSM runs by module
+    :attr transitions: Counter, steps taken in each state
+    :attr seconds: dict, time spent in each state
+    :attr highest_calls: number of ConvictionDate.highest() calls
+    :attr groupings: number of groupby_convictiondate() calls
+    :attr grouping_seconds: time spent in groupby_convictiondate()
+
+    METHODS:
+    ____________________________________________________________________
+    :method run: drives an FSM from a state to its FinishedState, timing
+    each state
+    :method as_dict: ret the stats as a plain dict
+    '''
+    def __init__(self, clock: object = time.perf_counter):
+        self.clock = clock
+        self.runs = Counter()
+        self.transitions = Counter()
+        self.seconds = defaultdict(float)
+        self.highest_calls = 0
+        self.groupings = 0
+        self.grouping_seconds = 0.0
+
+    def record(self, state: object, seconds: float):
+        '''Helper: counts a step in state that took seconds.'''
+        name = f"{type(state).__module__.rsplit('.', 1)[-1]}." \
+            f"{type(state).__name__}"
+        self.transitions[name] += 1
+        self.seconds[name] += seconds
+
+    def run(self, state: object, colx: object, context: object, index: int,
+        finished: type) -> object:
+        '''
+        The instrumented form of the FSMs' run() loops: drives the FSM
+        from state to the finished state, timing each transition() and
+        the final on_event().
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param state: the State to start from
+        :param colx: the Charge_Collection Instance
+        :param context: what the FSM threads through its states (pts, or
+        the habitual machine's Dumbwaiter)
+        :param index: index of convictiondate in colx.cons_bydate
+        :param finished: the FSM's FinishedState class
+
+        RETURN:
+        ________________________________________________________________
+        :return: the finished state's on_event() result
+        :rtype: State
+        '''
+        clock = self.clock
+        self.runs[type(state).__module__.rsplit(".", 1)[-1]] += 1
+        while type(state) != finished:
+            began = clock()
+            following, context, index = state.transition(colx, context, index)
+            self.record(state, clock() - began)
+            state = following
+        began = clock()
+        state = state.on_event(colx, context, index)
+        self.record(state, clock() - began)
+        return state
+
+    def as_dict(self) -> dict:
+        '''Returns the stats as a plain dict (eg: for JSON).'''
+        return {
+            "runs": dict(self.runs),
+            "transitions": dict(self.transitions),
+            "seconds": dict(self.seconds),
+            "highest_calls": self.highest_calls,
+            "groupings": self.groupings,
+            "grouping_seconds": self.grouping_seconds,
+        }
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+@contextlib.contextmanager
+def instrument(callback: object = None,
+    clock: object = time.perf_counter) -> typing.Iterator:
+    '''
+    Turns instrumentation on for the block, yielding the MachineStats
+    it fills in, and turns it back off (restoring highest() and
+    groupby_convictiondate(), on each class in HIGHEST_CLASSES and 
+    GROUPBY_CLASSES) when the block ends.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param callback: called with the MachineStats when the block ends
+    :param clock: the timer to use (default time.perf_counter)
+    '''
+    global ACTIVE
+    if ACTIVE != None:
+        raise ValueError("Instrumentation is already on.")
+    stats = MachineStats(clock)
+
+    def counted_highest(highest: object) -> object:
+        def counted(self):
+            stats.highest_calls += 1
+            return highest(self)
+        return counted
+
+    def timed_groupby(groupby: object) -> object:
+        def timed(self):
+            began = clock()
+            try:
+                return groupby(self)
+            finally:
+                stats.groupings += 1
+                stats.grouping_seconds += clock() - began
+        return timed
+
+    plain = []      # (class, name, the plain method), to put back
+    for classes, name, wrap in ((HIGHEST_CLASSES, "highest", 
+        counted_highest), (GROUPBY_CLASSES, "groupby_convictiondate", 
+        timed_groupby)):
+        for cls in classes:
+            method = cls.__dict__[name]
+            plain.append((cls, name, method))
+            setattr(cls, name, wrap(method))
+    ACTIVE = stats
+    try:
+        yield stats
+    finally:
+        ACTIVE = None
+        for cls, name, method in plain:
+            setattr(cls, name, method)
+    if callback != None:
+        callback(stats)
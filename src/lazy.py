@@ -0,0 +1,447 @@
+'''
+file    lazy.py
+author  Keith Helsabeck
+
+This is the file lazy.py, for LazyChargeCollection: a Charge_Collection
+that holds its charges as rows (from the loader, a database cursor or
+an archive) and only makes a Charge when one is asked for.
+
+Grouping by conviction date only needs each charge's disposition date,
+convicted flag and crime (for its class), so those are kept as columns
+(one list per field) and the rest of each row is left as it came. Each
+LazyConvictionDate holds positions in those columns, and hands out its
+charges as LazyCharges: read-only sequences that make each Charge as it
+is read. So highest()[0] (all the felony and misdemeanor machines read
+of a date) makes one Charge, and the habitual scan of convictions makes
+only the felonies it looks at. A Charge once made is kept, so it is
+the same object every time.
+
+Adding or removing a charge (or reordering them) marks the grouping for
+a full rebuild, rather than filing the charge in place as
+Charge_Collection does: this is for records read in bulk and scored,
+not edited one charge at a time. A Charge made and then edited in
+place is found by check_charges(), as in Charge_Collection, by
+comparing the made Charges with their columns, and so is a Crime 
+edited in place (its class and statute are filed when it is grouped). Grouping leaves the
+charges in their order. A LazyConvictionDate from before a removal or a sort still
+shows the charges as they were then.
+
+USE:
+________________________________________________________________________
+colx = LazyChargeCollection.from_rows(rows)     # rows in Charge.FIELDS
+analysis = RecordAnalyzer().analyze(colx, birthdate)
+'''
+import datetime
+import typing
+from collections.abc import Sequence
+
+from .charge import Charge
+from .collections import Charge_Collection, charge_fields, crime_fields
+from .convictiondate import ConvictionDate
+from .crime import Crime
+from .fields import columns
+
+def make_charge(row: tuple) -> object:
+    '''Returns the Charge for a row in Charge.FIELDS order (trusted).'''
+    return Charge.from_fields(*row, trusted=True)
+
+class LazyCharges(Sequence):
+    '''
+    A read-only sequence of some of a LazyConvictionDate's charges (one
+    class's), making each Charge as it is read (tuple() makes them all).
+    '''
+    __slots__ = ("condate", "positions")
+
+    def __init__(self, condate: object, positions: list):
+        self.condate = condate
+        self.positions = positions
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index: object) -> object:
+        if type(index) == slice:
+            return tuple(self.condate.charge(position)
+                for position in self.positions[index])
+        position = self.positions[index]
+        charge = self.condate.made[position]
+        if charge == None:
+            charge = self.condate.charge(position)
+        return charge
+
+    def __repr__(self) -> str:
+        return f"LazyCharges({len(self)} charges)"
+
+class LazyConvictionDate(ConvictionDate):
+    '''
+    A ConvictionDate over positions in a LazyChargeCollection's columns
+    (filled in by the collection as it groups), making the Charges as
+    they are asked for.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr disposition_date: (datetime.date)--date for all these charges
+    :attr positions: the positions of each class's charges (a dict, by
+    CrimeClass rank)
+    :attr top: the highest rank in positions (or -1)
+    :attr convictions: (property) a list of LazyCharges, one per class
+
+    METHODS:
+    ____________________________________________________________________
+    :method add_position: adds a position (the collection's grouping)
+    :method charge: ret the Charge at a position (making it if need be)
+    :method highest: ret the highest-level charges (as LazyCharges)
+    '''
+    def __init__(self, date: object, made: list, sources: list,
+        make: object):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param date: the conviction date
+        :param made: the collection's made Charges (None if not made)
+        :param sources: the collection's sources, for make
+        :param make: makes the Charge for a source
+        '''
+        self.positions = {}
+        self.top = -1
+        self.high = None        # highest()'s LazyCharges, once made
+        self.made = made
+        self.sources = sources
+        self.make = make
+        self.disposition_date = date    # (checked by the collection)
+
+    def add_position(self, position: int, rank: int):
+        '''Adds a position whose crime has a CrimeClass of rank.'''
+        if rank in self.positions:
+            self.positions[rank].append(position)
+        else:
+            self.positions[rank] = [ position ]
+        if rank > self.top:
+            self.top = rank
+            self.high = None
+
+    def add(self, charge: object):
+        '''A lazy conviction date is only filled by its collection.'''
+        raise ValueError("add() needs Charge with right date.")
+
+    def remove(self, charge: object):
+        '''A lazy conviction date is only changed by its collection.'''
+        raise ValueError("remove() needs a Charge in this date.")
+
+    def charge(self, position: int) -> object:
+        '''Returns the Charge at a position (making it if need be).'''
+        charge = self.made[position]
+        if charge == None:
+            charge = self.made[position] = self.make(self.sources[position])
+        return charge
+
+    @property
+    def convictions(self) -> list:
+        '''The charges grouped by level: a list with, for each class,
+        LazyCharges (or () if the class has no charges).'''
+        positions = self.positions
+        return [ LazyCharges(self, positions[rank]) if rank in positions
+            else () for rank in range(len(Crime.valid_classes)) ]
+
+    def highest(self) -> object:
+        '''returns the highest-level charges (or None if there are none),
+        as LazyCharges: each Charge is made as it is read.
+
+        RETURNS:
+        ________________________________________________________________
+        :returns: Highest charges in this data structure
+        :rtype: LazyCharges
+        '''
+        if self.top < 0:
+            return None
+        if self.high == None:
+            self.high = LazyCharges(self, self.positions[self.top])
+        return self.high
+
+class LazyChargeCollection(Charge_Collection):
+    '''
+    A Charge_Collection that makes its Charges only as they are asked
+    for (see the top of this file). Same methods as Charge_Collection.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr charges: (property) a new list of all the charges (makes all)
+    :attr unique_dates: sorted list of the unique conviction dates
+    :attr cons_bydate: list of LazyConvictionDates (same order as dates)
+    :attr version: int, goes up every time the collection changes
+    :attr dirty: True if the grouping must be rebuilt from scratch
+    :attr filed_crimes: id(crime) -> (crime, its crime_fields() when 
+    grouped), for the crimes of the convictions
+    :attr make: makes the Charge for a source (by default, a row in
+    Charge.FIELDS order)
+
+    METHODS:
+    ____________________________________________________________________
+    :method from_rows: (classmethod) makes one from rows of fields
+    :method add_rows: adds rows of fields (in Charge.FIELDS order)
+    :method add_sources: adds sources for make, with their columns
+    :method charge: ret the Charge at a position (making it if need be)
+    :method check_charges: marks changed if a made Charge was edited
+    (and the Charge_Collection methods)
+    '''
+    def __init__(self, make: object = None):
+        '''
+        PARAMETERS:
+        ________________________________________________________________
+        :param make: makes the Charge for a source (see add_sources);
+        by default the sources are rows, as add_rows takes
+        '''
+        self.make = make_charge if make == None else make
+        self.version = 0
+        self.reset_charges()
+
+    @classmethod
+    def from_rows(cls, rows: typing.Iterable) -> object:
+        '''
+        Makes a LazyChargeCollection of rows of a Charge's fields (in
+        the order of Charge.FIELDS, trusted: see Charge.from_rows).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param rows: an iterable of tuples (see Charge.FIELDS)
+        '''
+        colx = cls()
+        colx.add_rows(rows)
+        return colx
+
+    def reset_charges(self):
+        '''This sets the collection empty.'''
+        self.offense = []
+        self.crime = []
+        self.disposition = []
+        self.convicted = []
+        self.sources = []
+        self.made = []
+        self.unique_dates = []
+        self.cons_bydate = []
+        self.bydate = {}
+        self.filed_crimes = {}
+        self.dirty = False
+        self.version += 1
+
+    @property
+    def charges(self) -> list:
+        '''A new list of all the charges, in order (makes them all).'''
+        return [ self.charge(position)
+            for position in range(len(self.made)) ]
+
+    def charge(self, position: int) -> object:
+        '''Returns the Charge at a position (making it if need be).'''
+        charge = self.made[position]
+        if charge == None:
+            charge = self.made[position] = self.make(self.sources[position])
+        return charge
+
+    def add_rows(self, rows: typing.Iterable):
+        '''
+        Adds rows of a Charge's fields (in Charge.FIELDS order, trusted),
+        for the default make.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param rows: an iterable of tuples (see Charge.FIELDS)
+        '''
+        rows = list(rows)
+        ids, uids, offenses, crimes, dispositions, convicted = \
+            columns(rows, len(Charge.FIELDS))
+        self.add_sources(rows, offenses, crimes, dispositions, convicted)
+
+    def add_sources(self, sources: typing.Iterable, offenses: typing.Iterable,
+        crimes: typing.Iterable, dispositions: typing.Iterable,
+        convicted: typing.Iterable):
+        '''
+        Adds charges as sources that make turns into Charges (eg: rows
+        of an archive), with the fields of each that grouping and
+        sorting read (trusted).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param sources: what make takes, one per charge
+        :param offenses: the offense dates
+        :param crimes: the Crimes
+        :param dispositions: the disposition dates
+        :param convicted: the convicted flags
+        '''
+        sources = list(sources)
+        self.sources.extend(sources)
+        self.made.extend([ None ] * len(sources))
+        self.offense.extend(offenses)
+        self.crime.extend(crimes)
+        self.disposition.extend(dispositions)
+        self.convicted.extend(convicted)
+        if not len(self.sources) == len(self.offense) == len(self.crime) \
+            == len(self.disposition) == len(self.convicted):
+            raise ValueError("Each source needs one of each field.")
+        self.mark_changed()
+
+    def add_charge(self, charge: object):
+        '''This adds a charge after validation.'''
+        self.add_charges([ charge ])
+
+    def add_charges(self, charges: typing.Iterable):
+        '''This adds many charges after validation (regroups later).
+
+        PARAMETERS
+        ________________________________________________________________
+        :param charges: an iterable of Charges
+        '''
+        charges = list(charges)
+        for charge in charges:
+            if Charge != type(charge):
+                raise ValueError("Only valid Charge objects may be added.")
+        self.sources.extend([ None ] * len(charges))
+        self.made.extend(charges)
+        self.offense.extend([ None ] * len(charges))
+        self.crime.extend([ None ] * len(charges))
+        self.disposition.extend([ None ] * len(charges))
+        self.convicted.extend([ None ] * len(charges))
+        self.refresh()
+        self.mark_changed()
+
+    def remove_charge(self, index: int):
+        '''This deletes a charge from the charges by index.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param index: the index/position in self.charges
+        '''
+        count = len(self.made)
+        if type(index) != int or not -count <= index < count:
+            raise ValueError("This charge is not in charges.")
+        keep = [ position for position in range(count)
+            if position != index % count ]
+        self.reorder(keep)
+        self.mark_changed()
+
+    def is_in(self, charge: object) -> bool:
+        '''This returns True if the charge is present else False.
+
+        PARAMETERS
+        ________________________________________________________________
+        :param charge: the charge is present already
+
+        RETURNS
+        ________________________________________________________________
+        :returns: True if charge in, else False
+        :rtype: bool
+        '''
+        return charge in self.made      # (a Charge not made isn't it)
+
+    def check_charges(self) -> bool:
+        '''This compares the Charges made (which may have been edited in
+        place) with their columns, and the crimes grouped with their 
+        fields as filed, and marks the collection changed if any 
+        differ. Charges not made yet can't have been edited.
+
+        RETURNS
+        ________________________________________________________________
+        :returns: True if the grouping must be rebuilt, else False
+        :rtype: bool
+        '''
+        if self.dirty:
+            return True
+        if any(crime_fields(crime) != fields 
+            for crime, fields in self.filed_crimes.values()):
+            self.mark_changed()
+            return True
+        if not any(self.made):
+            return False
+        filed = zip(self.crime, self.offense, self.disposition, 
+            self.convicted)
+        if any(charge != None and charge_fields(charge) != fields
+            for charge, fields in zip(self.made, filed)):
+            self.mark_changed()
+        return self.dirty
+
+    def refresh(self):
+        '''Helper: rereads the columns of the Charges already made (they
+        may have been changed since, see mark_changed).'''
+        if not any(self.made):
+            return
+        for position, charge in enumerate(self.made):
+            if charge != None:
+                self.offense[position] = charge.offense_date
+                self.crime[position] = charge.crime
+                self.disposition[position] = charge.disposition_date
+                self.convicted[position] = charge.convicted
+
+    def reorder(self, order: list):
+        '''Helper: puts the columns in order (a list of positions). The
+        columns are new lists, so the LazyConvictionDates made before
+        keep the old ones.'''
+        for name in ("offense", "crime", "disposition", "convicted",
+            "sources", "made"):
+            column = getattr(self, name)
+            setattr(self, name, [ column[position] for position in order ])
+
+    def sort_by(self, column: list) -> bool:
+        '''Helper: sorts the charges (stably) by a column; ret T if that
+        changed their order.'''
+        order = sorted(range(len(column)), key=column.__getitem__)
+        if order == list(range(len(column))):
+            return False
+        self.reorder(order)
+        return True
+
+    def sortby_offensedate(self):
+        '''This sorts the collection by the dates of offense of the
+        charges from earliest to latest.'''
+        self.check_charges()
+        self.refresh()
+        if self.sort_by(self.offense):
+            self.mark_changed()
+
+    def sortby_conviction(self):
+        '''This sorts the collection by the conviction dates of the
+        charges from earliest to latest.'''
+        self.check_charges()
+        self.refresh()
+        if self.sort_by(self.disposition):
+            self.mark_changed()
+
+    def datemaker(self):
+        '''Helper for groupby_convictiondate().
+
+        This makes the sorted list of the unique conviction dates.'''
+        self.refresh()
+        self.unique_dates = sorted({ dt for dt in self.disposition 
+            if dt != None })
+
+    def groupby_convictiondate(self):
+        '''This groups the convicted charges by conviction date into
+        LazyConvictionDates, without making any Charges (the checks are
+        ConvictionDate.add()'s, on the columns; a charge convicted False
+        is left out, as in Charge_Collection). Unlike a full regroup
+        of a Charge_Collection, it leaves the charges in their order.
+        It only checks for edits (see check_charges) unless the 
+        grouping is dirty.'''
+        if not self.check_charges():
+            return
+        self.refresh()
+        crimes, convicted = self.crime, self.convicted
+        made, sources, make = self.made, self.sources, self.make
+        DATE, bydate, filed = datetime.date, {}, {}
+        for position, dt in enumerate(self.disposition):
+            if dt == None or convicted[position] == False:
+                continue    # (not a conviction)
+            crime = crimes[position]
+            rank = crime.classrank if type(crime) == Crime else None
+            if type(dt) != DATE or rank == None:
+                raise ValueError("add() needs Charge with right date.")
+            condate = bydate.get(dt)
+            if condate == None:
+                condate = bydate[dt] = LazyConvictionDate(dt, made, sources,
+                    make)
+            condate.add_position(position, rank)
+            if id(crime) not in filed:
+                filed[id(crime)] = (crime, crime_fields(crime))
+        self.unique_dates = sorted(bydate)
+        self.bydate = bydate
+        self.cons_bydate = [ bydate[dt] for dt in self.unique_dates ]
+        self.filed_crimes = filed
+        self.dirty = False
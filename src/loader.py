@@ -0,0 +1,205 @@
+'''
+file    loader.py
+author  Keith Helsabeck
+
+This is the file loader.py, for streaming charge records out of court 
+exports (CSV or JSON Lines) into Defendants and Charge_Collections.
+
+Rows are read one at a time with generators and checked with the same
+rules as the set_* methods (the loader builds each object through them).
+Rows must come grouped by defendant (all of a defendant's rows next to 
+each other, as an export sorted by defendant id is), and only one 
+defendant's rows are held at a time, so memory stays bounded however 
+big the file is. Crimes are interned in a CrimeCatalog, so charges of
+the same crime share one Crime.
+
+Each row is one charge, with these fields (CSV header / JSON keys):
+defendant_id, firstname, lastname, birthdate, charge_id, statute, 
+description, crimeclass, offense_date, disposition_date, convicted
+and, if present, defendant_uid and charge_uid. Dates are ISO 
+(YYYY-MM-DD) and may be blank; convicted is true/false (or 1/0, yes/no).
+A charge disposed without a conviction (a disposition date, convicted
+false: dismissed, not guilty) is loaded as it is; the collections leave
+it out of their conviction dates, so the records it is in still score.
+
+USE:
+________________________________________________________________________
+for defendant, colx in load_csv("export.csv"):
+    ...
+or straight into batch scoring:
+results = score_batch(load_jsonl("export.jsonl"))
+'''
+import csv
+import json
+import typing
+import uuid
+from datetime import date
+from itertools import groupby
+
+from .catalog import CrimeCatalog
+from .charge import Charge
+from .collections import Charge_Collection
+from .defendant import Defendant
+
+TRUE_STRINGS = {"true", "t", "1", "yes", "y"}
+FALSE_STRINGS = {"false", "f", "0", "no", "n", ""}
+
+def open_text(source: object) -> object:
+    '''Returns source opened for reading if it is a path, else source.'''
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8", newline="")
+    return source
+
+def read_csv(source: object) -> typing.Iterator:
+    '''
+    Yields each row of a CSV file (with a header row) as a dict.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param source: a path, or an open text file
+    '''
+    f = open_text(source)
+    try:
+        yield from csv.DictReader(f)
+    finally:
+        if f is not source:
+            f.close()
+
+def read_jsonl(source: object) -> typing.Iterator:
+    '''
+    Yields each line of a JSON Lines file as a dict (blank lines are 
+    skipped).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param source: a path, or an open text file
+    '''
+    f = open_text(source)
+    try:
+        for line in f:
+            if line.strip() != "":
+                yield json.loads(line)
+    finally:
+        if f is not source:
+            f.close()
+
+def parse_date(value: object) -> object:
+    '''Returns an ISO date string as a datetime.date (None if blank).'''
+    if value == None or value == "":
+        return None
+    if type(value) == date:
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"A date must be YYYY-MM-DD, not {value!r}.")
+
+def parse_bool(value: object) -> bool:
+    '''Returns a true/false value (bool or string) as a bool.'''
+    if type(value) == bool:
+        return value
+    if value == None:
+        return False
+    text = str(value).strip().lower()
+    if text in TRUE_STRINGS:
+        return True
+    if text in FALSE_STRINGS:
+        return False
+    raise ValueError(f"convicted must be true or false, not {value!r}.")
+
+def parse_int(value: object) -> int:
+    '''Returns an int or an int string as an int.'''
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"An id must be a valid int, not {value!r}.")
+
+def make_defendant(row: dict) -> object:
+    '''
+    Builds a Defendant from a row through its set_* methods.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param row: a dict of one row's fields
+    '''
+    defendant = Defendant()
+    defendant.set_id(parse_int(row["defendant_id"]))
+    if row.get("defendant_uid"):
+        defendant.set_uid(uuid.UUID(row["defendant_uid"]))
+    defendant.set_firstname(row.get("firstname") or "")
+    defendant.set_lastname(row.get("lastname") or "")
+    birthdate = parse_date(row.get("birthdate"))
+    if birthdate != None:
+        defendant.set_birthdate(birthdate)
+    return defendant
+
+def make_charge(row: dict, catalog: object) -> object:
+    '''
+    Builds a Charge (and interns its Crime) from a row through the
+    set_* methods.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param row: a dict of one row's fields
+    :param catalog: the CrimeCatalog to intern the crime in
+    '''
+    charge = Charge()
+    if row.get("charge_id") not in (None, ""):
+        charge.set_id(parse_int(row["charge_id"]))
+    if row.get("charge_uid"):
+        charge.set_uid(uuid.UUID(row["charge_uid"]))
+    charge.set_crime(catalog.intern(
+        row.get("statute") or "", row.get("crimeclass"), 
+        row.get("description") or "",
+    ))
+    offense_date = parse_date(row.get("offense_date"))
+    if offense_date != None:
+        charge.set_offensedate(offense_date)
+    disposition_date = parse_date(row.get("disposition_date"))
+    if disposition_date != None:
+        charge.set_dispositiondate(disposition_date)
+    charge.convicted = parse_bool(row.get("convicted"))
+    return charge
+
+def load_records(rows: typing.Iterable, 
+    catalog: object = None) -> typing.Iterator:
+    '''
+    Yields a (Defendant, Charge_Collection) pair for each run of rows 
+    with the same defendant_id. The defendant's fields come from the 
+    first row of the run.
+
+    A row that fails validation raises ValueError, naming the row 
+    (counting from 1, not counting a CSV header).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param rows: an iterable of row dicts (see read_csv/read_jsonl)
+    :param catalog: a CrimeCatalog to intern crimes in (default: new)
+
+    RETURN:
+    ____________________________________________________________________
+    :return: an iterator of (Defendant, Charge_Collection) pairs
+    :rtype: iterator
+    '''
+    if catalog == None:
+        catalog = CrimeCatalog()
+    numbered = enumerate(rows, 1)
+    for key, run in groupby(numbered, key=lambda x: x[1].get("defendant_id")):
+        defendant = None
+        colx = Charge_Collection()
+        for number, row in run:
+            try:
+                if defendant == None:
+                    defendant = make_defendant(row)
+                colx.add_charge(make_charge(row, catalog))
+            except (KeyError, ValueError) as err:
+                raise ValueError(f"row {number}: {err}") from err
+        yield defendant, colx
+
+def load_csv(source: object, catalog: object = None) -> typing.Iterator:
+    '''Yields (Defendant, Charge_Collection) pairs from a CSV export.'''
+    return load_records(read_csv(source), catalog)
+
+def load_jsonl(source: object, catalog: object = None) -> typing.Iterator:
+    '''Yields (Defendant, Charge_Collection) pairs from a JSONL export.'''
+    return load_records(read_jsonl(source), catalog)
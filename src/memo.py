@@ -0,0 +1,216 @@
+'''
+file    memo.py
+author  Keith Helsabeck
+
+This is the file memo.py, for not scoring the same record twice. A
+record's fingerprint is a hash of everything the FSMs read from it:
+each charge's crime class, statute, offense date, disposition date and
+convicted flag, plus D's birthdate (for habitual status). ResultCache
+keeps scores by fingerprint in a bounded LRU (and, optionally, a shelve
+file on disk behind it), so a record is only rescored when its
+fingerprint changes.
+
+The charges are hashed in conviction date order (a stable sort, so
+charges on the same date keep their order: the first charge of the top
+class on a date is the one the FSMs score, so that order matters).
+
+USE:
+________________________________________________________________________
+cache = ResultCache(maxsize=4096, path="scores.db")
+result = cache.score_record((defendant, colx))     # a BatchResult
+'''
+import hashlib
+import shelve
+import typing
+import weakref
+from collections import OrderedDict
+from datetime import date
+
+from .batch import as_collection, score_record
+
+def charge_fields(charge: object) -> tuple:
+    '''Returns the fields of a charge that the FSMs read.'''
+    crime = charge.crime
+    return (
+        None if crime == None else crime.crimeclass,
+        None if crime == None else crime.statute,
+        charge.offense_date, charge.disposition_date,
+        charge.convicted == True,
+    )
+
+def disposition_key(charge: object) -> tuple:
+    '''Sort key: conviction date order, charges with no date last.'''
+    dt = charge.disposition_date
+    return (dt == None, dt or date.min)
+
+def fingerprint(charges: typing.Iterable, birthdate: object = None) -> str:
+    '''
+    Returns a record's fingerprint (a hex digest).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param charges: a Charge_Collection or an iterable of Charges
+    :param birthdate: D's birthdate (or None)
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the fingerprint
+    :rtype: str
+    '''
+    charges = sorted(getattr(charges, "charges", charges),
+        key=disposition_key)
+    digest = hashlib.blake2b(repr(birthdate).encode(), digest_size=16)
+    for charge in charges:
+        digest.update(repr(charge_fields(charge)).encode())
+    return digest.hexdigest()
+
+class ResultCache:
+    '''
+    ResultCache keeps BatchResults by record fingerprint: the most
+    recently used maxsize in memory and, if a path is given, all of them
+    in a shelve file there (which outlives the process).
+
+    A Charge_Collection's fingerprint is worked out once per version of
+    the collection (see Charge_Collection.version), so looking up an
+    unchanged collection again doesn't rehash it. The collection is 
+    grouped first (which checks it for edits, see check_charges, and is
+    one pass if it is already grouped), so a charge or a crime edited in
+    place gives a new version (and a new fingerprint). A collection
+    that was dirty tracks no edits until it is grouped, so its version 
+    alone couldn't be trusted.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr maxsize: the most results kept in memory
+    :attr results: OrderedDict, fingerprint -> BatchResult (LRU order)
+    :attr disk: the shelve (None without a path)
+    :attr hits: lookups answered from the cache
+    :attr misses: lookups that had to score the record
+
+    METHODS:
+    ____________________________________________________________________
+    :method fingerprint: ret a record's fingerprint (memoized)
+    :method get: ret the result for a fingerprint (None if not cached)
+    :method put: caches the result for a fingerprint
+    :method score_record: ret the cached result, else scores and caches
+    :method clear: empties the cache (memory and disk)
+    :method close: closes the shelve
+    '''
+    def __init__(self, maxsize: int = 1024, path: str = None):
+        if type(maxsize) != int or maxsize < 1:
+            raise ValueError("maxsize must be an int of 1 or more.")
+        self.maxsize = maxsize
+        self.results = OrderedDict()
+        self.disk = None if path == None else shelve.open(path)
+        self.prints = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def close(self):
+        '''Closes the shelve (if there is one).'''
+        if self.disk != None:
+            self.disk.close()
+            self.disk = None
+
+    def clear(self):
+        '''Empties the cache, on disk too.'''
+        self.results.clear()
+        if self.disk != None:
+            self.disk.clear()
+
+    def fingerprint(self, charges: object, birthdate: object = None) -> str:
+        '''
+        Returns a record's fingerprint, reusing the last one worked out
+        for a Charge_Collection if it hasn't changed since.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param charges: a Charge_Collection or an iterable of Charges
+        :param birthdate: D's birthdate (or None)
+        '''
+        if not hasattr(charges, "version"):
+            return fingerprint(charges, birthdate)
+        charges.groupby_convictiondate()    # (a charge or crime edited)
+        memo = self.prints.get(charges)
+        if memo != None and memo[0] == charges.version \
+            and memo[1] == birthdate:
+            return memo[2]
+        key = fingerprint(charges, birthdate)
+        self.prints[charges] = (charges.version, birthdate, key)
+        return key
+
+    def get(self, key: str) -> object:
+        '''
+        Returns the cached result for a fingerprint, or None. A result
+        found on disk is brought back into memory.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param key: a fingerprint
+        '''
+        result = self.results.get(key)
+        if result != None:
+            self.results.move_to_end(key)
+            return result
+        if self.disk != None and key in self.disk:
+            result = self.disk[key]
+            self.remember(key, result)
+        return result
+
+    def put(self, key: str, result: object):
+        '''
+        Caches a result under a fingerprint (in memory and on disk).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param key: a fingerprint
+        :param result: the record's BatchResult
+        '''
+        self.remember(key, result)
+        if self.disk != None:
+            self.disk[key] = result
+
+    def remember(self, key: str, result: object):
+        '''Helper: puts a result in memory, dropping the least recently
+        used if there are more than maxsize.'''
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.maxsize:
+            self.results.popitem(last=False)
+
+    def score_record(self, record: tuple) -> object:
+        '''
+        Scores one defendant's record, or returns the cached scores if a
+        record with the same fingerprint was scored before.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param record: a (Defendant, charges) pair (see score_record)
+
+        RETURN:
+        ________________________________________________________________
+        :return: the defendant's scores
+        :rtype: BatchResult
+        '''
+        defendant, charges = record
+        colx = as_collection(charges)
+        key = self.fingerprint(colx, defendant.birthdate)
+        result = self.get(key)
+        if result == None:
+            self.misses += 1
+            result = score_record((defendant, colx))
+            self.put(key, result)
+        else:
+            self.hits += 1
+        if result.defendant_id != defendant.id:
+            result = result._replace(defendant_id=defendant.id)
+        return result
@@ -10,6 +10,7 @@ Midemeanor Record in NC:
 1-4 conviction (F or M on seperate dates) -----> Misdemeanor Level 2
 over 4 convictions (F or M on seperate dates) -> Misdemeanor Level 3
 '''
+from . import instrument
 from .collections import Charge_Collection
 from .charge import Charge
 
@@ -29,6 +30,7 @@ class State:
     METHODS:
     ____________________________________________________________________
     :method on_event: takes colx and pts --> State.on_event()
+    :method transition: takes colx, pts, index -> (next state, pts, idx)
     :method conviction_qualified: takes conviction -> T if qualified | F
     :method repr: returns representation of this state's class name
     :method str: returns representation of this state's class name
@@ -55,6 +57,24 @@ class State:
         '''
         return 0 
 
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
+        '''
+        Takes one step of the FSM without recursing into the next state.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param colx: the Charge_Collection Instance
+        :param pts: num of misdemeanor pts
+        :param index: index of convictiondate in colx.cons_bydate
+
+        RETURN:
+        ________________________________________________________________
+        :return: the next state, the new pts, and the new index (the
+        base State goes straight to a FinishedState)
+        :rtype: tuple
+        '''
+        return FinishedState(), pts, index
+
     def get_conviction(self, colx: object, index: int) -> object:
         '''
         Gets the highest-level conviction (charge) from condate at idx
@@ -66,14 +86,15 @@ class State:
 
         RETURN:
         ________________________________________________________________
-        :return: True if the conviction is qualified for misd points
-        :rtype: bool
+        :return: the highest conviction (None if there is none, which
+        conviction_qualified() takes as not qualified)
+        :rtype: Charge
         '''
         try:
             c = colx.cons_bydate[index].highest()
             return c[0]
         except:
-            self.error = True
+            return None     # (the states are shared: no flag on self)
 
     def conviction_qualified(self, conv: object) -> bool:
         '''
@@ -90,7 +111,7 @@ class State:
         '''
         if type(conv) == Charge and \
             conv.convicted == True and \
-            conv.crime.crimeclass != "Infraction":
+            conv.crime.misd_qualified:
             return True
         return False
 
@@ -131,8 +152,11 @@ class StartState(State):
         :param pts: num of misdemeanor record points
         :param index: index of convictiondate in colx.cons_bydate
         '''
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
         colx.groupby_convictiondate()
-        return LevelOne().on_event(colx, pts, index)
+        return LEVEL_ONE, pts, index
 
 class LevelOne(State):
     '''
@@ -167,15 +191,17 @@ class LevelOne(State):
         :param pts: num of misdemeanor record points
         :param index: index of convictiondate in colx.cons_bydate
         '''
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
         listlength = len(colx.cons_bydate) # len of list of conv'n dates
-        if listlength == 0 or index == listlength:
-            return FinishedState().on_event(colx, pts, index)
-        elif listlength > 0 and index < listlength: 
-            c = self.get_conviction(colx, index)
-            if self.conviction_qualified(c):
-                return LevelTwo().on_event(colx, pts + 1, index + 1)
-            else:   # keep checking disposition dates for qualified
-                return self.on_event(colx, pts, index + 1)
+        if listlength == 0 or index >= listlength:
+            return FinishedState(), pts, index
+        c = self.get_conviction(colx, index)
+        if self.conviction_qualified(c):
+            return LEVEL_TWO, pts + 1, index + 1
+        # keep checking disposition dates for qualified
+        return self, pts, index + 1
 
 class LevelTwo(State):
     '''
@@ -210,19 +236,23 @@ class LevelTwo(State):
         :param pts: num of misdemeanor record points
         :param index: index of convictiondate in colx.cons_bydate
         '''
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
         listlength = len(colx.cons_bydate) # len of list of conv'n dates
         if listlength == 0 or index == listlength:
-            return FinishedState().on_event(colx, pts, index)
+            return FinishedState(), pts, index
         if listlength > 1 and pts < 5: 
             c = self.get_conviction(colx, index)
             if self.conviction_qualified(c):
-                return self.on_event(colx, pts + 1, index + 1)
-            return self.on_event(colx, 0, index + 1)
+                return self, pts + 1, index + 1
+            return self, 0, index + 1
         elif listlength > 1 and pts >= 5: 
-            return FinishedState().on_event(colx, pts, index)
+            return FinishedState(), pts, index
         else:
-            self.error = True
-            return FinishedState().on_event(colx, pts, index)
+            finished = FinishedState()  # the error goes with this run
+            finished.error = True
+            return finished, pts, index
 
 class LevelThree(State):
     '''
@@ -255,9 +285,10 @@ class LevelThree(State):
         :param pts: num of misdemeanor record points
         :param index: index of convictiondate in colx.cons_bydate
         '''
-        if type(colx.cons_bydate) == list \
-            and len(colx.cons_bydate) == 0:
-            return FinishedState().on_event(colx, pts, index)
+        return run(self, colx, pts, index)
+
+    def transition(self, colx: object, pts: int, index: int) -> tuple:
+        return FinishedState(), pts, index
 
 class FinishedState(State):
     '''
@@ -303,14 +334,60 @@ class FinishedState(State):
         ________________________________________________________________
         :param pts: the number of m record points
         '''
-        if pts == 0:
-            self.level = 1
-        elif 1 <= pts < 5:
-            self.level = 2
-        elif pts >= 5:
-            self.level = 3
-        else:
+        level = misdemeanor_level(pts)
+        if level == None:
             self.error = True
+        else:
+            self.level = level
+
+def misdemeanor_level(pts: int) -> int:
+    '''
+    Returns the misdemeanor record level for a number of points (or 
+    None for a negative number).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param pts: the number of m record points
+    '''
+    if pts == 0:
+        return 1
+    elif 1 <= pts < 5:
+        return 2
+    elif pts >= 5:
+        return 3
+
+# The level states keep no per-run data, so one preallocated instance of
+# each is reused for every step of every run. FinishedState holds the
+# results and is made fresh for each run.
+LEVEL_ONE = LevelOne()
+LEVEL_TWO = LevelTwo()
+LEVEL_THREE = LevelThree()
+
+def run(state: object, colx: object, pts: int, index: int) -> object:
+    '''
+    Drives the FSM from state to FinishedState in a single loop.
+
+    Each state's transition() returns the next state instead of calling
+    on_event() on it (or on itself), so stack depth and memory stay
+    flat however many conviction dates the record has.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :param state: the State to start from
+    :param colx: the Charge_Collection Instance
+    :param pts: num of misdemeanor record points
+    :param index: index of convictiondate in colx.cons_bydate
+
+    RETURN:
+    ____________________________________________________________________
+    :return: the FinishedState holding pts and level
+    :rtype: FinishedState
+    '''
+    if instrument.ACTIVE != None:   # see instrument.py
+        return instrument.ACTIVE.run(state, colx, pts, index, FinishedState)
+    while type(state) != FinishedState:
+        state, pts, index = state.transition(colx, pts, index)
+    return state.on_event(colx, pts, index)
 
 # --------- The State Machine:-----------------
 class MisdemeanorRecordMachine:
@@ -0,0 +1,467 @@
+'''
+file    store.py
+author  Keith Helsabeck
+
+This is the file store.py, for keeping Defendants, Crimes and Charges
+(and their scores) in a SQLite database, so records don't have to be
+rebuilt from another source before every scoring run.
+
+RecordStore writes in bulk (executemany, one transaction per call) and
+reads a defendant's whole Charge_Collection back with one query (charges
+JOIN crimes, in the order the charges were stored, which is the order
+the FSMs see them in). The charges table is indexed on defendant and
+disposition_date, and the crimes table on crimeclass.
+
+Scores are kept in a results table. Triggers drop a defendant's stored
+result whenever their charges, their birthdate, or one of their crimes
+changes, so score() only rescores defendants whose records changed.
+
+The store gives each crime its own id. A Crime's id can't be used: each
+CrimeCatalog numbers its crimes from 1, so two imports would give the
+same id to different crimes. A crime is looked up by its unique_id 
+(so a stored crime edited in place is updated), else by its statute, 
+class and description, and inserted if neither is stored. Both keys 
+are UNIQUE. Dates are stored as ISO strings.
+
+USE:
+________________________________________________________________________
+with RecordStore("records.db") as store:
+    store.put_records(load_csv("export.csv"))
+    result = store.score(defendant_id)
+'''
+import sqlite3
+import typing
+import uuid
+from datetime import date
+
+from .batch import BatchResult, as_collection, score_record
+from .charge import Charge
+from .crime import Crime
+from .defendant import Defendant
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS defendants (
+    id INTEGER PRIMARY KEY,
+    unique_id TEXT,
+    firstname TEXT,
+    lastname TEXT,
+    birthdate TEXT
+);
+CREATE TABLE IF NOT EXISTS crimes (
+    id INTEGER PRIMARY KEY,
+    unique_id TEXT,
+    statute TEXT,
+    description TEXT,
+    crimeclass TEXT
+);
+CREATE TABLE IF NOT EXISTS charges (
+    seq INTEGER PRIMARY KEY,
+    defendant_id INTEGER NOT NULL REFERENCES defendants(id),
+    crime_id INTEGER REFERENCES crimes(id),
+    id INTEGER,
+    unique_id TEXT,
+    offense_date TEXT,
+    disposition_date TEXT,
+    convicted INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    defendant_id INTEGER PRIMARY KEY,
+    felony_points INTEGER,
+    felony_level INTEGER,
+    misdemeanor_points INTEGER,
+    misdemeanor_level INTEGER,
+    habeligible INTEGER,
+    date_eligible TEXT
+);
+CREATE INDEX IF NOT EXISTS charges_defendant ON charges(defendant_id);
+CREATE INDEX IF NOT EXISTS charges_disposition ON charges(disposition_date);
+CREATE INDEX IF NOT EXISTS crimes_crimeclass ON crimes(crimeclass);
+CREATE UNIQUE INDEX IF NOT EXISTS crimes_uid ON crimes(unique_id);
+CREATE UNIQUE INDEX IF NOT EXISTS crimes_key
+    ON crimes(statute, crimeclass, description);
+
+CREATE TRIGGER IF NOT EXISTS charges_insert AFTER INSERT ON charges
+BEGIN
+    DELETE FROM results WHERE defendant_id = NEW.defendant_id;
+END;
+CREATE TRIGGER IF NOT EXISTS charges_update AFTER UPDATE ON charges
+BEGIN
+    DELETE FROM results
+    WHERE defendant_id IN (OLD.defendant_id, NEW.defendant_id);
+END;
+CREATE TRIGGER IF NOT EXISTS charges_delete AFTER DELETE ON charges
+BEGIN
+    DELETE FROM results WHERE defendant_id = OLD.defendant_id;
+END;
+CREATE TRIGGER IF NOT EXISTS defendants_update
+AFTER UPDATE OF birthdate ON defendants
+WHEN OLD.birthdate IS NOT NEW.birthdate
+BEGIN
+    DELETE FROM results WHERE defendant_id = NEW.id;
+END;
+CREATE TRIGGER IF NOT EXISTS crimes_update
+AFTER UPDATE OF statute, crimeclass ON crimes
+WHEN OLD.statute IS NOT NEW.statute OR OLD.crimeclass IS NOT NEW.crimeclass
+BEGIN
+    DELETE FROM results WHERE defendant_id IN
+        (SELECT defendant_id FROM charges WHERE crime_id = NEW.id);
+END;
+'''
+
+UPSERT_DEFENDANT = '''
+INSERT INTO defendants (id, unique_id, firstname, lastname, birthdate)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET unique_id = excluded.unique_id,
+    firstname = excluded.firstname, lastname = excluded.lastname,
+    birthdate = excluded.birthdate
+'''
+
+SELECT_CRIME_BY_UID = "SELECT id FROM crimes WHERE unique_id = ?"
+
+SELECT_CRIME_BY_KEY = '''
+SELECT id FROM crimes
+WHERE statute = ? AND crimeclass = ? AND description = ?
+'''
+
+UPDATE_CRIME = '''
+UPDATE crimes SET statute = ?, description = ?, crimeclass = ?
+WHERE id = ? AND (statute, description, crimeclass) IS NOT (?, ?, ?)
+'''
+
+INSERT_CRIME = '''
+INSERT INTO crimes (unique_id, statute, description, crimeclass)
+VALUES (?, ?, ?, ?)
+'''
+
+INSERT_CHARGE = '''
+INSERT INTO charges (defendant_id, crime_id, id, unique_id, offense_date,
+    disposition_date, convicted)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+SELECT_RECORD = '''
+SELECT charges.id, charges.unique_id, charges.offense_date,
+    charges.disposition_date, charges.convicted, crimes.id,
+    crimes.unique_id, crimes.statute, crimes.description, crimes.crimeclass
+FROM charges LEFT JOIN crimes ON crimes.id = charges.crime_id
+WHERE charges.defendant_id = ?
+ORDER BY charges.seq
+'''
+
+def to_text(value: object) -> str:
+    '''Returns a date or UUID as a str for the database (None stays).'''
+    if value == None:
+        return None
+    if type(value) == date:
+        return value.isoformat()
+    return str(value)
+
+def to_date(text: str) -> object:
+    '''Returns the date for an ISO str from the database (or None).'''
+    return None if text == None else date.fromisoformat(text)
+
+def to_uuid(text: str) -> object:
+    '''Returns the UUID for a str from the database (or None).'''
+    return None if text == None else uuid.UUID(text)
+
+class RecordStore:
+    '''
+    RecordStore keeps defendants, crimes, charges and scores in SQLite.
+
+    ATTRIBUTES:
+    ____________________________________________________________________
+    :attr db: the sqlite3 connection
+
+    METHODS:
+    ____________________________________________________________________
+    :method put_defendants: stores (or updates) Defendants
+    :method put_crimes: stores (or updates) Crimes, ret their ids
+    :method put_record: stores a defendant and all of their charges
+    :method put_records: stores many (defendant, charges) pairs
+    :method add_charges: adds charges to a stored defendant's record
+    :method defendant_ids: ret the stored defendants' ids
+    :method load_defendant: ret a stored Defendant (None if not stored)
+    :method load_collection: ret a defendant's Charge_Collection
+    :method load_record: ret a (Defendant, Charge_Collection) pair
+    :method cached_result: ret a stored BatchResult (None if stale)
+    :method save_result: stores a BatchResult
+    :method score: ret the stored result, or scores and stores it
+    :method close: closes the database
+    '''
+    def __init__(self, path: str = ":memory:"):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        '''Closes the database.'''
+        self.db.close()
+
+    def defendant_row(self, defendant: object) -> tuple:
+        '''Helper: a Defendant as a defendants row.'''
+        if type(defendant.id) != int:
+            raise ValueError("A stored defendant needs an int id.")
+        return (defendant.id, to_text(defendant.unique_id),
+            defendant.firstname, defendant.lastname,
+            to_text(defendant.birthdate))
+
+    def crime_id(self, crime: object) -> int:
+        '''
+        Helper: returns the stored id of a crime, storing it if it is
+        new. A crime is found by its unique_id (and its statute, class
+        and description updated if they changed), else by its statute,
+        class and description. Call within a transaction.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crime: a Crime
+
+        RETURN:
+        ________________________________________________________________
+        :return: the crime's id in the crimes table
+        :rtype: int
+        '''
+        uid = to_text(crime.unique_id)
+        fields = (crime.statute, crime.description, crime.crimeclass)
+        row = None
+        if uid != None:
+            row = self.db.execute(SELECT_CRIME_BY_UID, (uid,)).fetchone()
+        if row != None:
+            try:
+                self.db.execute(UPDATE_CRIME, (*fields, row[0], *fields))
+            except sqlite3.IntegrityError:
+                raise ValueError("Another crime with this statute, class "
+                    "and description is stored.")
+            return row[0]
+        row = self.db.execute(SELECT_CRIME_BY_KEY, 
+            (crime.statute, crime.crimeclass, crime.description)).fetchone()
+        if row != None:
+            return row[0]
+        return self.db.execute(INSERT_CRIME, (uid, *fields)).lastrowid
+
+    def crime_ids(self, crimes: typing.Iterable) -> dict:
+        '''Helper: a dict of id(crime) -> stored id for the crimes 
+        (each Crime instance is looked up once).'''
+        ids = {}
+        for crime in crimes:
+            if crime != None and id(crime) not in ids:
+                ids[id(crime)] = self.crime_id(crime)
+        return ids
+
+    def charge_row(self, defendant_id: int, charge: object, 
+        crime_ids: dict) -> tuple:
+        '''Helper: a Charge as a charges row (crime_ids from 
+        crime_ids()).'''
+        crime_id = None if charge.crime == None \
+            else crime_ids[id(charge.crime)]
+        return (defendant_id, crime_id, charge.id,
+            to_text(charge.unique_id), to_text(charge.offense_date),
+            to_text(charge.disposition_date), int(charge.convicted == True))
+
+    def put_defendants(self, defendants: typing.Iterable):
+        '''
+        Stores Defendants, updating any already stored with the same id.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendants: an iterable of Defendants (with int ids)
+        '''
+        with self.db:
+            self.db.executemany(UPSERT_DEFENDANT,
+                [ self.defendant_row(defendant) for defendant in defendants ])
+
+    def put_crimes(self, crimes: typing.Iterable) -> list:
+        '''
+        Stores Crimes, updating any already stored with the same 
+        unique_id (see crime_id).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param crimes: an iterable of Crimes
+
+        RETURN:
+        ________________________________________________________________
+        :return: the crimes' stored ids (in the order given)
+        :rtype: list
+        '''
+        crimes = list(crimes)
+        with self.db:
+            ids = self.crime_ids(crimes)
+        return [ ids[id(crime)] for crime in crimes ]
+
+    def put_records(self, records: typing.Iterable):
+        '''
+        Stores (Defendant, charges) pairs, in one transaction. Each
+        defendant's stored charges are replaced by the charges given
+        (a record stored again unchanged is left alone, so its stored 
+        result stays good).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param records: an iterable of (Defendant, charges) pairs, where
+        charges is a Charge_Collection or an iterable of Charges
+        '''
+        defendants, charges = [], {}
+        for defendant, record in records:
+            row = self.defendant_row(defendant)
+            defendants.append(row)
+            charges[row[0]] = list(getattr(record, "charges", record))
+        with self.db:
+            self.db.executemany(UPSERT_DEFENDANT, defendants)
+            crime_ids = self.crime_ids(charge.crime 
+                for record in charges.values() for charge in record)
+            for defendant_id, record in charges.items():
+                charges[defendant_id] = [ self.charge_row(defendant_id, 
+                    charge, crime_ids) for charge in record ]
+            changed = [ 
+                defendant_id for defendant_id, rows in charges.items() 
+                if self.charge_rows(defendant_id) != rows
+            ]
+            self.db.executemany("DELETE FROM charges WHERE defendant_id = ?",
+                [ (defendant_id,) for defendant_id in changed ])
+            self.db.executemany(INSERT_CHARGE, [ 
+                row for defendant_id in changed for row in charges[defendant_id]
+            ])
+
+    def charge_rows(self, defendant_id: int) -> list:
+        '''Helper: a defendant's stored charges rows, in order.'''
+        return self.db.execute("SELECT defendant_id, crime_id, id, "
+            "unique_id, offense_date, disposition_date, convicted "
+            "FROM charges WHERE defendant_id = ? ORDER BY seq", 
+            (defendant_id,)
+        ).fetchall()
+
+    def put_record(self, defendant: object, charges: object):
+        '''Stores one defendant and their charges (see put_records).'''
+        self.put_records([ (defendant, charges) ])
+
+    def add_charges(self, defendant_id: int, charges: typing.Iterable):
+        '''
+        Adds charges to the end of a stored defendant's record.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the stored defendant's id
+        :param charges: an iterable of Charges
+        '''
+        charges = list(charges)
+        with self.db:
+            crime_ids = self.crime_ids(charge.crime for charge in charges)
+            self.db.executemany(INSERT_CHARGE, [ self.charge_row(
+                defendant_id, charge, crime_ids) for charge in charges ])
+
+    def defendant_ids(self) -> list:
+        '''Returns the ids of the stored defendants, in id order.'''
+        rows = self.db.execute("SELECT id FROM defendants ORDER BY id")
+        return [ row[0] for row in rows ]
+
+    def load_defendant(self, defendant_id: int) -> object:
+        '''
+        Returns the stored Defendant with the id (None if not stored).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the defendant's id
+        '''
+        row = self.db.execute("SELECT id, unique_id, firstname, lastname, "
+            "birthdate FROM defendants WHERE id = ?", (defendant_id,)
+        ).fetchone()
+        if row == None:
+            return None
+        defendant = Defendant.from_fields(row[0], to_uuid(row[1]), row[2],
+            row[3], to_date(row[4]), trusted=True)
+        return defendant
+
+    def load_collection(self, defendant_id: int) -> object:
+        '''
+        Returns a defendant's charges as a Charge_Collection, read with
+        one query. The rows were checked when they were stored, so the
+        objects are made with the trusted constructors.
+        Charges of the same crime share one Crime.
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the defendant's id
+
+        RETURN:
+        ________________________________________________________________
+        :return: the defendant's charges (empty if none are stored)
+        :rtype: Charge_Collection
+        '''
+        crimes, charges = {}, []
+        for row in self.db.execute(SELECT_RECORD, (defendant_id,)):
+            crime = crimes.get(row[5])
+            if crime == None and row[5] != None:
+                crime = Crime.from_row((row[5], to_uuid(row[6]), row[7],
+                    row[8], row[9]), trusted=True)
+                crimes[row[5]] = crime
+            charges.append(Charge.from_fields(row[0], to_uuid(row[1]),
+                to_date(row[2]), crime, to_date(row[3]), bool(row[4]),
+                trusted=True))
+        return as_collection(charges)
+
+    def load_record(self, defendant_id: int) -> tuple:
+        '''Returns a stored (Defendant, Charge_Collection) pair.'''
+        return (self.load_defendant(defendant_id),
+            self.load_collection(defendant_id))
+
+    def cached_result(self, defendant_id: int) -> object:
+        '''
+        Returns the stored BatchResult for a defendant, or None if there
+        is none (never scored, or their record changed since).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the defendant's id
+        '''
+        row = self.db.execute("SELECT defendant_id, felony_points, "
+            "felony_level, misdemeanor_points, misdemeanor_level, "
+            "habeligible, date_eligible FROM results WHERE defendant_id = ?",
+            (defendant_id,)
+        ).fetchone()
+        if row == None:
+            return None
+        habeligible = None if row[5] == None else bool(row[5])
+        return BatchResult(*row[:5], habeligible, to_date(row[6]))
+
+    def save_result(self, result: object):
+        '''
+        Stores a BatchResult (replacing any stored for the defendant).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param result: a BatchResult
+        '''
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO results VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                (*result[:6], to_text(result.date_eligible)))
+
+    def score(self, defendant_id: int) -> object:
+        '''
+        Returns a defendant's scores: the stored result if their record
+        hasn't changed since it was scored, else a new one (which is
+        then stored).
+
+        PARAMETERS:
+        ________________________________________________________________
+        :param defendant_id: the stored defendant's id
+
+        RETURN:
+        ________________________________________________________________
+        :return: the defendant's scores
+        :rtype: BatchResult
+        '''
+        result = self.cached_result(defendant_id)
+        if result == None:
+            defendant, colx = self.load_record(defendant_id)
+            if defendant == None:
+                raise ValueError(f"No defendant {defendant_id} is stored.")
+            result = score_record((defendant, colx))
+            self.save_result(result)
+        return result
@@ -0,0 +1,114 @@
+'''
+file:   test_analyzer.py
+author: Keith Helsabeck
+
+This is the file for testing analyzer (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+
+from src.analyzer import RecordAnalyzer, RecordAnalysis
+from src.collections import Charge_Collection
+from src.crime import Crime
+from src.charge import Charge
+from src.FelonyStatemachine import Felony_RecordMachine
+from src.misdemeanor_machine import MisdemeanorRecordMachine
+from src.habitualmachine import HabitualMachine
+
+STATUTES = [ 
+    "§14-72", "§14-33(c)(2)", "§20-138.1", "§20-28(a1)", "§20-141", 
+    "§90-95(d)(2)", "§14-7.28", "§14-7.36", "§14-33.2", "§14-87",
+]
+
+def random_record(rng: object) -> object:
+    '''
+    Returns a random Charge_Collection: 0-30 convictions of random 
+    classes and statutes, often several on one date.
+    '''
+    colx = Charge_Collection()
+    for n in range(rng.randrange(31)):
+        crime = Crime()
+        crime.statute = rng.choice(STATUTES)
+        crime.crimeclass = rng.choice(Crime.valid_classes)
+        charge = Charge()
+        charge.offense_date = date(1995, 1, 1) + \
+            timedelta(days=rng.randrange(10000))
+        charge.disposition_date = charge.offense_date + \
+            timedelta(days=rng.choice([0, 30, 90, 400]))
+        charge.crime = crime
+        charge.convicted = True
+        colx.add_charge(charge)
+    return colx
+
+def test_matches_machines():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This runs random records through the three FSMs and through 
+    RecordAnalyzer, and confirms they give the same results.
+    '''
+    rng = random.Random(22)
+    analyzer = RecordAnalyzer()
+    for n in range(400):
+        colx = random_record(rng)
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        analysis = analyzer.analyze(colx, birthdate)
+        felofsm = Felony_RecordMachine()
+        felofsm.on_event(colx)
+        misdfsm = MisdemeanorRecordMachine(colx)
+        habfsm = HabitualMachine(colx, birthdate)
+        assert felofsm.points == analysis.felony_points
+        assert felofsm.level == analysis.felony_level
+        assert misdfsm.points == analysis.misdemeanor_points
+        assert misdfsm.level == analysis.misdemeanor_level
+        assert habfsm.habeligible == analysis.habeligible
+        assert habfsm.date_eligible == analysis.date_eligible
+        assert habfsm.state.dumbwaiter.habcons == analysis.habcons
+        assert len(colx.cons_bydate) == analysis.dates
+
+def test_no_birthdate(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests a record analyzed without a birthdate (no habitual).'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    colx.add_charge(ch5_larcH_2pt)
+    analysis = RecordAnalyzer().analyze(colx)
+    assert 3 == analysis.felony_points
+    assert 2 == analysis.felony_level
+    assert 2 == analysis.misdemeanor_points
+    assert 2 == analysis.misdemeanor_level
+    assert None == analysis.habeligible
+    assert None == analysis.date_eligible
+    assert [] == analysis.habcons
+    assert False == analysis.date_iseligible(date(2030, 1, 1))
+
+def test_dismissed(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a charge disposed without a conviction (eg: 
+    dismissed) is not counted, by the analyzer or the FSMs.'''
+    dismissed = Charge()
+    dismissed.crime = ch5_larcH_2pt.crime
+    dismissed.offense_date = date(2016, 1, 1)
+    dismissed.disposition_date = date(2016, 6, 1)
+    colx = Charge_Collection()
+    for charge in (ch1_larc1, dismissed, ch5_larcH_2pt):
+        colx.add_charge(charge)
+    analysis = RecordAnalyzer().analyze(colx, date(1983, 8, 24))
+    assert 3 == analysis.felony_points
+    assert 2 == analysis.misdemeanor_points
+    felofsm = Felony_RecordMachine()
+    felofsm.on_event(colx)
+    assert 3 == felofsm.points
+    assert 2 == MisdemeanorRecordMachine(colx).points
+    assert False == HabitualMachine(colx, date(1983, 8, 24)).habeligible
+
+def test_empty():
+    '''This tests an empty record.'''
+    analysis = RecordAnalyzer().analyze(Charge_Collection(), 
+        date(1983, 8, 24))
+    assert 1 == analysis.felony_level
+    assert 1 == analysis.misdemeanor_level
+    assert False == analysis.habeligible
+    assert True == analysis.dumbwaiter.has_run
@@ -0,0 +1,158 @@
+'''
+file:   test_archive.py
+author: Keith Helsabeck
+
+This is the file for testing archive (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+import uuid
+
+from src.analyzer import RecordAnalyzer
+from src.archive import Archive, write_archive
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.columnar import ColumnarCharges, score
+from src.defendant import Defendant
+from src.lazy import LazyChargeCollection
+from test.test_analyzer import random_record
+
+SCORE_FIELDS = ("defendant_ids", "felony_points", "felony_level", 
+    "misdemeanor_points", "misdemeanor_level", "strikes", "habeligible",
+    "date_eligible")
+
+def random_records(count: int) -> list:
+    '''Returns count random (Defendant, Charge_Collection) pairs.'''
+    rng = random.Random(22)
+    records = []
+    for n in range(count):
+        defendant = Defendant.from_fields(100 + n, uuid.uuid4(), "John", 
+            f"Doe{n}", date(1975 + rng.randrange(10), 1 + rng.randrange(12),
+            1 + rng.randrange(28)))
+        colx = random_record(rng)
+        for number, charge in enumerate(colx.charges):
+            charge.id, charge.unique_id = number, uuid.uuid4()
+        records.append((defendant, colx))
+    return records
+
+def results(scores: object) -> list:
+    '''Returns a ColumnarScores' results as lists.'''
+    return [ list(getattr(scores, name)) for name in SCORE_FIELDS ]
+
+@pytest.fixture
+def archived(tmp_path: object) -> tuple:
+    '''An archive of random records: (records, the archive's path).'''
+    records = random_records(60)
+    path = str(tmp_path / "records.ctar")
+    assert 60 == write_archive(path, records)
+    return records, path
+
+def test_round_trip(archived: tuple):
+    '''
+    This tests that the archive gives back the same defendants and 
+    charges (in order), with each crime made once and shared.
+    '''
+    records, path = archived
+    with Archive(path) as archive:
+        assert 60 == len(archive)
+        for index, (defendant, colx) in enumerate(archive.records()):
+            before, charges = records[index]
+            assert [ getattr(defendant, name) for name in Defendant.FIELDS 
+                ] == [ getattr(before, name) for name in Defendant.FIELDS ]
+            assert len(charges.charges) == len(colx.charges)
+            for charge, after in zip(charges.charges, colx.charges):
+                assert [ getattr(charge, name) for name in Charge.FIELDS 
+                    if name != "crime" ] == [ getattr(after, name) 
+                    for name in Charge.FIELDS if name != "crime" ]
+                assert charge.crime.statute == after.crime.statute
+                assert charge.crime.crimeclass == after.crime.crimeclass
+        assert archive.load_crime(0) is archive.load_crime(0)
+        assert 7 == archive.find(107)
+        with pytest.raises(ValueError):
+            archive.find(99)
+
+def test_scores(archived: tuple):
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This scores the archive (all of it, and one defendant at a time) 
+    with columnar.score(), and the records it gives back with 
+    RecordAnalyzer, and confirms it all matches the records as written.
+    '''
+    records, path = archived
+    expected = results(score(ColumnarCharges.from_records(records)))
+    analyzer = RecordAnalyzer()
+    with Archive(path) as archive:
+        view = archive.view()
+        assert expected == results(score(view))
+        view.release()
+        for index in range(len(archive)):
+            view = archive.view(index, index + 1)
+            assert [ [ column[index] ] for column in expected ] == \
+                results(score(view))
+            view.release()
+            defendant, colx = archive.load_record(index)
+            analysis = analyzer.analyze(colx, defendant.birthdate)
+            assert expected[1][index] == analysis.felony_points
+            assert expected[3][index] == analysis.misdemeanor_points
+            assert expected[6][index] == analysis.habeligible
+        view = archive.view(10, 20)
+        assert [ column[10:20] for column in expected ] == \
+            results(score(view))
+        assert 10 == view.first and 10 == view.defendants
+        view.release()
+
+def test_lazy(archived: tuple):
+    '''
+    This tests the lazy collections from an archive: they analyze the 
+    same as the eager ones, make only the charges asked for, and make 
+    the same Charges.
+    '''
+    records, path = archived
+    analyzer = RecordAnalyzer()
+    with Archive(path) as archive:
+        for index, ((defendant, colx), (same, lazy)) in enumerate(zip(
+            archive.records(), archive.records(lazy=True))):
+            assert type(lazy) == LazyChargeCollection
+            expected = analyzer.analyze(colx, defendant.birthdate)
+            analysis = analyzer.analyze(lazy, defendant.birthdate)
+            assert (expected.felony_points, expected.misdemeanor_points, 
+                expected.habeligible, expected.date_eligible) == \
+                (analysis.felony_points, analysis.misdemeanor_points, 
+                analysis.habeligible, analysis.date_eligible)
+            assert sum(charge != None for charge in lazy.made) <= \
+                len(colx.charges)
+            assert [ (charge.id, charge.unique_id, charge.offense_date,
+                charge.disposition_date) for charge in lazy.charges ] == \
+                [ (charge.id, charge.unique_id, charge.offense_date,
+                charge.disposition_date) 
+                for charge in archive.load_charges(index) ]
+
+def test_close(archived: tuple):
+    '''This tests that close() waits for the views to be released.'''
+    records, path = archived
+    archive = Archive(path)
+    view = archive.view(0, 5)
+    with pytest.raises(BufferError):
+        archive.close()
+    view.release()
+    archive.close()
+
+def test_errors(tmp_path: object, archived: tuple):
+    '''This tests the ValueErrors for bad files, ranges and records.'''
+    records, path = archived
+    with open(path, "rb") as file:
+        data = file.read()
+    bad = tmp_path / "bad.ctar"
+    for contents in (b"", b"CTAR", b"XXXX" + data[4:], data[:len(data) // 2]):
+        bad.write_bytes(contents)
+        with pytest.raises(ValueError):
+            Archive(str(bad))
+    with Archive(path) as archive:
+        with pytest.raises(ValueError):
+            archive.view(5, 61)
+    with pytest.raises(ValueError):
+        write_archive(str(bad), [ (Defendant(), Charge_Collection()) ])
@@ -0,0 +1,64 @@
+'''
+file:   test_asof.py
+author: Keith Helsabeck
+
+This is the file for testing asof (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+
+from src.analyzer import RecordAnalyzer
+from src.asof import AsOfIndex
+from src.collections import Charge_Collection
+from test.test_analyzer import random_record
+
+def upto(colx: object, dt: object) -> object:
+    '''Returns a copy of colx with only the convictions up to dt.'''
+    copy = Charge_Collection()
+    copy.add_charges([ charge for charge in colx.charges 
+        if charge.disposition_date != None and charge.disposition_date <= dt ])
+    return copy
+
+def test_matches_rerun():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This confirms that the index as of a date gives the same records as
+    rerunning the analysis over only the convictions up to that date.
+    '''
+    rng = random.Random(17)
+    analyzer = RecordAnalyzer()
+    for n in range(60):
+        colx = random_record(rng)
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        index = AsOfIndex(colx, birthdate)
+        probes = [ date(1994, 1, 1), date(2030, 1, 1) ] + index.dates + [ 
+            date(1995, 1, 1) + timedelta(days=rng.randrange(11000)) 
+            for m in range(5) ]
+        for dt in probes:
+            analysis = analyzer.analyze(upto(colx, dt), birthdate)
+            asof = index.as_of(dt)
+            assert analysis.felony_points == asof.felony_points
+            assert analysis.felony_level == asof.felony_level
+            assert analysis.misdemeanor_points == asof.misdemeanor_points
+            assert analysis.misdemeanor_level == asof.misdemeanor_level
+            assert len(analysis.habcons) == asof.strikes
+            assert analysis.habeligible == asof.habeligible
+            assert analysis.date_eligible == asof.date_eligible
+
+def test_before(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that before() leaves out convictions on the date.'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    colx.add_charge(ch5_larcH_2pt)
+    index = AsOfIndex(colx)
+    last = max(index.dates)
+    assert 3 == index.as_of(last).felony_points
+    assert index.before(last).felony_points < 3
+    assert None == index.as_of(last).habeligible
+    assert 0 == index.before(date(1900, 1, 1)).felony_points
+    assert 1 == index.before(date(1900, 1, 1)).felony_level
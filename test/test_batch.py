@@ -0,0 +1,65 @@
+'''
+file:   test_batch.py
+author: Keith Helsabeck
+
+This is the file for testing batch (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.batch import BatchResult, score_batch, score_record
+from src.collections import Charge_Collection
+from src.defendant import Defendant
+
+def make_defendant(id: int, birthdate: object) -> object:
+    '''Returns a Defendant with an id and a birthdate.'''
+    defendant = Defendant()
+    defendant.set_id(id)
+    if birthdate != None:
+        defendant.set_birthdate(birthdate)
+    return defendant
+
+@pytest.fixture
+def records(ch1_larc1: object, ch5_larcH_2pt: object, charge_robD: object,
+    charge_murd2_B2: object, ch_infraction: object) -> list:
+    '''
+    A few (defendant, charges) records: one habitual with 3 sequential 
+    felonies, one with 2 misdemeanor dates, one with no convictions, 
+    and one with no birthdate.
+    '''
+    return [
+        (make_defendant(1, date(1983, 8, 24)), 
+            [ch5_larcH_2pt, charge_robD, charge_murd2_B2]),
+        (make_defendant(2, date(1983, 8, 24)), [ch1_larc1, ch_infraction]),
+        (make_defendant(3, date(1983, 8, 24)), Charge_Collection()),
+        (make_defendant(4, None), [ch1_larc1]),
+    ]
+
+def test_score_record(records: list):
+    '''This tests the scores for single records.'''
+    assert BatchResult(1, 14, 5, 3, 2, True, date(2017, 2, 3)) == \
+        score_record(records[0])
+    assert BatchResult(2, 1, 1, 0, 1, False, None) == \
+        score_record(records[1])
+    assert BatchResult(3, 0, 1, 0, 1, False, None) == \
+        score_record(records[2])
+    assert BatchResult(4, 1, 1, 1, 2, None, None) == \
+        score_record(records[3])
+
+def test_score_batch(records: list):
+    '''This tests that the pool gives the same results as scoring one 
+    at a time, in the same order.'''
+    expected = [ score_record(record) for record in records ]
+    assert expected == list(score_batch(records, workers=1))
+    assert expected == list(score_batch(records, workers=2, chunksize=1))
+    assert expected == list(score_batch(iter(records * 5), workers=2, 
+        chunksize=3, inflight=1))[:4]
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        for n in range(3):
+            assert expected == list(score_batch(records, workers=2, 
+                pool=pool))
+    with pytest.raises(ValueError):
+        list(score_batch(records, workers=0))
@@ -0,0 +1,77 @@
+'''
+file:   test_catalog.py
+author: Keith Helsabeck
+
+This is the file for testing catalog (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+import uuid
+
+from src.crime import Crime, CrimeClass
+from src.catalog import CrimeCatalog, CrimeFlags, statute_prefixes
+
+def test_intern():
+    '''This tests that interning the same data gives the same Crime.'''
+    catalog = CrimeCatalog()
+    larceny = catalog.intern("§14-72", "Class H Felony", "Felony Larceny")
+    again = catalog.intern("§14-72", CrimeClass.CLASS_H_FELONY, 
+        "Felony Larceny")
+    misd = catalog.intern("§14-72", "Class 1 Misdemeanor", "Larceny")
+    assert larceny is again
+    assert larceny is not misd
+    assert 2 == len(catalog)
+    assert 1 == larceny.id
+    assert type(uuid.uuid4()) == type(larceny.unique_id)
+    assert larceny in catalog
+    with pytest.raises(ValueError, match="crimeclass invalid."):
+        catalog.intern("§14-72", "Class Z Felony", "Larceny")
+
+def test_add(crime_larc_classH: object):
+    '''This tests interning existing Crime objects.'''
+    catalog = CrimeCatalog()
+    assert crime_larc_classH is catalog.add(crime_larc_classH)
+    twin = Crime()
+    twin.statute = "§14-72"
+    twin.description = "Felony Larceny"
+    twin.crimeclass = "Class H Felony"
+    assert crime_larc_classH is catalog.add(twin)
+    assert 1 == len(catalog)
+    with pytest.raises(ValueError):
+        catalog.add(Crime())    # no class
+
+def test_lookups():
+    '''This tests the lookups by statute prefix and by class.'''
+    catalog = CrimeCatalog()
+    larceny = catalog.intern("§14-72", "Class H Felony", "Felony Larceny")
+    assault = catalog.intern("§14-33(c)(2)", "Class A1 Misdemeanor", 
+        "Assault on a Female")
+    dwi = catalog.intern("§20-138.1", "Class 1 Misdemeanor", "DWI")
+    assert [larceny, assault] == catalog.by_statute("14")
+    assert [larceny] == catalog.by_statute("§14-72")
+    assert [assault] == catalog.by_statute("14-33(c)")
+    assert [dwi] == catalog.by_statute("NCGS 20-138.1")
+    assert [dwi] == catalog.by_statute("20-138")
+    assert [] == catalog.by_statute("14-7")
+    assert [larceny] == catalog.by_class("Class H Felony")
+    assert [dwi] == catalog.by_class(CrimeClass.CLASS_1_MISDEMEANOR)
+    assert [] == catalog.by_class("Class A Felony")
+    assert ["14", "14-33", "14-33(c)", "14-33(c)(2)"] == \
+        statute_prefixes("§14-33(c)(2)")
+
+def test_flags(crime_larc_classH: object, crime_larceny1: object, 
+    crime_speeding: object, crime_edge1: object, cr_disqualified1: object):
+    '''This tests the precomputed flags against the FSMs' rules.'''
+    catalog = CrimeCatalog()
+    for crime in (crime_larc_classH, crime_larceny1, crime_speeding, 
+        crime_edge1, cr_disqualified1):
+        catalog.add(crime)
+    assert CrimeFlags(True, 2, True) == catalog.flags(crime_larc_classH)
+    assert CrimeFlags(False, 1, True) == catalog.flags(crime_larceny1)
+    assert CrimeFlags(False, 0, False) == catalog.flags(crime_speeding)
+    assert CrimeFlags(False, 1, True) == catalog.flags(crime_edge1)
+    assert False == catalog.flags(cr_disqualified1).habitual
+    with pytest.raises(ValueError):
+        catalog.flags(Crime())
@@ -91,4 +91,54 @@ def test_invalid_crime():
             "purple polkadots"
         )
     exception_raised = exc_info.value
-    assert ValueError == type(exception_raised)
\ No newline at end of file
+    assert ValueError == type(exception_raised)
+
+def test_slots():
+    '''This tests that a Charge has no per-instance __dict__ and still
+    pickles with all of its data.'''
+    import pickle
+    charge = Charge()
+    assert False == hasattr(charge, "__dict__")
+    with pytest.raises(AttributeError):
+        charge.not_a_field = 1
+    charge.set_id(1)
+    charge.set_offensedate(date(2001, 1, 1))
+    charge.convicted = True
+    clone = pickle.loads(pickle.dumps(charge))
+    assert 1 == clone.id
+    assert date(2001, 1, 1) == clone.offense_date
+    assert True == clone.convicted
+
+def test_from_fields():
+    '''This tests making a charge from its fields, checked and trusted.'''
+    crime = Crime()
+    uid = uuid.uuid4()
+    charge = Charge.from_fields(1, uid, date(2010, 1, 1), crime, 
+        date(2010, 2, 2), True)
+    assert (1, uid, date(2010, 1, 1), crime, date(2010, 2, 2), True) == \
+        tuple(getattr(charge, field) for field in Charge.FIELDS)
+    assert None == Charge.from_fields().offense_date
+    with pytest.raises(ValueError, match='A date must be a datetime.date.'):
+        Charge.from_fields(offense_date="purple polkadots")
+    with pytest.raises(ValueError, match='convicted must be a bool.'):
+        Charge.from_fields(convicted="yes")
+    trusted = Charge.from_fields(offense_date="unchecked", trusted=True)
+    assert "unchecked" == trusted.offense_date
+
+def test_from_rows():
+    '''This tests making a batch of charges, and the row of a bad one.'''
+    crime = Crime()
+    rows = [ 
+        (n, uuid.uuid4(), date(2010, 1, 1), crime, None, False) 
+        for n in range(5) 
+    ]
+    charges = Charge.from_rows(rows)
+    assert [0, 1, 2, 3, 4] == [ charge.id for charge in charges ]
+    assert crime == charges[4].crime
+    rows[3] = (3, "not a uuid", None, crime, None, False)
+    with pytest.raises(ValueError, match='row 4: A unique_id must be'):
+        Charge.from_rows(rows)
+    assert "not a uuid" == Charge.from_rows(rows, trusted=True)[3].unique_id
+    with pytest.raises(ValueError, match='row 1: a row must have 6 fields.'):
+        Charge.from_rows([(1, 2)])
+    assert [] == Charge.from_rows([])
@@ -0,0 +1,165 @@
+'''
+file:   test_codec.py
+author: Keith Helsabeck
+
+This is the file for testing codec (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import pickle
+import random
+import typing
+import uuid
+
+from src import codec
+from src.analyzer import RecordAnalyzer
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.crime import Crime, CrimeClass
+from src.defendant import Defendant
+from test.test_analyzer import random_record
+
+CRIME_FIELDS = ("id", "unique_id", "statute", "description", "crimeclass",
+    "classrank", "hab_qualified", "felpoint_eligible", "felony_points", 
+    "misd_qualified")
+
+ANALYSIS_FIELDS = ("felony_points", "felony_level", "misdemeanor_points",
+    "misdemeanor_level", "habeligible", "date_eligible", "dates")
+
+def fields(obj: object, names: tuple) -> tuple:
+    '''Returns obj's values for the names.'''
+    return tuple(getattr(obj, name) for name in names)
+
+def same_charge(before: object, after: object) -> bool:
+    '''True if two charges (and their crimes) hold the same values.'''
+    names = ("id", "unique_id", "offense_date", "disposition_date", 
+        "convicted")
+    if fields(before, names) != fields(after, names):
+        return False
+    if before.crime == None or after.crime == None:
+        return before.crime == after.crime
+    return fields(before.crime, CRIME_FIELDS) == \
+        fields(after.crime, CRIME_FIELDS)
+
+def test_defendant():
+    '''This tests a Defendant round trip, with and without its fields.'''
+    defendant = Defendant.from_fields(7, uuid.uuid4(), "Jöhn", "Doe",
+        date(1980, 2, 29))
+    after = codec.loads(codec.dumps(defendant))
+    assert type(after) == Defendant
+    assert fields(after, Defendant.FIELDS) == \
+        fields(defendant, Defendant.FIELDS)
+    empty = codec.decode_defendant(codec.encode_defendant(Defendant()))
+    assert fields(empty, Defendant.FIELDS) == (None, None, "", "", None)
+
+def test_crime(crime_meth_classI: object):
+    '''
+    This tests a Crime round trip: its class comes back as the same 
+    string (and the flags are worked out again), and a class that isn't
+    a CrimeClass is kept as it was.
+    '''
+    crime = Crime.from_row((-3, uuid.uuid4(), "§14-7.28", "Habitual B&E",
+        "Class E Felony"))
+    after = codec.loads(codec.dumps(crime))
+    assert fields(after, CRIME_FIELDS) == fields(crime, CRIME_FIELDS)
+    assert CrimeClass.CLASS_E_FELONY == after.classrank
+    assert False == after.hab_qualified
+    after = codec.decode_crime(codec.encode_crime(crime_meth_classI))
+    assert fields(after, CRIME_FIELDS) == \
+        fields(crime_meth_classI, CRIME_FIELDS)
+    new = codec.decode_crime(codec.encode_crime(Crime()))
+    assert fields(new, CRIME_FIELDS) == fields(Crime(), CRIME_FIELDS)
+
+def test_charge(ch1_larc1: object):
+    '''This tests a Charge round trip, with its crime and without (and
+    with bytes after it).'''
+    after = codec.loads(codec.dumps(ch1_larc1))
+    assert type(after) == Charge
+    assert same_charge(ch1_larc1, after)
+    trailing = codec.decode_charge(codec.dumps(ch1_larc1) + bytes(3))
+    assert same_charge(ch1_larc1, trailing)
+    charge = Charge.from_fields(id=1, convicted=False)
+    after = codec.decode_charge(codec.encode_charge(charge))
+    assert same_charge(charge, after)
+    assert None == after.crime and None == after.offense_date
+
+def test_collection(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''
+    This tests a Charge_Collection round trip: same charges in the same
+    order, a shared crime stored once and still shared, and the 
+    grouping rebuilt.
+    '''
+    crime = ch1_larc1.crime
+    colx = Charge_Collection()
+    colx.add_charges([ ch5_larcH_2pt, ch1_larc1, Charge.from_fields(
+        2, uuid.uuid4(), date(2001, 1, 1), crime, date(2001, 2, 1), True) ])
+    data = codec.encode_collection(colx)
+    assert 2 == data.count(codec.pack_crime(crime)) + \
+        data.count(codec.pack_crime(ch5_larcH_2pt.crime))
+    after = codec.loads(data)
+    assert type(after) == Charge_Collection
+    assert 3 == len(after.charges)
+    for before, charge in zip(colx.charges, after.charges):
+        assert same_charge(before, charge)
+    assert after.charges[1].crime is after.charges[2].crime
+    assert len(colx.cons_bydate) == len(after.cons_bydate)
+    assert 0 == len(codec.decode_collection(
+        codec.encode_collection(Charge_Collection())).charges)
+
+def test_random_records():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This round-trips random records and confirms they analyze the same,
+    and that they encode smaller than a pickle of their charges.
+    '''
+    rng = random.Random(22)
+    analyzer = RecordAnalyzer()
+    for n in range(200):
+        colx = random_record(rng)
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        data = codec.dumps(colx)
+        after = codec.loads(data)
+        assert all(map(same_charge, colx.charges, after.charges))
+        results = [ analyzer.analyze(record, birthdate) 
+            for record in (colx, after) ]
+        assert [ fields(analysis, ANALYSIS_FIELDS) 
+            for analysis in results ] == \
+            [ fields(results[0], ANALYSIS_FIELDS) ] * 2
+        assert [ [ charge.disposition_date for charge in analysis.habcons ]
+            for analysis in results ] == [ [ charge.disposition_date 
+            for charge in results[0].habcons ] ] * 2
+        if colx.charges != []:
+            assert len(data) < len(pickle.dumps(colx.charges, 
+                pickle.HIGHEST_PROTOCOL))
+
+def test_errors(ch1_larc1: object):
+    '''This tests the ValueErrors for data or objects it can't handle.'''
+    data = codec.dumps(ch1_larc1)
+    with pytest.raises(ValueError):
+        codec.decode_crime(data)                # the wrong kind
+    with pytest.raises(ValueError):
+        codec.loads(b"XX22" + data[4:])
+    with pytest.raises(ValueError):
+        codec.loads(b"CT2")
+    with pytest.raises(ValueError):
+        codec.loads(codec.encode_collection([ ch1_larc1 ])[:-5])
+    with pytest.raises(ValueError):
+        codec.dumps([ ch1_larc1 ])
+    crime = Crime()
+    crime.description = "x" * 70000
+    with pytest.raises(ValueError):
+        codec.dumps(crime)
+    data = codec.encode_crime(ch1_larc1.crime)
+    at = codec.HEADER.size + codec.IDENTITY.size     # the class byte
+    with pytest.raises(ValueError, match="bad class"):
+        codec.loads(data[:at] + bytes([ 200 ]) + data[at + 1:])
+    with pytest.raises(ValueError, match="cut short"):
+        codec.loads(data[:-3])
+    crime = Crime.from_row((2 ** 63, None, "§14-72", "", "Class H Felony"))
+    with pytest.raises(ValueError, match="fits in 64 bits"):
+        codec.dumps(crime)
+    with pytest.raises(ValueError, match="fits in 64 bits"):
+        codec.dumps(Charge.from_fields(id=-2 ** 64))
@@ -119,4 +119,145 @@ def test_groupy_conviction(charge1: object, charge2: object):
     collection.add_charge(charge2)
     collection.groupby_convictiondate()
     assert [charge2] == collection.cons_bydate[0].convictions[3]
-    assert [charge1] == collection.cons_bydate[1].convictions[2]
\ No newline at end of file
+    assert [charge1] == collection.cons_bydate[1].convictions[2]
+
+def test_groupby_samedate(charge1: object, charge2: object):
+    '''Tests that charges sharing a conviction date land in a single
+    convictiondate and that cons_bydate follows unique_dates.'''
+    collection = Charge_Collection()
+    collection.add_charge(charge1)
+    collection.add_charge(charge2)
+    collection.add_charge(charge1)
+    collection.groupby_convictiondate()
+    assert [date(2002,2,2), date(2010,1,1)] == collection.unique_dates
+    assert collection.unique_dates == \
+        [ cd.disposition_date for cd in collection.cons_bydate ]
+    assert [charge1, charge1] == collection.cons_bydate[1].convictions[2]
+
+def test_grouping_kept_on_add(charge1: object, charge2: object):
+    '''Tests that add_charge files charges by date as they are added, 
+    in date order, without a call to groupby_convictiondate.'''
+    collection = Charge_Collection()
+    collection.add_charge(charge1)
+    collection.add_charge(charge2)
+    assert [date(2002,2,2), date(2010,1,1)] == collection.unique_dates
+    assert [charge2] == collection.cons_bydate[0].convictions[3]
+    assert [charge1] == collection.cons_bydate[1].convictions[2]
+    assert [charge1, charge2] == collection.charges  # order untouched
+    cons_bydate = collection.cons_bydate
+    version = collection.version
+    collection.groupby_convictiondate()     # nothing changed
+    assert cons_bydate is collection.cons_bydate
+    assert version == collection.version
+
+def test_grouping_kept_on_remove(charge1: object, charge2: object):
+    '''Tests that remove_charge takes charges out of their conviction 
+    dates, and drops a date once it has no charges left.'''
+    collection = Charge_Collection()
+    collection.add_charge(charge1)
+    collection.add_charge(charge2)
+    collection.add_charge(charge1)
+    version = collection.version
+    collection.remove_charge(0)
+    assert version < collection.version
+    assert [charge1] == collection.cons_bydate[1].convictions[2]
+    collection.remove_charge(1)
+    assert [date(2002,2,2)] == collection.unique_dates
+    assert 1 == len(collection.cons_bydate)
+    collection.remove_charge(0)
+    assert [] == collection.unique_dates
+    assert [] == collection.cons_bydate
+
+def test_grouping_sees_edits(crime_larc_classH: object):
+    '''Tests that a charge edited in place after it was added (pending,
+    then disposed and convicted) is found when the collection is next 
+    grouped, with no call to mark_changed, and scored by the FSMs.'''
+    from src.FelonyStatemachine import Felony_RecordMachine
+    charge = Charge()
+    charge.set_offensedate(date(2009,1,1))
+    charge.set_crime(crime_larc_classH)
+    collection = Charge_Collection()
+    collection.add_charge(charge)
+    collection.groupby_convictiondate()
+    assert [] == collection.cons_bydate
+    version = collection.version
+    charge.set_dispositiondate(date(2010,1,1))
+    charge.convicted = True
+    collection.groupby_convictiondate()
+    assert version < collection.version
+    assert [date(2010,1,1)] == collection.unique_dates
+    assert (charge,) == collection.cons_bydate[0].highest()
+    felofsm = Felony_RecordMachine()
+    felofsm.on_event(collection)
+    assert 2 == felofsm.points
+    collection.charges.append(charge)   # (changed directly)
+    assert True == collection.check_charges()
+    collection.remove_charge(1)
+    collection.groupby_convictiondate()
+    charge.set_dispositiondate(date(2011,1,1))
+    collection.remove_charge(0)     # (edited, then removed)
+    collection.groupby_convictiondate()
+    assert [] == collection.unique_dates
+
+def test_grouping_sees_crime_edits(charge_methI: object,
+    ch5_larcH_2pt: object):
+    '''Tests that a shared Crime edited in place (its class) is found
+    when the collection is next grouped, with no call to mark_changed,
+    and scored as a full regroup would score it.'''
+    from src.FelonyStatemachine import Felony_RecordMachine
+    charge_methI.crime = Crime.from_row((None, None, "§90-95(d)(2)", 
+        "Possession of Meth", "Class I Felony"))     # (not the fixture's)
+    collection = Charge_Collection()
+    collection.add_charge(charge_methI)
+    collection.groupby_convictiondate()
+    version = collection.version
+    charge_methI.crime.set_crimeclass("Class C Felony")
+    ch5_larcH_2pt.disposition_date = charge_methI.disposition_date
+    collection.add_charge(ch5_larcH_2pt)
+    assert True == collection.check_charges()
+    collection.groupby_convictiondate()
+    assert version < collection.version
+    assert (charge_methI,) == collection.cons_bydate[0].highest()
+    felofsm = Felony_RecordMachine()
+    felofsm.on_event(collection)
+    assert 6 == felofsm.points
+    charge_methI.crime.set_statute("§90-95(a)(1)")
+    assert True == collection.check_charges()
+
+def test_grouping_rebuilt(charge1: object, charge2: object):
+    '''Tests that add_charges and mark_changed make the next grouping 
+    start over, that a disposed charge with no conviction is left out 
+    of the grouping, and that a conviction with no valid crime still 
+    raises when the collection is grouped.'''
+    collection = Charge_Collection()
+    collection.add_charges([charge1, charge2])
+    assert True == collection.dirty
+    collection.groupby_convictiondate()
+    assert False == collection.dirty
+    assert [charge2] == collection.cons_bydate[0].convictions[3]
+    charge1.set_dispositiondate(date(2000, 1, 1))
+    collection.mark_changed()
+    collection.groupby_convictiondate()
+    assert [date(2000,1,1), date(2002,2,2)] == collection.unique_dates
+    dismissed = Charge()
+    dismissed.set_crime(charge2.crime)
+    dismissed.set_dispositiondate(date(2003,3,3))
+    collection.add_charge(dismissed)        # (convicted False)
+    assert [date(2000,1,1), date(2002,2,2)] == collection.unique_dates
+    collection.mark_changed()
+    collection.groupby_convictiondate()
+    assert [date(2000,1,1), date(2002,2,2)] == collection.unique_dates
+    assert 3 == len(collection.charges)
+    collection.remove_charge(2)
+    assert False == collection.dirty
+    nocrime = Charge()
+    nocrime.set_dispositiondate(date(2003,3,3))
+    nocrime.convicted = True
+    collection.add_charge(nocrime)
+    with pytest.raises(ValueError) as exc_info:
+        collection.groupby_convictiondate()
+    exception_raised = exc_info.value
+    assert ValueError == type(exception_raised)
+    with pytest.raises(ValueError, \
+        match="Only valid Charge objects may be added.") as exc_info:
+        collection.add_charges([42])  #wrong type
@@ -0,0 +1,125 @@
+'''
+file:   test_columnar.py
+author: Keith Helsabeck
+
+This is the file for testing columnar (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+
+from src.columnar import ColumnarCharges, CONVICTED, MISD_QUALIFIED, \
+    date_groups, score
+from src.collections import Charge_Collection
+from src.defendant import Defendant
+from src.FelonyStatemachine import Felony_RecordMachine
+from src.habitualmachine import HabitualMachine
+from src.misdemeanor_machine import MisdemeanorRecordMachine
+from test.test_analyzer import random_record
+
+def make_defendant(id: int, birthdate: object = None) -> object:
+    '''Returns a Defendant with the id (and birthdate, if given).'''
+    defendant = Defendant()
+    defendant.set_id(id)
+    if birthdate != None:
+        defendant.set_birthdate(birthdate)
+    return defendant
+
+def test_columns(ch1_larc1: object, ch_infraction: object):
+    '''This tests the columns made for a record.'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    colx.add_charge(ch_infraction)
+    store = ColumnarCharges()
+    assert 0 == store.add_record(make_defendant(7), colx)
+    assert 2 == len(store)
+    assert 1 == store.defendants
+    assert [7] == store.defendant_ids
+    assert ch1_larc1.disposition_date.toordinal() == store.disposition[0]
+    assert ch1_larc1.crime.classrank == store.rank[0]
+    assert store.flags[0] & CONVICTED
+    assert store.flags[0] & MISD_QUALIFIED
+    assert 0 == store.flags[1] & MISD_QUALIFIED
+
+def test_matches_machines():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This scores random records both ways and confirms the columnar 
+    scores match the FSMs for every defendant.
+    '''
+    rng = random.Random(13)
+    records = []
+    for n in range(300):
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        records.append((make_defendant(n, birthdate), random_record(rng)))
+    records.append((make_defendant(300, date(1980, 1, 1)), 
+        Charge_Collection()))
+    scores = score(ColumnarCharges.from_records(records))
+    assert len(records) == len(scores)
+    for index, (defendant, colx) in enumerate(records):
+        felofsm = Felony_RecordMachine()
+        felofsm.on_event(colx)
+        misdfsm = MisdemeanorRecordMachine(colx)
+        assert defendant.id == scores.defendant_ids[index]
+        assert felofsm.points == scores.felony_points[index]
+        assert felofsm.level == scores.felony_level[index]
+        assert misdfsm.points == scores.misdemeanor_points[index]
+        assert misdfsm.level == scores.misdemeanor_level[index]
+        habfsm = HabitualMachine(colx, defendant.birthdate)
+        habcons = habfsm.state.dumbwaiter.habcons
+        assert len(habcons) == scores.strikes[index]
+        assert habfsm.habeligible == scores.habeligible[index]
+        if habfsm.habeligible:
+            assert habfsm.date_eligible.toordinal() == \
+                scores.date_eligible[index]
+        else:
+            assert 0 == scores.date_eligible[index]
+
+def test_top_charge(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''
+    This tests that the top charge of a date is the first charge added
+    in the highest class (as ConvictionDate.highest()[0]), and that 
+    unconvicted charges are left out of the groups.
+    '''
+    ch5_larcH_2pt.disposition_date = ch1_larc1.disposition_date
+    charge_robD.disposition_date = ch1_larc1.disposition_date
+    charge_robD.convicted = False
+    colx = Charge_Collection()
+    colx.add_charges([ch1_larc1, ch5_larcH_2pt, charge_robD])
+    groups = date_groups(ColumnarCharges.from_records(
+        [ (make_defendant(1), colx) ]))
+    assert 1 == len(groups)
+    assert 1 == groups.top[0]
+    assert 2 == len(groups.order)
+
+def test_habitual_nobirthdate(charge_robD: object):
+    '''This tests that a defendant with no birthdate gets no strikes.'''
+    colx = Charge_Collection()
+    colx.add_charge(charge_robD)
+    store = ColumnarCharges.from_records([ (make_defendant(1), colx) ])
+    assert 0 == store.birth18[0]
+    scores = score(store)
+    assert 0 == scores.strikes[0]
+    assert 0 == scores.habeligible[0]
+
+def test_leapday_birthdate():
+    '''
+    This tests that a defendant born on Feb 29 can be scored (18 on Mar
+    1, as in the HabitualMachine).
+    '''
+    rng = random.Random(29)
+    records = [ (make_defendant(n, date(1980, 2, 29)), random_record(rng))
+        for n in range(40) ]
+    store = ColumnarCharges.from_records(records)
+    assert date(1998, 3, 1).toordinal() == store.birth18[0]
+    scores = score(store)
+    for index, (defendant, colx) in enumerate(records):
+        habfsm = HabitualMachine(colx, defendant.birthdate)
+        habcons = habfsm.state.dumbwaiter.habcons
+        assert len(habcons) == scores.strikes[index]
+        assert habfsm.habeligible == scores.habeligible[index]
@@ -83,7 +83,7 @@ def test_validators():
 
     with pytest.raises(ValueError) \
         as exc_info:
-        charge.crime.crime_class = "polka dots"
+        charge.crime.crimeclass = "polka dots"
         convictiondate.add(charge)
     exception_raised = exc_info.value
     assert ValueError == type(exception_raised)
@@ -116,4 +116,39 @@ def test_highest():
     charge2.convicted = True
     convictiondate.add(charge2)
     assert charge.crime.crimeclass == \
-        convictiondate.highest()[0].crime.crimeclass
\ No newline at end of file
+        convictiondate.highest()[0].crime.crimeclass
+
+def test_highest_readonly():
+    '''This tests that highest tracks the top class as charges are added
+    and removed, and returns a tuple (made once, until the date changes).'''
+    dt = date(2001,1,1)
+    convictiondate = ConvictionDate(dt)
+    assert -1 == convictiondate.top
+    assert None == convictiondate.highest()
+    crime = Crime()
+    crime.crimeclass = "Class 2 Misdemeanor"
+    charge = Charge()
+    charge.set_dispositiondate(dt)
+    charge.set_crime(crime)
+    charge.convicted = True
+    convictiondate.add(charge)
+    assert 2 == convictiondate.top
+    assert ( charge, ) == convictiondate.highest()
+    assert convictiondate.highest() is convictiondate.highest()
+    crime2 = Crime()
+    crime2.crimeclass = "Class H Felony"
+    charge2 = Charge()
+    charge2.set_dispositiondate(dt)
+    charge2.set_crime(crime2)
+    charge2.convicted = True
+    convictiondate.add(charge2)
+    convictiondate.add(charge)
+    assert 6 == convictiondate.top
+    assert ( charge2, ) == convictiondate.highest()
+    convictiondate.add(charge2)
+    assert ( charge2, charge2 ) == convictiondate.highest()
+    convictiondate.remove(charge2)
+    assert ( charge2, ) == convictiondate.highest()
+    convictiondate.remove(charge2)
+    assert ( charge, charge ) == convictiondate.highest()
+
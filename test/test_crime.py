@@ -10,7 +10,7 @@ from datetime import date, datetime, timedelta
 import typing
 import uuid
 
-from src.crime import Crime
+from src.crime import Crime, CrimeClass
 
 def test_initialization():
     '''This tests an initialization.'''
@@ -112,4 +112,96 @@ def test_invalid_uid():
             "purple polkadots"
         )
     exception_raised = exc_info.value
-    assert ValueError == type(exception_raised)
\ No newline at end of file
+    assert ValueError == type(exception_raised)
+
+def test_crimeclass_rank():
+    '''This tests that the CrimeClass rank follows the crimeclass.'''
+    crime = Crime()
+    assert None == crime.classrank
+    crime.crimeclass = "Class H Felony"
+    assert CrimeClass.CLASS_H_FELONY == crime.classrank
+    assert 6 == crime.classrank
+    assert True == crime.classrank.is_felony
+    assert False == crime.classrank.is_misdemeanor
+    assert 2 == crime.classrank.felony_points
+    crime.set_crimeclass(CrimeClass.CLASS_A1_MISDEMEANOR)
+    assert "Class A1 Misdemeanor" == crime.crimeclass
+    assert True == crime.classrank.is_misdemeanor
+    crime.crimeclass = "polka dots"
+    assert None == crime.classrank
+    assert Crime.valid_classes == [ c.label for c in CrimeClass ]
+    assert False == crime.crimeclass_isvalid(["Infraction"])
+
+def test_flags():
+    '''This tests that the FSM flags are worked out as the class and 
+    statute are set, including the statute exceptions.'''
+    crime = Crime()
+    crime.crimeclass = "Class E Felony"
+    assert True == crime.hab_qualified
+    assert 4 == crime.felony_points
+    crime.statute = "§14-7.28"     # habitual B&E does not count
+    assert False == crime.hab_qualified
+    crime.set_statute("§14-33.2")   # nor habitual misd assault
+    assert False == crime.hab_qualified
+    crime.set_crimeclass("Class 1 Misdemeanor")
+    assert True == crime.felpoint_eligible
+    assert 1 == crime.felony_points
+    assert True == crime.misd_qualified
+    crime.statute = "§90-95"
+    assert False == crime.felpoint_eligible
+    assert 0 == crime.felony_points
+    crime.statute = "§20-138.1"     # Ch 20 edge case (DWI)
+    assert True == crime.felpoint_eligible
+    crime.crimeclass = "Class 2 Misdemeanor"
+    assert False == crime.felpoint_eligible
+    assert False == crime.hab_qualified
+    crime.crimeclass = "Infraction"
+    assert False == crime.misd_qualified
+
+def test_from_row():
+    '''This tests making a crime from a row, checked and trusted.'''
+    crime = Crime.from_row((1, None, "§14-72", "Larceny", "Class H Felony"))
+    assert CrimeClass.CLASS_H_FELONY == crime.classrank
+    assert True == crime.hab_qualified
+    assert 2 == crime.felony_points
+    trusted = Crime.from_row((1, None, "§20-138.1", "DWI", 
+        "Class 1 Misdemeanor"), trusted=True)
+    assert True == trusted.felpoint_eligible
+    assert "§20-138.1" == trusted.statute
+    with pytest.raises(ValueError, match='crimeclass invalid.'):
+        Crime.from_row((1, None, "§14-72", "Larceny", "Class Z Felony"))
+
+def test_from_rows():
+    '''This tests making a batch of crimes, and the row of a bad one.'''
+    rows = [ 
+        (1, None, "§14-72", "Larceny", "Class H Felony"),
+        (2, None, "§14-87", "Robbery", CrimeClass.CLASS_D_FELONY),
+        (3, None, "§14-33", None, None),
+    ]
+    crimes = Crime.from_rows(rows)
+    assert CrimeClass.CLASS_H_FELONY == crimes[0].classrank
+    assert CrimeClass.CLASS_D_FELONY == crimes[1].classrank
+    assert None == crimes[2].classrank
+    assert "" == crimes[2].description
+    rows[2] = (3, None, "§14-33", "Assault", 10)
+    with pytest.raises(ValueError, match='row 3: crimeclass invalid.'):
+        Crime.from_rows(rows)
+    rows[2] = (3, None, "§14-33", "Assault", "Class Q")
+    with pytest.raises(ValueError, match='row 3: crimeclass invalid.'):
+        Crime.from_rows(rows)
+    rows[2] = (3, None, "§" * 51, "Assault", "Class Q")
+    with pytest.raises(ValueError, match='row 3: A statute must be str'):
+        Crime.from_rows(rows)
+
+def test_slots():
+    '''This tests that a Crime has no per-instance __dict__ and still
+    pickles with all of its data (and its flags).'''
+    import pickle
+    crime = Crime.from_row((1, None, "§14-72", "Larceny", "Class H Felony"))
+    assert False == hasattr(crime, "__dict__")
+    with pytest.raises(AttributeError):
+        crime.not_a_field = 1
+    copy = pickle.loads(pickle.dumps(crime))
+    assert CrimeClass.CLASS_H_FELONY == copy.classrank
+    assert "§14-72" == copy.statute
+    assert 2 == copy.felony_points
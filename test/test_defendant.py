@@ -104,4 +104,32 @@ def test_invalid_uid():
             "purple polkadots"
         )
     exception_raised = exc_info.value
-    assert ValueError == type(exception_raised)
\ No newline at end of file
+    assert ValueError == type(exception_raised)
+
+def test_slots():
+    '''This tests that a Defendant has no per-instance __dict__.'''
+    my_defendant = Defendant()
+    assert False == hasattr(my_defendant, "__dict__")
+    with pytest.raises(AttributeError):
+        my_defendant.middlename = "Q"
+
+def test_from_fields():
+    '''This tests making a defendant from its fields.'''
+    defendant = Defendant.from_fields(1, None, "John", "Smith", 
+        date(2010, 1, 1))
+    assert "John Smith" == defendant.fullname
+    assert None == defendant.unique_id
+    with pytest.raises(ValueError, match='A name must be a string, lte 50'):
+        Defendant.from_fields(firstname=42)
+    assert "Defendant" == Defendant.from_fields(trusted=True).fullname
+
+def test_from_rows():
+    '''This tests making a batch of defendants, and the row of a bad one.'''
+    rows = [ (n, None, "John", "Smith", date(1980, 1, 1)) for n in range(4) ]
+    assert 4 == len(Defendant.from_rows(rows))
+    rows[2] = (2, None, "John", "S" * 51, date(1980, 1, 1))
+    with pytest.raises(ValueError, match='row 3: A name must be a string'):
+        Defendant.from_rows(rows)
+    rows[2] = (2, None, "John", "Smith", "1980-01-01")
+    with pytest.raises(ValueError, match='row 3: A birthdate must be'):
+        Defendant.from_rows(rows)
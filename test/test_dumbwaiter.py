@@ -63,6 +63,17 @@ def test_over18():
     assert True == dw.over18_on_date(date(2001,8,24)) 
     assert False == dw.over18_on_date(date(2001,8,23))
 
+def test_over18_leapday():
+    '''Test of over18_on_date for a D born on Feb 29.
+    
+    Expected: 18 on Mar 1 (18 years on there is no Feb 29)'''
+    dw = Dumbwaiter(date(1992,2,29))
+    assert date(2010,3,1) == dw.eighteenth_birthdate
+    assert False == dw.over18_on_date(date(2010,2,28))
+    assert True == dw.over18_on_date(date(2010,3,1))
+    dw = Dumbwaiter(date(1992,2,28))
+    assert date(2010,2,28) == dw.eighteenth_birthdate
+
 def test_date_elgible_setter():
     '''Test of set_date_eligible.
     
@@ -605,6 +605,7 @@ def test_basestate():
     base = State()
     colx = Charge_Collection()
     assert 0 == base.on_event(colx, 0, 0)
+    assert FinishedState == type(base.transition(colx, 0, 0)[0])
     assert "State" == str(base)
     assert "State" == repr(base)
 
@@ -617,3 +618,30 @@ def test_startstate():
     start = StartState()
     colx = Charge_Collection()
     assert FinishedState == type(start.on_event(colx, 0, 0))
+
+def test_long_record(crime_larceny1: object):
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This runs a record with more conviction dates than the recursion 
+    limit allows stack frames, and confirms the fsm runs it in a loop
+    and returns the correct values.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :crime_larceny1: a Crime instance (cl 1 misd larceny, 1 pt)
+    '''
+    colx = Charge_Collection()
+    for n in range(2500):
+        charge = Charge()
+        charge.offense_date = date(1900, 1, 1) + timedelta(days=n)
+        charge.disposition_date = date(1900, 1, 2) + timedelta(days=n)
+        charge.crime = crime_larceny1
+        charge.convicted = True
+        colx.add_charge(charge)
+    felofsm = Felony_RecordMachine()
+
+    felofsm.on_event(colx)
+    assert FinishedState == type(felofsm.state)
+    assert 2500 == felofsm.points
+    assert 6 == felofsm.level
@@ -445,6 +445,7 @@ def test_baseState():
     dw = Dumbwaiter(date(1983,8,24))
     colx = Charge_Collection()
     assert 0 == state.on_event(colx, dw, 0)
+    assert FinishedState == type(state.transition(colx, dw, 0)[0])
     assert "State" == str(state)
     assert "State" == repr(state)
 
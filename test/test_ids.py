@@ -0,0 +1,67 @@
+'''
+file:   test_ids.py
+author: Keith Helsabeck
+
+This is the file for testing ids (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+import uuid
+
+from src.charge import Charge
+from src.crime import Crime
+from src.ids import IdAllocator, uuid4s, uuid_isvalid
+
+def test_uuid4s():
+    '''This tests a batch of random UUIDs.'''
+    uids = uuid4s(500)
+    assert 500 == len(set(uids))
+    for uid in uids:
+        assert uuid.UUID == type(uid)
+        assert 4 == uid.version
+        assert uuid.RFC_4122 == uid.variant
+    assert True == Charge().uniqueid_isvalid(uids[0])
+    assert False == uuid_isvalid(str(uids[0]))
+
+def test_uuid7s():
+    '''This tests that time-ordered UUIDs keep increasing, within a 
+    millisecond, across batches, and if the clock goes backwards.'''
+    now = [1700000000000 * 1000000]
+    ids = IdAllocator(version=7, batch=7, clock=lambda: now[0])
+    uids = [ ids.uuid() for n in range(20) ]
+    now[0] += 5 * 1000000
+    uids += ids.uuids(5)
+    now[0] -= 10 * 1000000
+    uids += ids.uuids(5)
+    assert sorted(uids) == uids
+    assert 30 == len(set(uids))
+    for uid in uids:
+        assert 7 == uid.version
+        assert uuid.RFC_4122 == uid.variant
+    assert 1700000000000 == uids[0].int >> 80
+    assert 1700000000005 == uids[20].int >> 80
+
+def test_assign():
+    '''This tests giving ids to new objects.'''
+    ids = IdAllocator(start=100)
+    crimes = [ Crime() for n in range(3) ]
+    crimes[1].set_id(7)
+    crimes[1].set_uid(uuid.uuid4())
+    kept = crimes[1].unique_id
+    ids.assign(crimes)
+    assert [100, 7, 101] == [ crime.id for crime in crimes ]
+    assert kept == crimes[1].unique_id
+    assert True == crimes[0].uniqueid_isvalid(crimes[0].unique_id)
+    ids.assign(crimes, overwrite=True)
+    assert [102, 103, 104] == [ crime.id for crime in crimes ]
+    assert range(105, 108) == ids.ids(3)
+    assert 108 == ids.next_id()
+
+def test_invalid():
+    '''This tests bad allocator settings.'''
+    with pytest.raises(ValueError, match="version must be 4 or 7."):
+        IdAllocator(version=5)
+    with pytest.raises(ValueError, match="start and batch must be ints"):
+        IdAllocator(batch=0)
@@ -0,0 +1,100 @@
+'''
+file:   test_incremental.py
+author: Keith Helsabeck
+
+This is the file for testing incremental (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+
+from src.analyzer import RecordAnalyzer
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.incremental import IncrementalRecord
+from test.test_analyzer import random_record
+
+def assert_same(analysis: object, expected: object):
+    '''Asserts that two RecordAnalyses give the same results.'''
+    assert expected.felony_points == analysis.felony_points
+    assert expected.misdemeanor_points == analysis.misdemeanor_points
+    assert expected.misdemeanor_level == analysis.misdemeanor_level
+    assert expected.habeligible == analysis.habeligible
+    assert expected.date_eligible == analysis.date_eligible
+    assert expected.habcons == analysis.habcons
+
+def test_matches_full_run():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This adds random records' charges one at a time (in date order, so
+    most adds are appends or same-date adds, then in random order) and
+    confirms the scores match a full run after every add.
+    '''
+    rng = random.Random(18)
+    analyzer = RecordAnalyzer()
+    for n in range(80):
+        charges = random_record(rng).charges
+        if n % 2 == 0:
+            charges.sort(key=lambda charge: charge.disposition_date)
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        colx = Charge_Collection()
+        record = IncrementalRecord(colx, birthdate)
+        for charge in charges:
+            record.add_charge(charge)
+            assert_same(record.analysis, analyzer.analyze(colx, birthdate))
+        if n % 2 == 0:
+            assert 1 == record.reruns
+
+def test_outside_changes(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''This tests that changes made to the collection directly, and 
+    removals, are picked up with a rerun.'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    record = IncrementalRecord(colx)
+    assert 1 == record.analysis.felony_points
+    colx.add_charge(ch5_larcH_2pt)
+    assert 3 == record.analysis.felony_points
+    assert 2 == record.reruns
+    record.add_charge(charge_robD)
+    record.remove_charge(2)
+    assert 3 == record.analysis.felony_points
+
+def test_edited_in_place(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a charge edited in place (with no call to 
+    mark_changed) is picked up with a rerun.'''
+    ch5_larcH_2pt.convicted = False
+    ch5_larcH_2pt.disposition_date = None
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    record = IncrementalRecord(colx)
+    record.add_charge(ch5_larcH_2pt)
+    assert 1 == record.analysis.felony_points
+    ch5_larcH_2pt.disposition_date = date(2015, 6, 1)
+    ch5_larcH_2pt.convicted = True
+    assert 3 == record.analysis.felony_points
+    ch5_larcH_2pt.disposition_date = date(1990, 6, 1)
+    record.add_charge(ch1_larc1)
+    assert RecordAnalyzer().analyze(colx).felony_points == \
+        record.analysis.felony_points
+
+def test_dismissed(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a dismissed charge (a disposition date, but not
+    convicted) can be added after the last conviction, on it, or before
+    it, and leaves the scores as they were.'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    record = IncrementalRecord(colx)
+    reruns = record.reruns
+    for dt in (date(2020, 1, 1), ch1_larc1.disposition_date, 
+        date(1990, 1, 1)):
+        dismissed = Charge.from_fields(crime=ch5_larcH_2pt.crime, 
+            disposition_date=dt, convicted=False)
+        record.add_charge(dismissed)
+        assert 1 == record.analysis.felony_points
+    assert reruns == record.reruns
+    assert 4 == len(colx.charges)
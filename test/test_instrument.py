@@ -0,0 +1,79 @@
+'''
+file:   test_instrument.py
+author: Keith Helsabeck
+
+This is the file for testing instrument (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+
+from src import instrument as instrument_module
+from src.collections import Charge_Collection
+from src.convictiondate import ConvictionDate
+from src.FelonyStatemachine import Felony_RecordMachine
+from src.habitualmachine import HabitualMachine
+from src.instrument import instrument
+from src.misdemeanor_machine import MisdemeanorRecordMachine
+
+def test_stats(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''This tests the counts from running the three FSMs.'''
+    colx = Charge_Collection()
+    for charge in (ch1_larc1, ch5_larcH_2pt, charge_robD):
+        colx.add_charge(charge)
+    colx.mark_changed()
+    with instrument() as stats:
+        felofsm = Felony_RecordMachine()
+        felofsm.on_event(colx)
+        MisdemeanorRecordMachine(colx)
+        habfsm = HabitualMachine(colx, date(1980, 1, 1))
+    assert 3 == len(colx.cons_bydate)
+    assert 1 == stats.runs["FelonyStatemachine"]
+    assert 1 == stats.runs["misdemeanor_machine"]
+    assert 1 == stats.runs["habitualmachine"]
+    assert 1 == stats.transitions["FelonyStatemachine.StartState"]
+    assert 4 == stats.transitions["FelonyStatemachine.HubState"]
+    assert 1 == stats.transitions["FelonyStatemachine.FinishedState"]
+    assert 1 == stats.transitions["habitualmachine.StartState"]
+    assert 3 == stats.groupings
+    assert stats.highest_calls >= 3
+    assert all(seconds >= 0 for seconds in stats.seconds.values())
+    assert stats.as_dict()["groupings"] == 3
+
+def test_off(ch1_larc1: object):
+    '''This tests that the patches come off when the block ends, and 
+    that the callback gets the stats.'''
+    highest = ConvictionDate.highest
+    seen = []
+    with instrument(callback=seen.append) as stats:
+        assert ConvictionDate.highest != highest
+        with pytest.raises(ValueError, match="already on"):
+            with instrument():
+                pass
+    assert [stats] == seen
+    assert ConvictionDate.highest == highest
+    assert None == instrument_module.ACTIVE
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    Felony_RecordMachine().on_event(colx)
+    assert 0 == stats.highest_calls
+
+def test_lazy(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''This tests that a lazy collection is counted as a 
+    Charge_Collection with the same charges is.'''
+    from src.lazy import LazyChargeCollection
+    from test.test_lazy import rows_of
+    colx = Charge_Collection()
+    colx.add_charges([ ch1_larc1, ch5_larcH_2pt, charge_robD ])
+    lazy = LazyChargeCollection.from_rows(rows_of(colx))
+    counts = []
+    for each in (colx, lazy):
+        with instrument() as stats:
+            Felony_RecordMachine().on_event(each)
+            MisdemeanorRecordMachine(each)
+        counts.append((stats.highest_calls, stats.groupings))
+    assert counts[0] == counts[1]
+    assert 0 < counts[1][0] and 0 < counts[1][1]
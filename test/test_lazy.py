@@ -0,0 +1,174 @@
+'''
+file:   test_lazy.py
+author: Keith Helsabeck
+
+This is the file for testing lazy (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import random
+import typing
+
+from src.analyzer import RecordAnalyzer
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.crime import Crime
+from src.FelonyStatemachine import Felony_RecordMachine
+from src.habitualmachine import HabitualMachine
+from src.lazy import LazyChargeCollection, LazyConvictionDate
+from src.misdemeanor_machine import MisdemeanorRecordMachine
+from test.test_analyzer import random_record
+
+def rows_of(colx: object) -> list:
+    '''Returns a collection's charges as rows (Charge.FIELDS order).'''
+    return [ tuple(getattr(charge, name) for name in Charge.FIELDS)
+        for charge in colx.charges ]
+
+def made(colx: object) -> int:
+    '''Returns how many of a lazy collection's Charges have been made.'''
+    return sum(charge != None for charge in colx.made)
+
+def test_matches_machines():
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This runs random records, as Charge_Collections and as lazy ones,
+    through the three FSMs and RecordAnalyzer, and confirms they give
+    the same results, and that the felony and misdemeanor machines only
+    make the top charge of each date.
+    '''
+    rng = random.Random(22)
+    analyzer = RecordAnalyzer()
+    for n in range(300):
+        colx = random_record(rng)
+        lazy = LazyChargeCollection.from_rows(rows_of(colx))
+        birthdate = date(1975 + rng.randrange(10), 1 + rng.randrange(12), 
+            1 + rng.randrange(28))
+        assert 0 == made(lazy)
+        felofsm = Felony_RecordMachine()
+        felofsm.on_event(lazy)
+        misdfsm = MisdemeanorRecordMachine(lazy)
+        assert made(lazy) == len(colx.cons_bydate)  # highest()[0] each
+        habfsm = HabitualMachine(lazy, birthdate)
+        expected = analyzer.analyze(colx, birthdate)
+        analysis = analyzer.analyze(lazy, birthdate)
+        assert felofsm.points == expected.felony_points
+        assert felofsm.level == expected.felony_level
+        assert misdfsm.points == expected.misdemeanor_points
+        assert misdfsm.level == expected.misdemeanor_level
+        assert habfsm.habeligible == expected.habeligible
+        assert habfsm.date_eligible == expected.date_eligible
+        for got in (analysis.habcons, habfsm.state.dumbwaiter.habcons):
+            assert [ rows_of(as_colx(got)) ] == \
+                [ rows_of(as_colx(expected.habcons)) ]
+        assert rows_of(lazy) == rows_of(colx)
+        assert analysis.dates == expected.dates == len(lazy.cons_bydate)
+
+def as_colx(charges: list) -> object:
+    '''Returns charges in a Charge_Collection (not grouped).'''
+    colx = Charge_Collection()
+    colx.charges.extend(charges)
+    return colx
+
+def test_made_once(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a Charge is made once, then kept.'''
+    colx = Charge_Collection()
+    colx.add_charges([ ch1_larc1, ch5_larcH_2pt ])
+    lazy = LazyChargeCollection.from_rows(rows_of(colx))
+    lazy.groupby_convictiondate()
+    assert all(type(condate) == LazyConvictionDate 
+        for condate in lazy.cons_bydate)
+    top = lazy.cons_bydate[0].highest()[0]
+    assert 1 == made(lazy)
+    assert top is lazy.cons_bydate[0].convictions[top.crime.classrank][0]
+    assert top in lazy.charges and lazy.is_in(top)
+    assert 2 == made(lazy)
+    assert False == lazy.is_in(ch1_larc1)
+    with pytest.raises(ValueError):
+        lazy.cons_bydate[0].add(top)
+    with pytest.raises(ValueError):
+        lazy.cons_bydate[0].remove(top)
+
+def test_like_collection(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object, ch_infraction: object):
+    '''
+    This tests that add_charge, remove_charge, the sorts, mark_changed
+    and reset_charges leave a lazy collection grouped as a 
+    Charge_Collection would be.
+    '''
+    colx, lazy = Charge_Collection(), LazyChargeCollection()
+    charges = [ ch1_larc1, ch5_larcH_2pt, charge_robD, ch_infraction ]
+    for charge in charges:
+        colx.add_charge(charge)
+    lazy.add_rows(rows_of(colx)[:2])
+    lazy.add_charge(charge_robD)
+    lazy.add_charges([ ch_infraction ])
+    version = lazy.version
+
+    def grouped(colx: object) -> list:
+        colx.groupby_convictiondate()
+        return [ (condate.disposition_date, rows_of(as_colx(
+            condate.highest()))) for condate in colx.cons_bydate ]
+
+    assert grouped(colx) == grouped(lazy)
+    for each in (colx, lazy):
+        each.remove_charge(1)
+    assert version < lazy.version
+    assert grouped(colx) == grouped(lazy)
+    for each in (colx, lazy):
+        each.sortby_offensedate()
+    assert rows_of(colx) == rows_of(lazy)
+    assert grouped(colx) == grouped(lazy)
+    charge_robD.disposition_date = ch1_larc1.disposition_date
+    for each in (colx, lazy):
+        each.mark_changed()
+    assert grouped(colx) == grouped(lazy)
+    with pytest.raises(ValueError):
+        lazy.remove_charge(3)
+    with pytest.raises(ValueError):
+        lazy.add_charge(rows_of(colx)[0])
+    lazy.reset_charges()
+    assert [] == lazy.charges and [] == grouped(lazy)
+
+def test_edited_in_place(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a made Charge edited in place (with no call to
+    mark_changed) is found when the collection is next grouped.'''
+    lazy = LazyChargeCollection.from_rows(rows_of(as_colx([ ch1_larc1, 
+        ch5_larcH_2pt ])))
+    assert 3 == RecordAnalyzer().analyze(lazy).felony_points
+    version = lazy.version
+    lazy.groupby_convictiondate()
+    assert version == lazy.version
+    top = lazy.cons_bydate[-1].highest()[0]
+    top.convicted = False
+    top.disposition_date = None
+    assert 1 == RecordAnalyzer().analyze(lazy).felony_points
+    assert version < lazy.version
+    row = list(rows_of(as_colx([ ch5_larcH_2pt ]))[0])
+    row[3] = Crime.from_row((None, None, "§14-72", "Larceny",
+        "Class H Felony"))      # (not the fixture's: edited below)
+    lazy = LazyChargeCollection.from_rows([ tuple(row) ])
+    assert 2 == RecordAnalyzer().analyze(lazy).felony_points
+    row[3].set_crimeclass("Class C Felony")     # (no Charge made)
+    assert 6 == RecordAnalyzer().analyze(lazy).felony_points
+
+def test_not_grouped(ch1_larc1: object):
+    '''
+    This tests that a lazy collection leaves a charge with a disposition
+    date that wasn't a conviction out of the grouping, refuses to group 
+    a conviction with no crime (as ConvictionDate.add does), and that 
+    the columns must match their sources.
+    '''
+    row = list(rows_of(as_colx([ ch1_larc1 ]))[0])
+    row[5] = False
+    lazy = LazyChargeCollection.from_rows([ tuple(row) ])
+    lazy.groupby_convictiondate()
+    assert [] == lazy.cons_bydate and 1 == len(lazy.charges)
+    row[3], row[5] = None, True
+    lazy = LazyChargeCollection.from_rows([ tuple(row) ])
+    with pytest.raises(ValueError):
+        lazy.groupby_convictiondate()
+    with pytest.raises(ValueError):
+        LazyChargeCollection().add_sources([ 1, 2 ], [ None ], [ None ], 
+            [ None ], [ True ])
@@ -0,0 +1,103 @@
+'''
+file:   test_loader.py
+author: Keith Helsabeck
+
+This is the file for testing loader (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import io
+import json
+import typing
+
+from src.loader import load_csv, load_jsonl, parse_bool, parse_date
+from src.catalog import CrimeCatalog
+from src.collections import Charge_Collection
+from src.defendant import Defendant
+
+CSV_EXPORT = \
+"""defendant_id,firstname,lastname,birthdate,charge_id,statute,description,crimeclass,offense_date,disposition_date,convicted
+1,John,Doe,1983-08-24,10,§14-72,Felony Larceny,Class H Felony,2010-01-01,2010-02-02,true
+1,John,Doe,1983-08-24,11,§14-72,Felony Larceny,Class H Felony,2011-01-01,2011-02-02,true
+1,John,Doe,1983-08-24,12,§14-33,Simple Assault,Class 2 Misdemeanor,2012-01-01,,false
+2,Jane,Roe,,20,§14-72,Felony Larceny,Class H Felony,2015-01-01,2015-02-02,1
+"""
+
+def test_load_csv():
+    '''This tests loading a CSV export into grouped records.'''
+    catalog = CrimeCatalog()
+    records = list(load_csv(io.StringIO(CSV_EXPORT), catalog))
+    assert 2 == len(records)
+    defendant, colx = records[0]
+    assert Defendant == type(defendant)
+    assert 1 == defendant.id
+    assert "John Doe" == defendant.fullname
+    assert date(1983, 8, 24) == defendant.birthdate
+    assert Charge_Collection == type(colx)
+    assert [10, 11, 12] == [ c.id for c in colx.charges ]
+    assert [date(2010, 2, 2), date(2011, 2, 2)] == colx.unique_dates
+    assert None == colx.charges[2].disposition_date
+    assert False == colx.charges[2].convicted
+    defendant, colx = records[1]
+    assert None == defendant.birthdate
+    # one shared Crime for the three larceny charges
+    assert 2 == len(catalog)
+    assert colx.charges[0].crime is records[0][1].charges[0].crime
+
+def test_load_jsonl():
+    '''This tests loading a JSON Lines export, lazily.'''
+    lines = [
+        {"defendant_id": 7, "firstname": "Al", "lastname": "Bo", 
+        "birthdate": "1990-01-01", "charge_id": 1, "statute": "§14-87",
+        "description": "Robbery", "crimeclass": "Class D Felony",
+        "offense_date": "2012-01-01", "disposition_date": "2012-03-03",
+        "convicted": True},
+        {"defendant_id": 8, "statute": "§14-87", "description": "Robbery",
+        "crimeclass": "Class D Felony", "convicted": False},
+    ]
+    text = "\n".join(json.dumps(line) for line in lines) + "\n\n"
+    records = load_jsonl(io.StringIO(text))
+    defendant, colx = next(records)
+    assert 7 == defendant.id
+    assert True == colx.charges[0].convicted
+    defendant, colx = next(records)
+    assert 8 == defendant.id
+    assert "" == defendant.firstname
+    with pytest.raises(StopIteration):
+        next(records)
+
+def test_bad_rows():
+    '''This tests that bad rows raise ValueError naming the row.'''
+    bad_class = CSV_EXPORT.replace("Class 2 Misdemeanor", "Class 9 Misd")
+    with pytest.raises(ValueError, match="row 3: crimeclass invalid."):
+        list(load_csv(io.StringIO(bad_class)))
+    bad_date = CSV_EXPORT.replace("2015-01-01", "01/01/2015")
+    with pytest.raises(ValueError, match="row 4: A date must be"):
+        list(load_csv(io.StringIO(bad_date)))
+    with pytest.raises(ValueError, match="row 1: "):
+        list(load_jsonl(io.StringIO('{"firstname": "No Id"}\n')))
+
+def test_dismissed():
+    '''This tests that a dismissed charge (a disposition date, but not
+    convicted) loads and leaves the record scorable, not grouped.'''
+    from src.analyzer import RecordAnalyzer
+    from src.batch import score_record
+    dismissed = CSV_EXPORT.replace("2012-01-01,,false", 
+        "2012-01-01,2012-05-05,false")
+    defendant, colx = next(load_csv(io.StringIO(dismissed)))
+    assert date(2012, 5, 5) == colx.charges[2].disposition_date
+    assert [date(2010, 2, 2), date(2011, 2, 2)] == colx.unique_dates
+    analysis = RecordAnalyzer().analyze(colx, defendant.birthdate)
+    assert 4 == analysis.felony_points
+    assert 2 == analysis.misdemeanor_points
+    assert 4 == score_record((defendant, colx)).felony_points
+
+def test_parsers():
+    '''This tests the field parsers.'''
+    assert None == parse_date("")
+    assert date(2001, 2, 3) == parse_date("2001-02-03")
+    assert True == parse_bool("Yes")
+    assert False == parse_bool("")
+    with pytest.raises(ValueError):
+        parse_bool("maybe")
@@ -0,0 +1,126 @@
+'''
+file:   test_memo.py
+author: Keith Helsabeck
+
+This is the file for testing memo (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+
+from src.batch import score_record
+from src.charge import Charge
+from src.collections import Charge_Collection
+from src.crime import Crime
+from src.defendant import Defendant
+from src.memo import ResultCache, fingerprint
+
+def make_defendant(id: int, birthdate: object) -> object:
+    '''Returns a Defendant with the id and birthdate.'''
+    defendant = Defendant()
+    defendant.set_id(id)
+    defendant.set_birthdate(birthdate)
+    return defendant
+
+def test_fingerprint(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''
+    This tests that the fingerprint ignores the order of dates but not
+    the order of charges within a date, and includes the birthdate.
+    '''
+    bd = date(1980, 1, 1)
+    key = fingerprint([ch1_larc1, ch5_larcH_2pt], bd)
+    assert key == fingerprint([ch5_larcH_2pt, ch1_larc1], bd)
+    assert key != fingerprint([ch5_larcH_2pt, ch1_larc1], date(1981, 1, 1))
+    ch5_larcH_2pt.disposition_date = ch1_larc1.disposition_date
+    charge_robD.disposition_date = ch1_larc1.disposition_date
+    assert fingerprint([ch5_larcH_2pt, charge_robD], bd) != \
+        fingerprint([charge_robD, ch5_larcH_2pt], bd)
+    charge_robD.convicted = False
+    assert fingerprint([charge_robD], bd) != \
+        fingerprint([ch5_larcH_2pt], bd)
+
+def test_hits(ch1_larc1: object, ch5_larcH_2pt: object, 
+    charge_robD: object):
+    '''This tests that a record is only rescored when it changes.'''
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    colx.add_charge(ch5_larcH_2pt)
+    defendant = make_defendant(1, date(1980, 1, 1))
+    cache = ResultCache()
+    result = cache.score_record((defendant, colx))
+    assert result == score_record((defendant, colx))
+    assert result == cache.score_record((defendant, colx))
+    assert (1, 1) == (cache.hits, cache.misses)
+    other = make_defendant(2, date(1980, 1, 1))
+    assert 2 == cache.score_record((other, colx)).defendant_id
+    assert 2 == cache.hits
+    colx.add_charge(charge_robD)
+    changed = cache.score_record((defendant, colx))
+    assert 2 == cache.misses
+    assert changed == score_record((defendant, colx))
+    assert changed.felony_points > result.felony_points
+
+def test_edited_in_place(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that a charge edited in place (with no call to 
+    mark_changed) gets the record rescored, not the cached scores.'''
+    ch5_larcH_2pt.convicted = False
+    ch5_larcH_2pt.disposition_date = None
+    colx = Charge_Collection()
+    colx.add_charge(ch1_larc1)
+    colx.add_charge(ch5_larcH_2pt)
+    defendant = make_defendant(1, date(1980, 1, 1))
+    cache = ResultCache()
+    result = cache.score_record((defendant, colx))
+    assert 1 == result.felony_points
+    ch5_larcH_2pt.disposition_date = date(2015, 6, 1)
+    ch5_larcH_2pt.convicted = True
+    changed = cache.score_record((defendant, colx))
+    assert (0, 2) == (cache.hits, cache.misses)
+    assert 3 == changed.felony_points
+    assert changed == score_record((defendant, colx))
+
+def test_crime_edited_in_place():
+    '''This tests that a shared Crime edited in place (its class, with
+    no call to mark_changed) gets the record rescored, whether or not
+    the collection had been grouped.'''
+    crime = Crime.from_row((None, None, "§90-95(d)(2)", "Meth", 
+        "Class I Felony"))
+    colx = Charge_Collection()
+    colx.add_charges([ Charge.from_fields(1, None, date(2015, 1, 1), 
+        crime, date(2015, 2, 2), True) ])
+    defendant = make_defendant(1, date(1980, 1, 1))
+    cache = ResultCache()
+    key = cache.fingerprint(colx)
+    crime.set_crimeclass("Class H Felony")
+    assert key != cache.fingerprint(colx)
+    assert 2 == cache.score_record((defendant, colx)).felony_points
+    crime.set_crimeclass("Class C Felony")
+    changed = cache.score_record((defendant, colx))
+    assert (0, 2) == (cache.hits, cache.misses)
+    assert 6 == changed.felony_points
+    assert changed == score_record((defendant, colx))
+
+def test_lru(ch1_larc1: object, ch5_larcH_2pt: object):
+    '''This tests that the least recently used result is dropped.'''
+    cache = ResultCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert 1 == cache.get("a")
+    cache.put("c", 3)
+    assert 2 == len(cache)
+    assert None == cache.get("b")
+    assert 1 == cache.get("a")
+    with pytest.raises(ValueError, match="maxsize must be"):
+        ResultCache(maxsize=0)
+
+def test_disk(tmp_path: object, ch1_larc1: object):
+    '''This tests that results on disk outlive the cache.'''
+    path = str(tmp_path / "scores")
+    defendant = make_defendant(1, date(1980, 1, 1))
+    with ResultCache(path=path) as cache:
+        result = cache.score_record((defendant, [ch1_larc1]))
+    with ResultCache(path=path) as cache:
+        assert result == cache.score_record((defendant, [ch1_larc1]))
+        assert (1, 0) == (cache.hits, cache.misses)
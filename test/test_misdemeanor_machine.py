@@ -348,6 +348,54 @@ def test_recordlevel2m_4pts(level2m_4pts: object):
     assert 4 == misdemeanormachine.points
     assert 2 == misdemeanormachine.level
 
+def test_long_record(crime_speeding: object, crime_larceny1: object):
+    '''
+    INTEGRATION TEST:
+    ____________________________________________________________________
+    This runs a record with more conviction dates than the recursion 
+    limit allows stack frames (2500 infractions, then 1 cl 1 misd) and
+    confirms the fsm runs it in a loop and returns the correct values.
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :crime_speeding: a Crime instance (infraction, 0 pts)
+    :crime_larceny1: a Crime instance (cl 1 misd larceny, 1 pt)
+    '''
+    colx = Charge_Collection()
+    for n in range(2501):
+        charge = Charge()
+        charge.offense_date = date(1900, 1, 1) + timedelta(days=n)
+        charge.disposition_date = date(1900, 1, 2) + timedelta(days=n)
+        charge.crime = crime_speeding if n < 2500 else crime_larceny1
+        charge.convicted = True
+        colx.add_charge(charge)
+    misdemeanormachine = MisdemeanorRecordMachine(colx)
+    assert FinishedState == type(misdemeanormachine.state)
+    assert 1 == misdemeanormachine.points
+    assert 2 == misdemeanormachine.level
+
+def test_error_stays_on_run(rec_infraction: object):
+    '''
+    WHITE BOX TEST:
+    ____________________________________________________________________
+    This confirms an error in a run is kept on that run's FinishedState,
+    not on the shared level states (so later runs don't see it).
+
+    PARAMETERS:
+    ____________________________________________________________________
+    :rec_infraction: a conviction collection -- 1 conviction date
+    '''
+    rec_infraction.groupby_convictiondate()
+    finished, pts, index = LEVEL_TWO.transition(rec_infraction, 1, 0)
+    assert FinishedState == type(finished)
+    assert True == finished.error
+    assert False == hasattr(LEVEL_TWO, "error")
+    assert None == LEVEL_ONE.get_conviction(rec_infraction, 5)
+    assert False == hasattr(LEVEL_ONE, "error")
+    assert FinishedState == type(State().transition(rec_infraction, 0, 0)[0])
+    misdemeanormachine = MisdemeanorRecordMachine(rec_infraction)
+    assert False == hasattr(misdemeanormachine.state, "error")
+
 
 
 # def test_level2_4pts_edges(level2_4pts_edges: object):
@@ -0,0 +1,143 @@
+'''
+file:   test_store.py
+author: Keith Helsabeck
+
+This is the file for testing store (using pytest).
+Run tests with: "pytest --cov=src --cov-report term-missing"
+'''
+import pytest
+from datetime import date, datetime, timedelta
+import typing
+import uuid
+
+from src.batch import score_record
+from src.catalog import CrimeCatalog
+from src.charge import Charge
+from src.defendant import Defendant
+from src.store import RecordStore
+
+def make_record(catalog: object) -> tuple:
+    '''Returns a (Defendant, charges) pair with 3 felony strikes.'''
+    defendant = Defendant()
+    defendant.set_id(1)
+    defendant.set_uid(uuid.uuid4())
+    defendant.set_firstname("John")
+    defendant.set_lastname("Doe")
+    defendant.set_birthdate(date(1980, 1, 1))
+    charges = []
+    for n, (year, crimeclass) in enumerate([(2001, "Class H Felony"), 
+        (2001, "Class 1 Misdemeanor"), (2005, "Class G Felony"), 
+        (2010, "Class H Felony")]):
+        charge = Charge()
+        charge.set_id(n)
+        charge.set_uid(uuid.uuid4())
+        charge.set_crime(catalog.intern("§14-72", crimeclass, "Larceny"))
+        charge.set_offensedate(date(year, 1, 1))
+        charge.set_dispositiondate(date(year, 6, 1))
+        charge.convicted = True
+        charges.append(charge)
+    return defendant, charges
+
+def test_roundtrip():
+    '''This tests storing a record and loading it back.'''
+    defendant, charges = make_record(CrimeCatalog())
+    with RecordStore() as store:
+        store.put_record(defendant, charges)
+        assert [1] == store.defendant_ids()
+        loaded, colx = store.load_record(1)
+        assert defendant.fullname == loaded.fullname
+        assert defendant.birthdate == loaded.birthdate
+        assert defendant.unique_id == loaded.unique_id
+        assert len(charges) == len(colx.charges)
+        for charge, copy in zip(charges, colx.charges):
+            assert charge.id == copy.id
+            assert charge.unique_id == copy.unique_id
+            assert charge.offense_date == copy.offense_date
+            assert charge.disposition_date == copy.disposition_date
+            assert charge.convicted == copy.convicted
+            assert charge.crime.crimeclass == copy.crime.crimeclass
+            assert charge.crime.statute == copy.crime.statute
+        assert colx.charges[0].crime is colx.charges[3].crime
+        assert None == store.load_defendant(2)
+        assert [] == store.load_collection(2).charges
+
+def test_score_cached():
+    '''This tests that a stored result is used until the record changes.'''
+    catalog = CrimeCatalog()
+    defendant, charges = make_record(catalog)
+    with RecordStore() as store:
+        store.put_record(defendant, charges)
+        assert None == store.cached_result(1)
+        result = store.score(1)
+        assert result == score_record((defendant, charges))
+        assert True == result.habeligible
+        assert date(2010, 6, 1) == result.date_eligible
+        assert result == store.cached_result(1)
+        store.put_record(defendant, charges)     # unchanged: still cached
+        assert result == store.cached_result(1)
+        charge = Charge()
+        charge.set_crime(catalog.intern("§14-72", "Class I Felony"))
+        charge.set_offensedate(date(2015, 1, 1))
+        charge.set_dispositiondate(date(2015, 2, 1))
+        charge.convicted = True
+        store.add_charges(1, [charge])
+        assert None == store.cached_result(1)
+        assert result.felony_points + 2 == store.score(1).felony_points
+        defendant.set_birthdate(date(1990, 1, 1))
+        store.put_defendants([defendant])
+        assert None == store.cached_result(1)
+        store.score(1)
+        crime = charges[0].crime
+        crime.set_crimeclass("Class C Felony")
+        store.put_crimes([crime])
+        assert None == store.cached_result(1)
+
+def test_bad_ids():
+    '''This tests that records without int ids are refused.'''
+    defendant, charges = make_record(CrimeCatalog())
+    with RecordStore() as store:
+        defendant.id = None
+        with pytest.raises(ValueError, match="A stored defendant needs"):
+            store.put_record(defendant, charges)
+        with pytest.raises(ValueError, match="No defendant 1 is stored."):
+            store.score(1)
+
+def test_crime_ids():
+    '''This tests that crimes from two imports (two catalogs, which both
+    number their crimes from 1) don't overwrite each other, and that the
+    same crime from both is stored once.'''
+    defendant, charges = make_record(CrimeCatalog())
+    other = Defendant()
+    other.set_id(2)
+    other_catalog = CrimeCatalog()
+    robbery = Charge()
+    robbery.set_crime(other_catalog.intern("§14-87", "Class D Felony", 
+        "Robbery"))
+    robbery.set_offensedate(date(2012, 1, 1))
+    robbery.set_dispositiondate(date(2012, 6, 1))
+    robbery.convicted = True
+    larceny = Charge()
+    larceny.set_crime(other_catalog.intern("§14-72", "Class H Felony", 
+        "Larceny"))
+    larceny.set_offensedate(date(2013, 1, 1))
+    larceny.set_dispositiondate(date(2013, 6, 1))
+    larceny.convicted = True
+    assert charges[0].crime.id == robbery.crime.id
+    with RecordStore() as store:
+        store.put_record(defendant, charges)
+        result = store.score(1)
+        store.put_record(other, [ robbery, larceny ])
+        assert result == store.cached_result(1)
+        assert "§14-72" == store.load_collection(1).charges[0].crime.statute
+        loaded = store.load_collection(2).charges
+        assert "Robbery" == loaded[0].crime.description
+        assert store.load_collection(1).charges[0].crime.id == \
+            loaded[1].crime.id
+        crimes = store.db.execute("SELECT COUNT(*) FROM crimes")
+        assert 4 == crimes.fetchone()[0]
+        assert score_record((other, [ robbery, larceny ])) == store.score(2)
+        robbery.crime.set_statute("§14-72")
+        robbery.crime.set_description("Larceny")
+        robbery.crime.set_crimeclass("Class H Felony")
+        with pytest.raises(ValueError, match="Another crime with this"):
+            store.put_crimes([ robbery.crime ])